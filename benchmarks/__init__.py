@@ -0,0 +1,8 @@
+"""Benchmarks for xml2db: synthetic XML data generation and loading phases measurements.
+
+Run them with `python -m benchmarks --help`.
+"""
+from .datagen import XMLDataGenerator
+from .runner import BenchmarkResult, PhaseResult, run_benchmark
+
+__all__ = ["XMLDataGenerator", "BenchmarkResult", "PhaseResult", "run_benchmark"]
@@ -0,0 +1,77 @@
+"""Command-line entry point of the benchmarks: `python -m benchmarks --help`."""
+import argparse
+import json
+import logging
+import os
+import tempfile
+
+from xml2db.config import load_config
+
+from .datagen import XMLDataGenerator
+from .runner import run_benchmark
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Generate a synthetic XML file from a XSD and measure xml2db loading phases for some databases.",
+    )
+    parser.add_argument("xsd_file", help="path to the XSD file")
+    parser.add_argument(
+        "--db",
+        action="append",
+        help="'duckdb', 'sqlite' or a connection string (can be repeated; default: duckdb and sqlite)",
+    )
+    parser.add_argument("--xml-file", help="load this XML file instead of generating one")
+    parser.add_argument(
+        "--size", type=int, default=1000,
+        help="number of top-level repeated elements of the generated XML file (default: 1000)",
+    )
+    parser.add_argument(
+        "--fanout", type=int, default=3,
+        help="maximum number of occurrences of other repeated elements (default: 3)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--config", help="path to a YAML data model config file")
+    parser.add_argument("--db-schema", help="database schema to use")
+    parser.add_argument("--directory", help="directory for generated files and local databases")
+    parser.add_argument("--generate-only", metavar="OUT_FILE", help="only generate a XML file")
+    parser.add_argument("--json", metavar="OUT_FILE", help="write results to a JSON file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.generate_only:
+        XMLDataGenerator(args.xsd_file, fanout=args.fanout, seed=args.seed).write_xml(
+            args.generate_only, size=args.size
+        )
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.directory or tmp_dir
+        xml_file = args.xml_file
+        if xml_file is None:
+            # the same file is loaded into each database
+            xml_file = os.path.join(directory, f"xml2db_benchmark_{args.size}_{args.fanout}.xml")
+            XMLDataGenerator(args.xsd_file, fanout=args.fanout, seed=args.seed).write_xml(
+                xml_file, size=args.size
+            )
+        for db in args.db or ["duckdb", "sqlite"]:
+            result = run_benchmark(
+                args.xsd_file,
+                db,
+                xml_file=xml_file,
+                model_config=load_config(args.config) if args.config else None,
+                db_schema=args.db_schema,
+                directory=directory,
+            )
+            print(result)
+            results.append(result.to_dict())
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
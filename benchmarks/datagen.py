@@ -0,0 +1,220 @@
+"""Generation of synthetic XML documents from any XSD, to benchmark xml2db with data of configurable size and shape."""
+import base64
+import random
+import string
+from typing import Union
+
+from xml2db import DataModel
+from xml2db.xml_converter import XMLConverter
+
+_INTEGER_RANGES = {
+    "integer": (-10000, 10000),
+    "int": (-10000, 10000),
+    "long": (-(10**12), 10**12),
+    "short": (-30000, 30000),
+    "byte": (-100, 100),
+    "nonPositiveInteger": (-10000, 0),
+    "nonNegativeInteger": (0, 10000),
+    "positiveInteger": (1, 10000),
+    "negativeInteger": (-10000, -1),
+}
+
+
+class XMLDataGenerator:
+    """Generate synthetic XML documents for a XSD, from the tables, occurrences and data types of its data model
+
+    Documents are built as document trees for a data model without simplifications (so that each table maps to a
+    single XML element) and written using xml2db XML conversion. They fit the structure of the schema (elements and
+    attributes, min and max occurrences, choices, data types and lengths), but facets like patterns or enumerations
+    are not enforced, so they may not pass schema validation.
+
+    Args:
+        xsd_file: A path to a XSD file
+        base_url: The root folder to find other dependant XSD files (by default, the location of the provided XSD file)
+        fanout: The maximum number of occurrences generated for repeated elements (except the ones scaled by `size`)
+        fill_rate: The probability to generate optional elements (attributes are always generated)
+        max_depth: Optional elements deeper than this level are never generated (limits recursive structures)
+        seed: A seed for the random generator, to generate the same documents for the same arguments
+
+    Examples:
+        Generate a document with 10,000 top-level repeated elements:
+        >>> generator = XMLDataGenerator("path/to/file.xsd", fanout=3)
+        >>> generator.write_xml("big_file.xml", size=10000)
+    """
+
+    def __init__(
+        self,
+        xsd_file: str,
+        base_url: str = None,
+        fanout: int = 3,
+        fill_rate: float = 0.8,
+        max_depth: int = 12,
+        seed: int = 0,
+    ):
+        """Constructor method"""
+        self.model = DataModel(
+            xsd_file, base_url=base_url, model_config={"transform": False}
+        )
+        self.fanout = fanout
+        self.fill_rate = fill_rate
+        self.max_depth = max_depth
+        self.seed = seed
+        self.random = random.Random(seed)
+
+    def document_tree(self, size: int = 100) -> tuple:
+        """Generate a document tree
+
+        Args:
+            size: The number of occurrences of repeated elements at the first level of the document which has some
+                (the other repeated elements have between 1 and `fanout` occurrences)
+
+        Returns:
+            A document tree, as a (node_type, content) tuple
+        """
+        self.random.seed(self.seed)
+        return self._node(self.model.root_table, size, 0)
+
+    def to_xml(self, size: int = 100, out_file: str = None):
+        """Generate a document and convert it to XML
+
+        Args:
+            size: See [`document_tree`][benchmarks.datagen.XMLDataGenerator.document_tree]
+            out_file: If provided, write output to this file
+
+        Returns:
+            The `lxml.etree.Element` of the root XML node
+        """
+        converter = XMLConverter(self.model)
+        converter.document_tree = self.document_tree(size)
+        return converter.to_xml(out_file=out_file)
+
+    def write_xml(self, out_file: str, size: int = 100) -> None:
+        """Generate a document and write it to an XML file
+
+        Args:
+            out_file: The path of the file to write
+            size: See [`document_tree`][benchmarks.datagen.XMLDataGenerator.document_tree]
+        """
+        converter = XMLConverter(self.model)
+        converter.document_tree = self.document_tree(size)
+        converter.write_xml(out_file)
+
+    def _node(self, node_type: str, size: Union[int, None], depth: int) -> tuple:
+        """Generate a node of a given type, scaling its first repeated children with `size` if not None"""
+        tb = self.model.tables[node_type]
+        fields = tb.fields
+        if tb.is_virtual_node:
+            # the virtual root of a schema with several global elements: only one of them is the document element
+            fields = [self._document_element(tb)]
+            required = True
+        elif tb.model_group == "choice" and fields:
+            attributes = [f for f in fields if f[0] == "col" and f[2].is_attr]
+            elements = [f for f in fields if f not in attributes]
+            fields = attributes + ([self.random.choice(elements)] if elements else [])
+            required = True
+        else:
+            required = False
+        scale_here = size is not None and any(ft == "reln" for ft, _, _ in fields)
+
+        content = {}
+        # fields of a repeated nested sequence (same "ngroup") must have the same number of occurrences
+        ngroup_counts = {}
+        for field_type, name, field in fields:
+            if field.ngroup is not None:
+                if field.ngroup not in ngroup_counts:
+                    ngroup_counts[field.ngroup] = (
+                        size if scale_here else self._count(field.occurs, depth, required)
+                    )
+                count = ngroup_counts[field.ngroup]
+            elif field_type == "col" and field.is_attr:
+                # attributes are always generated, since required ones cannot be told apart
+                count = 1
+            else:
+                count = None
+            if field_type == "col":
+                if count is None:
+                    count = self._count(field.occurs, depth, required)
+                if count:
+                    content[field.content_key] = [
+                        self._value(field) for _ in range(count)
+                    ]
+            elif field_type == "rel1":
+                if required or self._count(field.occurs, depth, False):
+                    content[name] = [
+                        self._node(
+                            field.other_table.type_name,
+                            None if scale_here else size,
+                            depth + 1,
+                        )
+                    ]
+            else:
+                if scale_here:
+                    count = size
+                elif count is None:
+                    count = self._count(field.occurs, depth, required)
+                if count:
+                    content[name] = [
+                        self._node(field.other_table.type_name, None, depth + 1)
+                        for _ in range(count)
+                    ]
+        return node_type, content
+
+    def _document_element(self, root_table) -> tuple:
+        """Choose the document element of a schema with several global elements: the first one which is not used
+        in another element"""
+        used = {
+            rel.other_table.type_name
+            for tb in self.model.tables.values()
+            if tb is not root_table
+            for field_type, _, rel in tb.fields
+            if field_type != "col"
+        }
+        for field in root_table.fields:
+            if field[0] != "col" and field[2].other_table.type_name not in used:
+                return field
+        return root_table.fields[0]
+
+    def _count(self, occurs: list, depth: int, required: bool) -> int:
+        """Draw a number of occurrences for a field"""
+        min_occurs = max(occurs[0], 1 if required else 0)
+        if min_occurs == 0 and (
+            depth >= self.max_depth or self.random.random() >= self.fill_rate
+        ):
+            return 0
+        max_occurs = self.fanout if occurs[1] is None else min(occurs[1], self.fanout)
+        return self.random.randint(max(min_occurs, 1), max(max_occurs, min_occurs, 1))
+
+    def _value(self, col) -> str:
+        """Draw a value for a column, according to its data type and length"""
+        rnd = self.random
+        data_type = col.data_type
+        if data_type in _INTEGER_RANGES:
+            return str(rnd.randint(*_INTEGER_RANGES[data_type]))
+        if data_type in ("decimal", "float", "double"):
+            return f"{rnd.uniform(0, 10000):.2f}"
+        if data_type == "boolean":
+            return rnd.choice(("true", "false"))
+        if data_type == "date":
+            return f"20{rnd.randint(10, 30)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+        if data_type == "time":
+            return f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}"
+        if data_type == "dateTime":
+            return (
+                f"20{rnd.randint(10, 30)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+                f"T{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}"
+                f"{rnd.choice(('Z', '+01:00', '+02:00', '-05:00'))}"
+            )
+        if data_type in ("binary", "hexBinary"):
+            return rnd.randbytes(self._length(col, 16) // 2 or 1).hex().upper()
+        if data_type == "base64Binary":
+            return base64.b64encode(rnd.randbytes(12)).decode("ascii")
+        length = self._length(col, 12)
+        return "".join(rnd.choices(string.ascii_letters + string.digits, k=length))
+
+    def _length(self, col, default: int) -> int:
+        """Draw a string length within the column min and max lengths"""
+        min_length = col.min_length or 0
+        max_length = col.max_length if col.max_length is not None else max(default, min_length)
+        if min_length >= max_length:
+            return max_length
+        return self.random.randint(max(min_length, min(default // 2, max_length)), max_length)
@@ -0,0 +1,214 @@
+"""Measurement of xml2db loading phases (parse, flatten, stage, merge) for a XML file and a database."""
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Union
+
+from sqlalchemy.engine import make_url
+
+from xml2db import DataModel, Document
+
+from .datagen import XMLDataGenerator
+
+# databases which can be benchmarked locally, without a connection string
+LOCAL_DATABASES = {
+    "duckdb": "duckdb:///{directory}/xml2db_benchmark.duckdb",
+    "sqlite": "sqlite:///{directory}/xml2db_benchmark.sqlite",
+}
+
+
+def peak_rss_mb() -> Union[float, None]:
+    """Get the peak resident set size of the current process
+
+    Returns:
+        The peak RSS in MB, or `None` if it is not available on this platform
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+
+@dataclass
+class PhaseResult:
+    """Measurements for a loading phase
+
+    Attributes:
+        name: The phase name (`parse`, `hash`, `flatten`, `stage`, `merge` or `cleanup`)
+        duration: Seconds spent in this phase
+        records: The number of flat data records processed
+        peak_rss_mb: The peak RSS of the process at the end of the phase, in MB
+    """
+
+    name: str
+    duration: float
+    records: int
+    peak_rss_mb: Union[float, None]
+
+    @property
+    def throughput(self) -> float:
+        """Records processed per second"""
+        return self.records / self.duration if self.duration > 0 else float("inf")
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for loading a XML file into a database
+
+    Attributes:
+        db: The database connection string (or local database name)
+        xml_file: The path of the loaded XML file
+        xml_size: The size of the XML file, in bytes
+        records: The number of flat data records (including n-n relationships records)
+        phases: Measurements for each phase
+    """
+
+    db: str
+    xml_file: str
+    xml_size: int
+    records: int
+    phases: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert results to a dict, e.g. to dump them to JSON
+
+        Returns:
+            A dict of results, with throughputs added to phases
+        """
+        res = asdict(self)
+        for phase, phase_dict in zip(self.phases, res["phases"]):
+            phase_dict["throughput"] = phase.throughput
+        return res
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self.db}: {self.records} records ({self.xml_size / 1024**2:.1f} MB of XML)",
+            f"    {'phase':<10}{'seconds':>10}{'records/s':>14}{'peak RSS (MB)':>16}",
+        ]
+        for phase in self.phases:
+            rss = "" if phase.peak_rss_mb is None else f"{phase.peak_rss_mb:.0f}"
+            lines.append(
+                f"    {phase.name:<10}{phase.duration:>10.3f}{phase.throughput:>14.0f}{rss:>16}"
+            )
+        return "\n".join(lines)
+
+
+def count_records(flat_data: dict) -> int:
+    """Count records of flat data, including n-n relationships records
+
+    Args:
+        flat_data: A `Document.data` dict
+
+    Returns:
+        The number of records
+    """
+    return sum(
+        len(data["records"])
+        + sum(len(rel["records"]) for rel in data.get("relations_n", {}).values())
+        for data in flat_data.values()
+    )
+
+
+def run_benchmark(
+    xsd_file: str,
+    db: str,
+    xml_file: str = None,
+    size: int = 1000,
+    fanout: int = 3,
+    model_config: dict = None,
+    db_schema: str = None,
+    directory: str = None,
+    seed: int = 0,
+    **model_kwargs,
+) -> BenchmarkResult:
+    """Load a XML file into an empty database and measure each loading phase
+
+    Target tables are dropped and recreated before loading the file, and dropped afterwards.
+
+    Args:
+        xsd_file: A path to a XSD file
+        db: A connection string, or the name of a local database (`duckdb` or `sqlite`) to create in `directory`
+        xml_file: The XML file to load; if `None`, a XML file is generated in `directory` with
+            [`XMLDataGenerator`][benchmarks.datagen.XMLDataGenerator]
+        size: The number of top-level repeated elements of the generated XML file
+        fanout: The maximum number of occurrences of other repeated elements of the generated XML file
+        model_config: The data model config
+        db_schema: A database schema name to use
+        directory: A directory for generated files and local databases (a temporary directory if `None`)
+        seed: The seed used to generate the XML file
+        **model_kwargs: Other keyword arguments passed to `DataModel` (e.g. `dialect_options`)
+
+    Returns:
+        A `BenchmarkResult` object
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = tmp_dir if directory is None else directory
+        if xml_file is None:
+            xml_file = os.path.join(directory, f"xml2db_benchmark_{size}_{fanout}.xml")
+            XMLDataGenerator(xsd_file, fanout=fanout, seed=seed).write_xml(
+                xml_file, size=size
+            )
+
+        model_config = dict(model_config or {})
+        connection_string = LOCAL_DATABASES.get(db, db).format(directory=directory)
+        if make_url(connection_string).get_backend_name() == "sqlite":
+            # SQLite DateTime columns only accept python datetime values
+            model_config.setdefault("parse_datetimes", True)
+
+        model = DataModel(
+            xsd_file,
+            connection_string=connection_string,
+            db_schema=db_schema,
+            model_config=model_config,
+            **model_kwargs,
+        )
+        try:
+            model.create_db_schema()
+            model.drop_all_tables()
+            model.create_all_tables()
+            result = _measure(model, db, xml_file)
+        finally:
+            model.drop_all_tables()
+            model.engine.dispose()
+    return result
+
+
+def _measure(model: DataModel, db: str, xml_file: str) -> BenchmarkResult:
+    """Load a XML file with a data model and measure each phase"""
+    doc = Document(model)
+    doc.xml_file_path = xml_file
+
+    document_tree = model.xml_converter.parse_xml(
+        xml_file=xml_file, file_path=xml_file, skip_validation=True, time_hashing=True
+    )
+    rss_parse = peak_rss_mb()
+
+    t0 = time.perf_counter()
+    doc.data = doc.doc_tree_to_flat_data(document_tree)
+    duration_flatten = time.perf_counter() - t0
+    rss_flatten = peak_rss_mb()
+    del document_tree
+
+    records = count_records(doc.data)
+    stats = doc.insert_into_target_tables()
+    rss_load = peak_rss_mb()
+
+    return BenchmarkResult(
+        db=db,
+        xml_file=xml_file,
+        xml_size=os.path.getsize(xml_file),
+        records=records,
+        phases=[
+            PhaseResult("parse", model.xml_converter.duration_parse, records, rss_parse),
+            PhaseResult("hash", model.xml_converter.duration_hash, records, rss_parse),
+            PhaseResult("flatten", duration_flatten, records, rss_flatten),
+            PhaseResult("stage", stats.duration_temp_insert, records, rss_load),
+            PhaseResult("merge", stats.duration_merge, records, rss_load),
+            PhaseResult("cleanup", stats.duration_cleanup, records, rss_load),
+        ],
+    )
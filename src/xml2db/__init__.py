@@ -1,5 +1,14 @@
 from .model import DataModel
-from .document import Document, LoadStats, MergeStats
+from .document import (
+    BatchLoader,
+    Document,
+    LoadStats,
+    MergeStats,
+    ParseStats,
+    StatementStats,
+    TableStats,
+)
+from .columnar import ColumnarRecords
 from .table import (
     DataModelTable,
     DataModelTableReused,
@@ -13,8 +22,13 @@ from .config import ModelConfig, TableConfig, FieldConfig, load_config, parse_ya
 __all__ = [
     "DataModel",
     "Document",
+    "BatchLoader",
     "LoadStats",
     "MergeStats",
+    "TableStats",
+    "StatementStats",
+    "ParseStats",
+    "ColumnarRecords",
     "DataModelTable",
     "DataModelTableReused",
     "DataModelTableDuplicated",
@@ -0,0 +1,122 @@
+"""Conversion of flat data records to Apache Arrow tables (requires the optional ``pyarrow`` package)."""
+from typing import Any, Union
+
+from sqlalchemy import (
+    BINARY,
+    VARBINARY,
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Integer,
+    LargeBinary,
+    Numeric,
+    SmallInteger,
+    String,
+    Table,
+)
+
+from .columnar import ColumnarRecords
+
+
+def import_pyarrow() -> Any:
+    """Import pyarrow lazily, since it is an optional dependency
+
+    Returns:
+        The `pyarrow` module
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required to export data to Arrow or Parquet. Install with: pip install xml2db[arrow]"
+        )
+    return pyarrow
+
+
+def sa_type_to_arrow(sa_type: Any) -> Any:
+    """Get the Arrow data type corresponding to a SQLAlchemy column type
+
+    Args:
+        sa_type: A SQLAlchemy type instance
+
+    Returns:
+        A `pyarrow.DataType`, or `None` if there is no obvious mapping (type is then inferred from values)
+    """
+    pa = import_pyarrow()
+    # Order matters: subclasses must appear before their parent class.
+    for type_cls, arrow_type in (
+        (Boolean, pa.bool_()),
+        (SmallInteger, pa.int16()),
+        (BigInteger, pa.int64()),
+        (Integer, pa.int32()),
+        (Numeric, pa.float64()),
+        (DateTime, pa.timestamp("us", tz="UTC")),
+        (Date, pa.date32()),
+        (String, pa.string()),
+        ((LargeBinary, BINARY, VARBINARY), pa.binary()),
+    ):
+        if isinstance(sa_type, type_cls):
+            return arrow_type
+    return None
+
+
+def records_to_arrow(
+    records: Union[list, ColumnarRecords],
+    table: Table,
+    types: dict = None,
+    columns: list = None,
+    strict: bool = True,
+) -> Any:
+    """Convert flat data records to an Arrow table, with one column for each column of a SQLAlchemy table
+
+    Columns missing from records are filled with their Python-side scalar default if any, or with nulls.
+
+    Args:
+        records: A list of dicts or a `ColumnarRecords` object
+        table: The SQLAlchemy `Table` records would be inserted into (usually a temporary table); its columns names
+            are used as Arrow columns names
+        types: Arrow data types to use for some columns, keyed by column key, instead of the ones mapped from
+            SQLAlchemy types
+        columns: The keys of the columns to convert, in this order (by default, all the columns of the table)
+        strict: If `False`, columns whose values do not fit their Arrow data type are converted to strings instead
+            of raising an error, so that they can be cast by the database
+
+    Returns:
+        A `pyarrow.Table`
+    """
+    pa = import_pyarrow()
+    types = types or {}
+    n = len(records)
+    if isinstance(records, ColumnarRecords):
+        record_keys = records.keys()
+    else:
+        record_keys = records[0].keys() if n > 0 else []
+
+    arrays, fields = [], []
+    cols = table.columns if columns is None else [table.c[key] for key in columns]
+    for col in cols:
+        if col.key in record_keys:
+            if isinstance(records, ColumnarRecords):
+                values = records.column(col.key)
+            else:
+                values = [record.get(col.key) for record in records]
+        elif col.default is not None and col.default.is_scalar:
+            values = [col.default.arg] * n
+        else:
+            values = [None] * n
+        arrow_type = types.get(col.key, sa_type_to_arrow(col.type))
+        try:
+            array = pa.array(values, type=arrow_type)
+        except (pa.ArrowException, TypeError, ValueError, OverflowError):
+            if strict:
+                raise
+            array = pa.array(
+                [None if v is None else str(v) for v in values], pa.string()
+            )
+        arrays.append(array)
+        fields.append(pa.field(col.name, array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
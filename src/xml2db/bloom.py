@@ -0,0 +1,122 @@
+"""Bloom filters of record hashes existing in target tables."""
+import hashlib
+import json
+import math
+import os
+import struct
+from typing import Iterable
+
+_MAGIC = b"XML2DBBF"
+
+
+class BloomFilter:
+    """A Bloom filter of record hashes of a reused target table
+
+    It tells whether a record hash is definitely not in the table, or may be in it, with a false positive probability
+    of about `error_rate` as long as it holds less than `capacity` hashes. Record hashes are already uniformly
+    distributed digests, so bit positions are derived from them directly by double hashing.
+
+    Args:
+        capacity: The expected number of hashes
+        error_rate: The false positive probability at full capacity
+
+    Attributes:
+        count: The number of hashes added
+        max_pk: The highest primary key of the records added, from which the filter can be caught up with the table
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """Constructor method"""
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.max_pk = 0
+
+    def __repr__(self) -> str:
+        return f"BloomFilter({self.count}/{self.capacity} hashes, max_pk={self.max_pk})"
+
+    def _positions(self, record_hash: bytes) -> Iterable[int]:
+        """Get the bit positions of a record hash"""
+        if len(record_hash) < 16:
+            record_hash = hashlib.blake2b(bytes(record_hash), digest_size=16).digest()
+        h1 = int.from_bytes(record_hash[:8], "little")
+        h2 = int.from_bytes(record_hash[8:16], "little") | 1
+        num_bits = self.num_bits
+        return ((h1 + i * h2) % num_bits for i in range(self.num_hashes))
+
+    def __contains__(self, record_hash: bytes) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(record_hash))
+
+    def add(self, record_hash: bytes) -> None:
+        """Add a record hash
+
+        Args:
+            record_hash: The record hash
+        """
+        bits = self.bits
+        for pos in self._positions(record_hash):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, rows: Iterable[tuple]) -> None:
+        """Add record hashes read from a table
+
+        Args:
+            rows: `(record_hash, primary_key)` tuples
+        """
+        for record_hash, pk in rows:
+            self.add(bytes(record_hash))
+            if pk > self.max_pk:
+                self.max_pk = pk
+
+    def save(self, path: str) -> None:
+        """Write the filter to a file
+
+        Args:
+            path: The file path (the file is replaced atomically)
+        """
+        header = json.dumps(
+            {
+                "capacity": self.capacity,
+                "error_rate": self.error_rate,
+                "count": self.count,
+                "max_pk": self.max_pk,
+            }
+        ).encode("utf-8")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BloomFilter":
+        """Read a filter from a file written by [`save`][xml2db.bloom.BloomFilter.save]
+
+        Args:
+            path: The file path
+
+        Returns:
+            A `BloomFilter` object
+        """
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a Bloom filter file")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            bloom_filter = cls(header["capacity"], header["error_rate"])
+            bits = f.read()
+        if len(bits) != len(bloom_filter.bits):
+            raise ValueError(f"{path} is not a valid Bloom filter file")
+        bloom_filter.bits = bytearray(bits)
+        bloom_filter.count = header["count"]
+        bloom_filter.max_pk = header["max_pk"]
+        return bloom_filter
@@ -0,0 +1,84 @@
+"""A client-side cache of record hashes known to exist in target tables."""
+import threading
+from collections import OrderedDict
+from typing import Iterable, Union
+
+
+class HashCache:
+    """A bounded mapping of `(table name, record hash)` to the primary key of the record in the target table, with
+    least recently used eviction.
+
+    It is used by [`DataModel`][xml2db.model.DataModel] (see its `hash_cache_size` argument) so that nodes of reused
+    tables which are already in the database are not staged with their whole subtree. Entries are added after each
+    successful load, or read from the database with
+    [`DataModel.warm_hash_cache`][xml2db.model.DataModel.warm_hash_cache].
+
+    Cached primary keys are assumed to stay valid, which holds as long as records are not deleted from target tables
+    by other means than [`DataModel.drop_all_tables`][xml2db.model.DataModel.drop_all_tables], which clears the cache.
+
+    Args:
+        max_size: The maximum number of entries
+
+    Attributes:
+        hits: The number of successful lookups
+        misses: The number of failed lookups
+    """
+
+    def __init__(self, max_size: int):
+        """Constructor method"""
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"HashCache({len(self._entries)}/{self.max_size} entries, hits={self.hits}, misses={self.misses})"
+
+    def get(self, table_name: str, record_hash: bytes) -> Union[int, None]:
+        """Get the primary key of a record, and mark it as recently used
+
+        Args:
+            table_name: The target table name
+            record_hash: The record hash
+
+        Returns:
+            The primary key of the record in the target table, or `None` if it is not cached
+        """
+        key = (table_name, record_hash)
+        with self._lock:
+            pk = self._entries.get(key)
+            if pk is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pk
+
+    def update(self, table_name: str, items: Iterable[tuple]) -> None:
+        """Add or refresh entries of a table, evicting least recently used entries beyond `max_size`
+
+        Args:
+            table_name: The target table name
+            items: `(record_hash, primary_key)` tuples
+        """
+        entries = self._entries
+        with self._lock:
+            for record_hash, pk in items:
+                if pk is None:
+                    continue
+                key = (table_name, bytes(record_hash))
+                entries[key] = pk
+                entries.move_to_end(key)
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
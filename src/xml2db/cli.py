@@ -13,6 +13,7 @@ from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Optional
 
 from .config import load_config, parse_yaml_config
+from .document import Document
 from .model import DataModel
 
 
@@ -45,15 +46,26 @@ def cmd_import(args: argparse.Namespace) -> None:
         model_config=config,
         connection_string=args.connection_string,
         db_schema=args.db_schema,
+        cache_dir=args.cache_dir,
     )
-    doc = model.parse_xml(
-        xml_file=args.xml_file,
-        metadata=metadata,
-        skip_validation=not args.validate,
-        iterparse=not args.no_iterparse,
-        recover=args.recover,
-    )
-    stats = doc.insert_into_target_tables()
+    if args.stream:
+        stats = Document(model).stream_into_target_tables(
+            xml_file=args.xml_file,
+            metadata=metadata,
+            chunk_size=args.chunk_size,
+            chunk_element=args.chunk_element,
+            skip_validation=not args.validate,
+            recover=args.recover,
+        )
+    else:
+        doc = model.parse_xml(
+            xml_file=args.xml_file,
+            metadata=metadata,
+            skip_validation=not args.validate,
+            iterparse=not args.no_iterparse,
+            recover=args.recover,
+        )
+        stats = doc.insert_into_target_tables()
     if stats.row_counts_available:
         counts = f"{stats.inserted} rows inserted, {stats.existing} rows already existed"
     else:
@@ -74,6 +86,7 @@ def cmd_render(args: argparse.Namespace) -> None:
         short_name=args.short_name,
         model_config=config,
         db_type=db_type,
+        cache_dir=args.cache_dir,
     )
     fmt = args.format
     if fmt == "erd":
@@ -372,13 +385,13 @@ import { yaml } from "@codemirror/lang-yaml";
 const SCHEMA_INFO = TMPL_SCHEMA_INFO_JSON;
 
 // ---- completion knowledge ----
-const ROOT_KEYS  = ['as_columnstore','row_numbers','transform','record_hash_column_name',
-                    'record_hash_size','metadata_columns','tables'];
+const ROOT_KEYS  = ['as_columnstore','row_numbers','transform','record_hash_column_name','record_hash_constructor',
+                    'record_hash_size','parse_datetimes','metadata_columns','tables'];
 const TABLE_KEYS = ['reuse','as_columnstore','choice_transform','extra_args','fields'];
 const FIELD_KEYS = ['type','rename','transform'];
 const META_KEYS  = ['name','type','nullable','default','server_default','comment','index','unique'];
 const INDEX_KEYS = ['name','columns','unique'];
-const BOOL_KEYS        = new Set(['reuse','as_columnstore','row_numbers','nullable','unique','index']);
+const BOOL_KEYS        = new Set(['reuse','as_columnstore','row_numbers','parse_datetimes','nullable','unique','index']);
 const CHOICE_TRANSFORM = ['auto','true','false'];
 const SA_TYPES   = ['String','String(100)','Integer','BigInteger','SmallInteger','Float',
                     'Double','Numeric','Boolean','DateTime','DateTime(timezone=True)',
@@ -719,6 +732,16 @@ def main() -> None:
                    help="Use recursive parser instead of iterparse (higher memory usage)")
     i.add_argument("--recover", action="store_true",
                    help="Attempt to parse malformed XML")
+    i.add_argument("--stream", action="store_true",
+                   help="Load children of the root element by chunks while parsing (bounded memory usage)")
+    i.add_argument("--chunk-size", type=int, default=1000, metavar="N",
+                   help="Number of root children per chunk in streaming mode (default: 1000)")
+    i.add_argument("--chunk-element", metavar="NAME", default=None,
+                   help="Element or table type name to stream at any depth, instead of children of the root "
+                        "element (streaming mode only)")
+    i.add_argument("--cache-dir", metavar="DIR", default=None,
+                   help="Directory to cache the data model into, to skip XSD parsing on next runs "
+                        "(must be private to the current user, as cache files are unpickled)")
 
     r = sub.add_parser("render", help="Print ERD, tree or DDL to stdout or a file")
     r.add_argument("xsd_file", help="Path to the XSD schema file")
@@ -736,6 +759,9 @@ def main() -> None:
                    help="Database backend for DDL output (postgresql, mssql, mysql, …)")
     r.add_argument("--db-names", action="store_true",
                    help="Use physical database identifiers in the ERD instead of logical names")
+    r.add_argument("--cache-dir", metavar="DIR", default=None,
+                   help="Directory to cache the data model into, to skip XSD parsing on next runs "
+                        "(must be private to the current user, as cache files are unpickled)")
 
     s = sub.add_parser("serve", help="Launch an interactive schema explorer in the browser")
     s.add_argument("xsd_file", help="Path to the XSD schema file")
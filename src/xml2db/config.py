@@ -1,8 +1,10 @@
 """Typed config definitions and YAML loading utilities for xml2db."""
 from __future__ import annotations
 
+import functools
+import hashlib
 import re
-from typing import Any, TypedDict
+from typing import Any, Callable, TypedDict
 
 import sqlalchemy as sa
 
@@ -10,7 +12,7 @@ from .exceptions import DataModelConfigError
 
 # Keys that require Python callables; cannot be expressed in YAML
 _CALLABLE_ONLY_KEYS: frozenset[str] = frozenset(
-    {"document_tree_hook", "document_tree_node_hook", "record_hash_constructor"}
+    {"document_tree_hook", "document_tree_node_hook", "load_stats_hook"}
 )
 
 # ---------------------------------------------------------------------------
@@ -106,6 +108,82 @@ def resolve_sa_type(type_spec: Any) -> Any:
     return type_cls(*args, **kwargs)
 
 
+# ---------------------------------------------------------------------------
+# Record hash constructor resolver
+# ---------------------------------------------------------------------------
+
+_XXHASH_ALGORITHMS: frozenset[str] = frozenset(
+    {"xxh32", "xxh64", "xxh128", "xxh3_64", "xxh3_128"}
+)
+
+
+def resolve_hash_constructor(spec: Any, digest_size: int = 20) -> Callable:
+    """Resolve a record hash constructor name to a callable, or pass through.
+
+    Args:
+        spec: A callable with a signature similar to ``hashlib`` constructors, or
+            an algorithm name: any name supported by ``hashlib.new`` (e.g.
+            ``"sha1"``, ``"md5"``, ``"sha256"``), ``"blake2b"`` / ``"blake2s"``
+            (built with ``digest_size``), or a ``xxhash`` algorithm name such as
+            ``"xxh3_128"`` (requires the optional ``xxhash`` package).
+        digest_size: The digest size to use for algorithms with a configurable
+            digest size, i.e. ``record_hash_size``.
+
+    Returns:
+        A zero-argument callable returning a hash object.
+
+    Raises:
+        DataModelConfigError: If the name is unknown or has a variable digest
+            length (e.g. ``"shake_128"``), or if ``spec`` is neither a string
+            nor a callable.
+    """
+    if callable(spec):
+        return spec
+    if not isinstance(spec, str):
+        raise DataModelConfigError(
+            "'record_hash_constructor' must be callable or an algorithm name"
+        )
+    name = spec.strip().lower()
+    if name.startswith("shake_"):
+        raise DataModelConfigError(
+            f"Record hash algorithm '{spec}' has a variable digest length"
+        )
+    if name in ("blake2b", "blake2s"):
+        return functools.partial(getattr(hashlib, name), digest_size=digest_size)
+    if name in _XXHASH_ALGORITHMS:
+        try:
+            import xxhash
+        except ImportError:
+            raise ImportError(
+                f"xxhash is required to use '{name}' as record hash constructor. "
+                "Install with: pip install xxhash"
+            )
+        return getattr(xxhash, name)
+    if name in hashlib.algorithms_available:
+        return functools.partial(hashlib.new, name)
+    raise DataModelConfigError(f"Unknown record hash algorithm: '{spec}'")
+
+
+def hash_digest_size(constructor: Callable) -> int:
+    """Get the digest size of the hash objects built by a record hash constructor.
+
+    Args:
+        constructor: A zero-argument callable returning a hash object.
+
+    Returns:
+        The byte size of digests.
+
+    Raises:
+        DataModelConfigError: If digests have a variable length.
+    """
+    try:
+        return len(constructor().digest())
+    except TypeError:
+        raise DataModelConfigError(
+            "'record_hash_constructor' must build hashes with a fixed digest length"
+        )
+
+
 # ---------------------------------------------------------------------------
 # TypedDicts
 # ---------------------------------------------------------------------------
@@ -149,9 +227,11 @@ class ModelConfig(TypedDict, total=False):
     transform: Any                 # False or "auto" (default)
     document_tree_hook: Any        # callable, Python only
     document_tree_node_hook: Any   # callable, Python only
+    load_stats_hook: Any           # callable, Python only
     record_hash_column_name: str
-    record_hash_constructor: Any   # callable, Python only
+    record_hash_constructor: Any   # algorithm name (e.g. "blake2b") or callable (Python only)
     record_hash_size: int
+    parse_datetimes: bool
     metadata_columns: list[MetadataColumnConfig]
     tables: dict[str, TableConfig]
 
@@ -173,6 +253,15 @@ def _check_config(data: dict, *, from_yaml: bool) -> None:
                 "file. Pass a Python dict with the callable directly instead."
             )
 
+    # record_hash_constructor: only algorithm names can be set from YAML
+    if "record_hash_constructor" in data and not isinstance(
+        data["record_hash_constructor"], str
+    ):
+        raise DataModelConfigError(
+            "'record_hash_constructor' must be an algorithm name (e.g. 'sha1') in a "
+            "YAML config file. Pass a Python dict with the callable directly instead."
+        )
+
     # metadata_columns: each entry's 'type' must be a string
     for i, col_cfg in enumerate(data.get("metadata_columns", [])):
         if not isinstance(col_cfg, dict):
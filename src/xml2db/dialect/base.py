@@ -1,5 +1,6 @@
 import hashlib
 import logging
+from datetime import datetime
 from typing import Any, TYPE_CHECKING
 
 from sqlalchemy import (
@@ -19,6 +20,8 @@ from sqlalchemy import (
 from sqlalchemy import inspect as sqlalchemy_inspect
 import sqlalchemy.schema
 
+from ..columnar import ColumnarRecords, iter_record_rows
+
 if TYPE_CHECKING:
     from ..table.column import DataModelColumn
 
@@ -36,9 +39,26 @@ class DatabaseDialect:
         MAX_IDENTIFIER_LENGTH: Maximum number of characters allowed in a table
             or column name by this backend. Used by :meth:`db_identifier` to
             decide whether truncation is needed.
+        DATETIME_PARAMS_AS_TEXT: Whether ``datetime`` values (see the
+            ``parse_datetimes`` model option) are sent as ISO 8601 text by the
+            executemany path of :meth:`bulk_insert`, for drivers which drop
+            time zone offsets of ``datetime`` parameters, or temp tables which
+            store them as text.
+        CONCURRENT_STAGING: Whether temporary tables can be loaded
+            concurrently from several connections (see the ``staging_workers``
+            argument of :class:`~xml2db.model.DataModel`). It is disabled by
+            default, e.g. for embedded databases which serialize writes.
+        INSERT_RETURNING_CTE: Whether an ``INSERT ... RETURNING`` statement
+            can be used in a CTE of an ``UPDATE`` statement. If so, merging a
+            reused table writes primary keys of new records back to its
+            temporary table from the inserted rows, instead of looking them up
+            by hash in the target table.
     """
 
     MAX_IDENTIFIER_LENGTH: int = 63  # conservative default; matches PostgreSQL
+    DATETIME_PARAMS_AS_TEXT: bool = False
+    CONCURRENT_STAGING: bool = False
+    INSERT_RETURNING_CTE: bool = False
 
     def __init__(self, **kwargs):
         pass
@@ -341,10 +361,68 @@ class DatabaseDialect:
         """
         return _sa_create_engine(connection_string, **kwargs)
 
+    # ------------------------------------------------------------------
+    # Temporary tables
+    # ------------------------------------------------------------------
+
+    def truncate_tables(self, conn: Any, tables: list) -> None:
+        """Remove all rows from the given tables.
+
+        Used to empty persistent temporary tables between documents. The base
+        implementation issues a ``DELETE`` statement per table, which works on
+        every backend. Subclasses override this with ``TRUNCATE`` where it is
+        cheaper.
+
+        Args:
+            conn: A SQLAlchemy ``Connection`` already within a transaction.
+            tables: A list of SQLAlchemy ``Table`` objects to empty.
+        """
+        for table in tables:
+            conn.execute(table.delete())
+
     # ------------------------------------------------------------------
     # Data loading
     # ------------------------------------------------------------------
 
+    def bulk_rows(self, table: Any, records: Any) -> tuple:
+        """Get the columns and rows of values to bulk load records into a table.
+
+        Records may be a list of dicts or a
+        :class:`~xml2db.columnar.ColumnarRecords` object, which is read column
+        by column. Columns are the ones found in records (the first record of a
+        list of dicts) which belong to the table, followed by columns with a
+        Python-side scalar default (e.g. ``default=False`` on ``temp_exists``)
+        absent from records: executemany applies those automatically, but bulk
+        loading paths have to write them explicitly.
+
+        Args:
+            table: The SQLAlchemy ``Table`` object to insert into.
+            records: A non-empty list of dicts or ``ColumnarRecords``.
+
+        Returns:
+            A tuple ``(col_keys, rows)`` where ``col_keys`` is the list of
+            column keys and ``rows`` an iterator of tuples of values, in the
+            order of ``col_keys``.
+        """
+        col_by_key = {col.key: col for col in table.columns}
+        record_keys = (
+            records.keys() if isinstance(records, ColumnarRecords) else records[0]
+        )
+        col_keys = [k for k in record_keys if k in col_by_key]
+
+        extra_defaults: dict = {}
+        for col in table.columns:
+            if col.key not in record_keys:
+                d = col.default
+                if d is not None and d.is_scalar:
+                    extra_defaults[col.key] = d.arg
+
+        rows = iter_record_rows(records, col_keys)
+        if extra_defaults:
+            defaults = tuple(extra_defaults.values())
+            rows = (row + defaults for row in rows)
+        return col_keys + list(extra_defaults), rows
+
     def bulk_insert(
         self,
         conn: Any,
@@ -353,7 +431,7 @@ class DatabaseDialect:
         *,
         bulk_load: bool | None = None,
         bulk_load_threshold: int | None = None,
-    ) -> None:
+    ) -> int | None:
         """Insert records into a staging table.
 
         The base implementation uses SQLAlchemy's parameterised executemany,
@@ -363,12 +441,28 @@ class DatabaseDialect:
         Args:
             conn: A SQLAlchemy ``Connection`` already within a transaction.
             table: The SQLAlchemy ``Table`` object to insert into.
-            records: A list of dicts mapping column keys to Python values.
+            records: A list of dicts mapping column keys to Python values, or a
+                :class:`~xml2db.columnar.ColumnarRecords` object.
             bulk_load: ``True`` to require bulk loading (raise if unavailable),
                 ``False`` to always use executemany, or ``None`` (default) to
                 use bulk loading when available and fall back silently otherwise.
             bulk_load_threshold: Minimum number of records to trigger bulk
                 loading.  ``None`` delegates the choice to the subclass.
+
+        Returns:
+            The size in bytes of the data sent by a bulk loading method (e.g.
+            the CSV file or stream), or ``None`` if records were inserted with
+            executemany.
         """
         if records:
+            if isinstance(records, ColumnarRecords):
+                records = records.to_dicts()
+            if self.DATETIME_PARAMS_AS_TEXT:
+                records = [
+                    {
+                        k: str(v) if isinstance(v, datetime) else v
+                        for k, v in record.items()
+                    }
+                    for record in records
+                ]
             conn.execute(table.insert(), records)
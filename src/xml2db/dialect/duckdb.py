@@ -2,6 +2,7 @@ import csv
 import os
 import tempfile
 from typing import Any
+from uuid import uuid4
 
 from sqlalchemy import (
     BigInteger,
@@ -18,6 +19,7 @@ from sqlalchemy import (
 from sqlalchemy.exc import ProgrammingError
 import sqlalchemy.schema
 
+from ..arrow import import_pyarrow, records_to_arrow
 from .base import DatabaseDialect
 
 # Records below this count skip read_csv (temp-file overhead).
@@ -35,11 +37,21 @@ class DuckDBDialect(DatabaseDialect):
     - **Schema creation**: DuckDB's inspector does not reliably list schemas
       before they exist, so the existence check is replaced with a try/except
       around ``CREATE SCHEMA``.
+
+    Args:
+        use_arrow: If ``True`` (default), :meth:`bulk_insert` registers record
+            batches as in-memory Arrow tables scanned by DuckDB when ``pyarrow``
+            is installed, instead of writing temporary CSV files. It can be set
+            with ``DataModel(dialect_options={"use_arrow": False})``.
     """
 
     # this limit comes from the implementation with SQLAlchemy and not a constraint of duckdb per se
     MAX_IDENTIFIER_LENGTH: int = 63
 
+    def __init__(self, use_arrow: bool = True, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.use_arrow = use_arrow
+
     def pk_column(self, table_name: str) -> Column:
         """Return a Sequence-based primary key column for DuckDB."""
         logical = f"pk_{table_name}"
@@ -90,6 +102,46 @@ class DuckDBDialect(DatabaseDialect):
                 return f'CAST("{key}" AS {duckdb_type})'
         return f'"{key}"'  # String / unknown: keep as VARCHAR
 
+    def _select_arrow_expr(self, key: str, col: Any, arrow_type: Any) -> str:
+        """Return a DuckDB SELECT expression that casts an Arrow column, if its type does not match the target."""
+        if isinstance(col.type, LargeBinary):
+            return f'"{key}"'
+        if str(arrow_type) == "string":
+            return self._select_expr(key, col)
+        for sa_type, duckdb_type in self._DUCKDB_CAST.items():
+            if isinstance(col.type, sa_type):
+                if isinstance(col.type, DateTime) and not col.type.timezone:
+                    duckdb_type = "TIMESTAMP"
+                return f'CAST("{key}" AS {duckdb_type})'
+        return f'"{key}"'
+
+    def _insert_from_arrow(self, conn: Any, table: Any, records: Any, full_name: str) -> int:
+        """Insert records by registering them as an in-memory Arrow table and selecting from it, and return the
+        Arrow table size in bytes."""
+        col_by_key = {col.key: col for col in table.columns}
+        all_col_keys, _ = self.bulk_rows(table, records)
+        # values which do not fit the Arrow type of their column are loaded as strings and cast by DuckDB
+        batch = records_to_arrow(records, table, columns=all_col_keys, strict=False)
+
+        insert_cols = ", ".join(f'"{col_by_key[k].name}"' for k in all_col_keys)
+        select_exprs = ", ".join(
+            self._select_arrow_expr(f.name, col_by_key[k], f.type)
+            for k, f in zip(all_col_keys, batch.schema)
+        )
+        view_name = f"xml2db_batch_{uuid4().hex[:12]}"
+        raw_conn = conn.connection.dbapi_connection
+        raw_conn.register(view_name, batch)
+        try:
+            conn.execute(
+                text(
+                    f"INSERT INTO {full_name} ({insert_cols}) "
+                    f'SELECT {select_exprs} FROM "{view_name}"'
+                )
+            )
+        finally:
+            raw_conn.unregister(view_name)
+        return batch.nbytes
+
     def bulk_insert(
         self,
         conn: Any,
@@ -98,10 +150,16 @@ class DuckDBDialect(DatabaseDialect):
         *,
         bulk_load: bool | None = None,
         bulk_load_threshold: int | None = None,
-    ) -> None:
-        """Bulk-insert records via a temporary CSV file and DuckDB's ``read_csv``.
+    ) -> int | None:
+        """Bulk-insert records from an in-memory Arrow table, or via a temporary CSV file and DuckDB's ``read_csv``.
 
-        All CSV columns are read as VARCHAR (``all_varchar=true``) and then
+        When ``pyarrow`` is installed (and ``use_arrow`` is ``True``), records
+        are converted to an Arrow table which is registered on the DuckDB
+        connection and scanned directly by an ``INSERT ... SELECT``: nothing is
+        written to disk, and columns whose types were inferred correctly from
+        Python values are not cast.
+
+        Otherwise, records are written to a temporary CSV file. All CSV columns are read as VARCHAR (``all_varchar=true``) and then
         explicitly cast to their target types in the ``SELECT`` clause.
         Binary columns are hex-encoded in the CSV and decoded with ``unhex()``.
 
@@ -111,47 +169,50 @@ class DuckDBDialect(DatabaseDialect):
         Args:
             conn: A SQLAlchemy ``Connection`` already within a transaction.
             table: The SQLAlchemy ``Table`` object to insert into.
-            records: A list of dicts mapping column keys to Python values.
-            bulk_load: ``True`` or ``None`` (default) to use read_csv for
+            records: A list of dicts mapping column keys to Python values, or a
+                :class:`~xml2db.columnar.ColumnarRecords` object.
+            bulk_load: ``True`` or ``None`` (default) to use Arrow or read_csv for
                 batches at or above the threshold; ``False`` to always use
                 executemany.
             bulk_load_threshold: Override the minimum batch size.  Defaults to
                 :data:`_READ_CSV_THRESHOLD` (100).
+
+        Returns:
+            The size in bytes of the Arrow table or of the CSV file, or ``None``
+            if records were inserted with executemany.
         """
         if not records:
-            return
+            return None
 
         threshold = bulk_load_threshold if bulk_load_threshold is not None else _READ_CSV_THRESHOLD
         if bulk_load is False or len(records) < threshold:
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
+
+        full_name = (
+            f'"{table.schema}"."{table.name}"'
+            if table.schema
+            else f'"{table.name}"'
+        )
+        if self.use_arrow:
+            try:
+                import_pyarrow()
+            except ImportError:
+                pass
+            else:
+                return self._insert_from_arrow(conn, table, records, full_name)
 
         # Map column key -> SQLAlchemy Column object
         col_by_key = {col.key: col for col in table.columns}
-
-        # Columns present in the first record that correspond to table columns
-        col_keys = [k for k in records[0] if k in col_by_key]
-
-        # SQLAlchemy Python-side scalar defaults (e.g. default=False on temp_exists)
-        # are applied automatically by executemany but not by our CSV path.
-        extra_defaults: dict = {}
-        for col in table.columns:
-            if col.key not in records[0] and col.key in col_by_key:
-                d = col.default
-                if d is not None and d.is_scalar:
-                    extra_defaults[col.key] = d.arg
-
-        all_col_keys = col_keys + list(extra_defaults.keys())
+        all_col_keys, rows = self.bulk_rows(table, records)
 
         fd, csv_path = tempfile.mkstemp(suffix=".csv")
         try:
             with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(all_col_keys)
-                for record in records:
+                for values in rows:
                     row = []
-                    for key in all_col_keys:
-                        v = record.get(key) if key in col_keys else extra_defaults[key]
+                    for v in values:
                         if v is None:
                             row.append("")
                         elif isinstance(v, bytes):
@@ -166,11 +227,6 @@ class DuckDBDialect(DatabaseDialect):
                             row.append(str(v))
                     writer.writerow(row)
 
-            full_name = (
-                f'"{table.schema}"."{table.name}"'
-                if table.schema
-                else f'"{table.name}"'
-            )
             insert_cols = ", ".join(
                 f'"{col_by_key[k].name}"' for k in all_col_keys
             )
@@ -185,6 +241,7 @@ class DuckDBDialect(DatabaseDialect):
                 f"FROM read_csv('{safe_path}', header=true, nullstr='', all_varchar=true, quote='\"', escape='\"')"
             )
             conn.execute(sql)
+            return os.path.getsize(csv_path)
         finally:
             if os.path.exists(csv_path):
                 os.unlink(csv_path)
@@ -1,10 +1,12 @@
+import json
 import os
 import shutil
 import subprocess
 import tempfile
+from itertools import islice
 from typing import Any, List, TYPE_CHECKING
 
-from sqlalchemy import Index
+from sqlalchemy import BINARY, VARBINARY, Index, LargeBinary, bindparam, text
 from sqlalchemy.dialects import mssql as mssql_dialect
 
 from .base import DatabaseDialect
@@ -15,6 +17,15 @@ if TYPE_CHECKING:
 
 # Records below this count go through fast_executemany; at or above, BCP is used.
 _BCP_THRESHOLD = 100
+# Number of rows sent as a single JSON document parameter with the OPENJSON bulk method.
+_OPENJSON_CHUNK_ROWS = 10000
+
+
+def _json_default(v: Any) -> str:
+    """Encode values which are not JSON-serializable: binary as hex strings, others (e.g. datetimes) as strings."""
+    if isinstance(v, (bytes, bytearray)):
+        return v.hex()
+    return str(v)
 
 
 class MSSQLDialect(DatabaseDialect):
@@ -29,9 +40,35 @@ class MSSQLDialect(DatabaseDialect):
     for batches of :data:`_BCP_THRESHOLD` rows or more. Smaller batches always
     use ``fast_executemany`` (enabled at engine level) to avoid BCP's subprocess
     overhead.
+
+    Alternatively, with ``bulk_method="openjson"``, batches are sent as JSON
+    documents in a single parameter and inserted with ``INSERT ... SELECT FROM
+    OPENJSON(...)``, in-process and within the caller's transaction, which
+    requires neither ``bcp`` nor temporary files.
+
+    Args:
+        bulk_method: ``"bcp"`` (default) or ``"openjson"``. It can be set with
+            ``DataModel(dialect_options={"bulk_method": "openjson"})``.
     """
 
     MAX_IDENTIFIER_LENGTH: int = 128
+    # dateTime columns of temp tables are VARCHAR, converted to DATETIMEOFFSET when merging
+    DATETIME_PARAMS_AS_TEXT: bool = True
+    CONCURRENT_STAGING: bool = True
+
+    def __init__(self, bulk_method: str = "bcp", **kwargs: Any):
+        super().__init__(**kwargs)
+        if bulk_method not in ("bcp", "openjson"):
+            raise ValueError(
+                f"Invalid bulk_method '{bulk_method}': expected 'bcp' or 'openjson'"
+            )
+        self.bulk_method = bulk_method
+
+    def truncate_tables(self, conn: Any, tables: list) -> None:
+        """Empty tables with ``TRUNCATE TABLE`` statements."""
+        preparer = conn.dialect.identifier_preparer
+        for table in tables:
+            conn.execute(text(f"TRUNCATE TABLE {preparer.format_table(table)}"))
 
     def validate_table_config(self, config: dict) -> dict:
         """Allow ``as_columnstore`` through unchanged for MSSQL."""
@@ -109,6 +146,60 @@ class MSSQLDialect(DatabaseDialect):
         # Tab is the field delimiter; replace any occurrence in string values.
         return s.replace("\t", " ")
 
+    @staticmethod
+    def openjson_insert_sql(table: Any, col_keys: list, sa_dialect: Any) -> str:
+        """Build an ``INSERT ... SELECT FROM OPENJSON`` statement loading rows from a JSON array parameter.
+
+        The JSON document bound to the ``data`` parameter is an array of rows, each row being an array of values in
+        the order of ``col_keys``. Binary values are expected as hex strings.
+
+        Args:
+            table: The SQLAlchemy ``Table`` object to insert into.
+            col_keys: The keys of the columns to load.
+            sa_dialect: The SQLAlchemy dialect used to render column types.
+
+        Returns:
+            The SQL statement, with a ``:data`` bind parameter.
+        """
+        col_by_key = {col.key: col for col in table.columns}
+        full_name = (
+            f"[{table.schema}].[{table.name}]"
+            if table.schema
+            else f"[{table.name}]"
+        )
+        insert_cols, select_exprs, with_cols = [], [], []
+        for i, key in enumerate(col_keys):
+            col = col_by_key[key]
+            insert_cols.append(f"[{col.name}]")
+            if isinstance(col.type, (LargeBinary, BINARY, VARBINARY)):
+                with_cols.append(f"[c{i}] VARCHAR(MAX) '$[{i}]'")
+                select_exprs.append(f"CONVERT({col.type.compile(dialect=sa_dialect)}, [c{i}], 2)")
+            else:
+                with_cols.append(f"[c{i}] {col.type.compile(dialect=sa_dialect)} '$[{i}]'")
+                select_exprs.append(f"[c{i}]")
+        return (
+            f"INSERT INTO {full_name} ({', '.join(insert_cols)}) "
+            f"SELECT {', '.join(select_exprs)} "
+            f"FROM OPENJSON(:data) WITH ({', '.join(with_cols)})"
+        )
+
+    def _openjson_insert(self, conn: Any, table: Any, records: Any) -> int:
+        """Insert records by chunks of JSON documents with ``OPENJSON``, within the connection's transaction, and
+        return the total length of JSON documents."""
+        all_col_keys, rows = self.bulk_rows(table, records)
+        query = text(
+            self.openjson_insert_sql(table, all_col_keys, conn.dialect)
+        ).bindparams(bindparam("data", type_=mssql_dialect.NVARCHAR()))
+        nbytes = 0
+        while True:
+            chunk = list(islice(rows, _OPENJSON_CHUNK_ROWS))
+            if not chunk:
+                break
+            data = json.dumps(chunk, default=_json_default, separators=(",", ":"))
+            nbytes += len(data)
+            conn.execute(query, {"data": data})
+        return nbytes
+
     def bulk_insert(
         self,
         conn: Any,
@@ -117,8 +208,12 @@ class MSSQLDialect(DatabaseDialect):
         *,
         bulk_load: bool | None = None,
         bulk_load_threshold: int | None = None,
-    ) -> None:
-        """Bulk-insert records, using BCP for large batches when available.
+    ) -> int | None:
+        """Bulk-insert records, using BCP or OPENJSON for large batches.
+
+        With ``bulk_method="openjson"``, batches meeting the threshold are
+        inserted by chunks of :data:`_OPENJSON_CHUNK_ROWS` rows, each one sent
+        as a JSON document parameter and unpacked server-side by ``OPENJSON``.
 
         Batches smaller than the effective threshold, or any batch when
         ``bulk_load=False``, use ``fast_executemany`` unconditionally.
@@ -133,22 +228,29 @@ class MSSQLDialect(DatabaseDialect):
         Args:
             conn: A SQLAlchemy ``Connection`` already within a transaction.
             table: The SQLAlchemy ``Table`` object to insert into.
-            records: A list of dicts mapping column keys to Python values.
+            records: A list of dicts mapping column keys to Python values, or a
+                :class:`~xml2db.columnar.ColumnarRecords` object.
             bulk_load: ``True`` to require BCP (raise if unavailable for this
                 batch), ``False`` to always use fast_executemany, or ``None``
                 (default) to use BCP when available and fall back silently.
             bulk_load_threshold: Override the minimum batch size for BCP.
                 Defaults to :data:`_BCP_THRESHOLD` (100).
+
+        Returns:
+            The size in bytes of the BCP data file or of the JSON documents,
+            or ``None`` if records were inserted with fast_executemany.
         """
         if not records:
-            return
+            return None
 
         threshold = bulk_load_threshold if bulk_load_threshold is not None else _BCP_THRESHOLD
 
         # bulk_load=False or batch too small → always use fast_executemany.
         if bulk_load is False or len(records) < threshold:
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
+
+        if self.bulk_method == "openjson":
+            return self._openjson_insert(conn, table, records)
 
         # Check BCP prerequisites.
         url = conn.engine.url
@@ -163,8 +265,7 @@ class MSSQLDialect(DatabaseDialect):
                     "Install mssql-tools (Linux/macOS) or SQL Server Command Line Utilities "
                     "(Windows), or set bulk_load=False to use fast_executemany instead."
                 )
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
 
         if not has_sql_auth and not trusted:
             if bulk_load is True:
@@ -174,21 +275,9 @@ class MSSQLDialect(DatabaseDialect):
                     "(Trusted_Connection=yes in the connection string query parameters). "
                     "Set bulk_load=False to use fast_executemany instead."
                 )
-            super().bulk_insert(conn, table, records)
-            return
-
-        col_by_key = {col.key: col for col in table.columns}
-        col_keys = [k for k in records[0] if k in col_by_key]
-
-        # Python-side scalar defaults absent from records (same as other dialects).
-        extra_defaults: dict = {}
-        for col in table.columns:
-            if col.key not in records[0] and col.key in col_by_key:
-                d = col.default
-                if d is not None and d.is_scalar:
-                    extra_defaults[col.key] = d.arg
+            return super().bulk_insert(conn, table, records)
 
-        all_col_keys = col_keys + list(extra_defaults.keys())
+        all_col_keys, rows = self.bulk_rows(table, records)
 
         full_name = (
             f"[{table.schema}].[{table.name}]"
@@ -199,12 +288,8 @@ class MSSQLDialect(DatabaseDialect):
         fd, data_path = tempfile.mkstemp(suffix=".bcp")
         try:
             with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
-                for record in records:
-                    row = []
-                    for key in all_col_keys:
-                        v = record.get(key) if key in col_keys else extra_defaults[key]
-                        row.append(self._format_bcp_value(v))
-                    f.write("\t".join(row) + "\n")
+                for values in rows:
+                    f.write("\t".join([self._format_bcp_value(v) for v in values]) + "\n")
 
             cmd = [
                 bcp_path, full_name, "in", data_path,
@@ -229,6 +314,7 @@ class MSSQLDialect(DatabaseDialect):
                     f"BCP failed (exit {result.returncode}):\n"
                     f"{result.stdout}\n{result.stderr}"
                 )
+            return os.path.getsize(data_path)
         finally:
             if os.path.exists(data_path):
                 os.unlink(data_path)
@@ -33,12 +33,21 @@ class MySQLDialect(DatabaseDialect):
 
     # further reducing the max length because SQL Alchemy adds suffixes to foreign key names
     MAX_IDENTIFIER_LENGTH: int = 56
+    # MySQL drivers drop the time zone offset of datetime parameters
+    DATETIME_PARAMS_AS_TEXT: bool = True
+    CONCURRENT_STAGING: bool = True
 
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
         # Tri-state cache: None = not yet tested, True = works, False = unavailable.
         self._local_infile_ok: bool | None = None
 
+    def truncate_tables(self, conn: Any, tables: list) -> None:
+        """Empty tables with ``TRUNCATE TABLE`` statements."""
+        preparer = conn.dialect.identifier_preparer
+        for table in tables:
+            conn.execute(text(f"TRUNCATE TABLE {preparer.format_table(table)}"))
+
     def create_engine(self, connection_string: str, **kwargs: Any) -> Any:
         """Create a MySQL engine with ``local_infile=True`` in connect_args."""
         connect_args = kwargs.pop("connect_args", {})
@@ -91,7 +100,7 @@ class MySQLDialect(DatabaseDialect):
         *,
         bulk_load: bool | None = None,
         bulk_load_threshold: int | None = None,
-    ) -> None:
+    ) -> int | None:
         """Bulk-insert records via MySQL's ``LOAD DATA LOCAL INFILE``.
 
         Builds a tab-separated temp file and streams it to the server using
@@ -110,16 +119,21 @@ class MySQLDialect(DatabaseDialect):
         Args:
             conn: A SQLAlchemy ``Connection`` already within a transaction.
             table: The SQLAlchemy ``Table`` object to insert into.
-            records: A list of dicts mapping column keys to Python values.
+            records: A list of dicts mapping column keys to Python values, or a
+                :class:`~xml2db.columnar.ColumnarRecords` object.
             bulk_load: ``True`` to require LOAD DATA LOCAL INFILE (raise if
                 unavailable), ``False`` to always use executemany, or ``None``
                 (default) to use LOAD DATA when available and fall back silently.
             bulk_load_threshold: Override the minimum batch size to trigger
                 LOAD DATA LOCAL INFILE.  Defaults to
                 :data:`_LOAD_DATA_THRESHOLD` (100).
+
+        Returns:
+            The size in bytes of the LOAD DATA file, or ``None`` if records were
+            inserted with executemany.
         """
         if not records:
-            return
+            return None
 
         threshold = bulk_load_threshold if bulk_load_threshold is not None else _LOAD_DATA_THRESHOLD
         driver = conn.dialect.driver
@@ -131,13 +145,11 @@ class MySQLDialect(DatabaseDialect):
                     f"bulk_load=True requires the pymysql or mysqldb driver, got '{driver}'. "
                     f"Use a mysql+pymysql:// or mysql+mysqldb:// connection string."
                 )
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
 
         # bulk_load=False or batch too small → use executemany.
         if bulk_load is False or len(records) < threshold:
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
 
         # Cached failure: LOAD DATA LOCAL INFILE is known to be unavailable.
         if self._local_infile_ok is False:
@@ -148,31 +160,19 @@ class MySQLDialect(DatabaseDialect):
                     "engine is created via DataModel (which sets local_infile=True automatically) "
                     "or with connect_args={'local_infile': True}."
                 )
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
 
         col_by_key = {col.key: col for col in table.columns}
-        col_keys = [k for k in records[0] if k in col_by_key]
-
-        # Python-side scalar defaults absent from records (same as other dialects).
-        extra_defaults: dict = {}
-        for col in table.columns:
-            if col.key not in records[0] and col.key in col_by_key:
-                d = col.default
-                if d is not None and d.is_scalar:
-                    extra_defaults[col.key] = d.arg
-
-        all_col_keys = col_keys + list(extra_defaults.keys())
+        all_col_keys, rows = self.bulk_rows(table, records)
+        cols = [col_by_key[k] for k in all_col_keys]
 
         fd, tsv_path = tempfile.mkstemp(suffix=".tsv")
         _fallback = False
+        nbytes = None
         try:
             with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
-                for record in records:
-                    row = []
-                    for k in all_col_keys:
-                        v = record.get(k) if k in col_keys else extra_defaults[k]
-                        row.append(self._format_value(v, col_by_key[k]))
+                for values in rows:
+                    row = [self._format_value(v, col) for v, col in zip(values, cols)]
                     f.write("\t".join(row) + "\n")
 
             full_name = (
@@ -209,6 +209,7 @@ class MySQLDialect(DatabaseDialect):
             try:
                 conn.execute(text(sql))
                 self._local_infile_ok = True
+                nbytes = os.path.getsize(tsv_path)
             except OperationalError as exc:
                 orig = getattr(exc, "orig", None)
                 code = orig.args[0] if orig and orig.args else None
@@ -230,4 +231,5 @@ class MySQLDialect(DatabaseDialect):
                 os.unlink(tsv_path)
 
         if _fallback:
-            super().bulk_insert(conn, table, records)
+            return super().bulk_insert(conn, table, records)
+        return nbytes
@@ -1,13 +1,181 @@
 import csv
 import io
-from typing import Any
+import logging
+import struct
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Union
 
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Double,
+    Float,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    text,
+)
+
+from ..columnar import iter_record_rows
 from .base import DatabaseDialect
 
+logger = logging.getLogger(__name__)
+
 # PostgreSQL COPY is in-protocol (no temp file), so the default threshold is 0
 # (COPY is always used for supported drivers regardless of batch size).
 _COPY_THRESHOLD = 0
 
+# Number of rows encoded at once when streaming COPY data to the server; memory
+# usage of the COPY path is bounded by the size of a chunk, not of the batch.
+_COPY_CHUNK_ROWS = 5000
+
+
+def _format_csv_value(v: Any) -> str:
+    """Format a Python value as a PostgreSQL COPY CSV field."""
+    if v is None:
+        return ""
+    if isinstance(v, bytes):
+        # PostgreSQL bytea hex format: \xDEADBEEF
+        return "\\x" + v.hex()
+    if isinstance(v, bool):
+        # bool must precede the general str() path: bool subclasses int,
+        # so str(True) → '1' which PostgreSQL COPY rejects for boolean.
+        return "true" if v else "false"
+    # str() on datetime → "YYYY-MM-DD HH:MM:SS[.f][±HH:MM]",
+    # which PostgreSQL's text input parser accepts.
+    return str(v)
+
+
+def _iter_csv_chunks(
+    col_keys: list, rows: Iterable[tuple], chunk_rows: int = _COPY_CHUNK_ROWS
+) -> Iterator[str]:
+    """Encode rows as CSV text (with a header line), by chunks of ``chunk_rows`` rows."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(col_keys)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if chunk:
+            writer.writerows([[_format_csv_value(v) for v in row] for row in chunk])
+        if buf.tell() > 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if len(chunk) < chunk_rows:
+            return
+
+
+# PostgreSQL binary COPY format: file header (signature, flags, header extension
+# length), a field count and (length, value) pairs for each row, and a trailer.
+_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_BINARY_TRAILER = struct.pack(">h", -1)
+_BINARY_NULL = struct.pack(">i", -1)
+_FIELD_COUNT = struct.Struct(">h")
+_LENGTH = struct.Struct(">i")
+_INT2 = struct.Struct(">ih")
+_INT4 = struct.Struct(">ii")
+_INT8 = struct.Struct(">iq")
+_FLOAT8 = struct.Struct(">id")
+_BOOL_TRUE = struct.pack(">ib", 1, 1)
+_BOOL_FALSE = struct.pack(">ib", 1, 0)
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_PG_EPOCH_NAIVE = datetime(2000, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _encode_text(v: Any) -> bytes:
+    b = str(v).encode("utf-8")
+    return _LENGTH.pack(len(b)) + b
+
+
+def _encode_bytes(v: Any) -> bytes:
+    return _LENGTH.pack(len(v)) + bytes(v)
+
+
+def _binary_encoder(sa_type: Any) -> Union[Callable[[Any], bytes], None]:
+    """Get a function encoding a non-null value as a binary COPY field (length and value) for a column type.
+
+    Returns ``None`` for types without a binary encoder, for which CSV has to be used.
+    """
+    if isinstance(sa_type, Boolean):
+        return lambda v: _BOOL_TRUE if v in (True, "true", "1") else _BOOL_FALSE
+    if isinstance(sa_type, SmallInteger):
+        return lambda v: _INT2.pack(2, int(v))
+    if isinstance(sa_type, BigInteger):
+        return lambda v: _INT8.pack(8, int(v))
+    if isinstance(sa_type, Integer):
+        return lambda v: _INT4.pack(4, int(v))
+    # Float without precision and Double are both DOUBLE PRECISION (float8)
+    if isinstance(sa_type, (Double, Float)) and getattr(sa_type, "precision", None) is None:
+        return lambda v: _FLOAT8.pack(8, float(v))
+    if isinstance(sa_type, DateTime):
+        if sa_type.timezone:
+            return lambda v: _INT8.pack(8, (v - _PG_EPOCH) // _MICROSECOND)
+        return lambda v: _INT8.pack(8, (v - _PG_EPOCH_NAIVE) // _MICROSECOND)
+    if isinstance(sa_type, String):
+        return _encode_text
+    if isinstance(sa_type, LargeBinary):
+        return _encode_bytes
+    return None
+
+
+def _iter_binary_chunks(
+    encoders: list, rows: Iterable[tuple], chunk_rows: int = _COPY_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """Encode rows in PostgreSQL binary COPY format, by chunks of ``chunk_rows`` rows."""
+    field_count = _FIELD_COUNT.pack(len(encoders))
+    yield _BINARY_HEADER
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_rows))
+        if chunk:
+            yield b"".join(
+                [
+                    field_count
+                    + b"".join(
+                        [
+                            _BINARY_NULL if v is None else encode(v)
+                            for encode, v in zip(encoders, row)
+                        ]
+                    )
+                    for row in chunk
+                ]
+            )
+        if len(chunk) < chunk_rows:
+            break
+    yield _BINARY_TRAILER
+
+
+class _ChunksReader:
+    """A minimal read-only file object over an iterator of strings (or bytes).
+
+    ``psycopg2``'s ``copy_expert`` pulls COPY data from a file object with
+    ``read(size)`` calls, which lets rows be encoded while the server ingests
+    previous ones.
+    """
+
+    def __init__(self, chunks: Iterable[Union[str, bytes]], binary: bool = False):
+        self._chunks = iter(chunks)
+        self._empty = b"" if binary else ""
+        self._chunk = self._empty
+        self._pos = 0
+
+    def read(self, size: int = -1) -> Union[str, bytes]:
+        if size is None or size < 0:
+            res = self._chunk[self._pos :] + self._empty.join(self._chunks)
+            self._chunk, self._pos = self._empty, 0
+            return res
+        if self._pos >= len(self._chunk):
+            self._chunk = next(self._chunks, self._empty)
+            self._pos = 0
+        res = self._chunk[self._pos : self._pos + size]
+        self._pos += len(res)
+        return res
+
 
 class PostgreSQLDialect(DatabaseDialect):
     """Dialect for PostgreSQL.
@@ -16,9 +184,38 @@ class PostgreSQLDialect(DatabaseDialect):
     this limit are truncated with a hash suffix by the base
     :meth:`~DatabaseDialect.db_identifier` implementation, which uses
     :attr:`MAX_IDENTIFIER_LENGTH` to decide when to truncate.
+
+    Args:
+        copy_format: ``"csv"`` (default) or ``"binary"``. With ``"binary"``,
+            :meth:`bulk_insert` packs values natively using ``COPY ... WITH
+            (FORMAT BINARY)`` instead of formatting them as text which the
+            server parses back, whenever all columns of the table have a
+            binary encoder (see :meth:`binary_encoders`). It can be set with
+            ``DataModel(dialect_options={"copy_format": "binary"})``.
     """
 
     MAX_IDENTIFIER_LENGTH: int = 63
+    CONCURRENT_STAGING: bool = True
+    INSERT_RETURNING_CTE: bool = True
+
+    def __init__(self, copy_format: str = "csv", **kwargs: Any):
+        super().__init__(**kwargs)
+        if copy_format not in ("csv", "binary"):
+            raise ValueError(
+                f"Invalid copy_format '{copy_format}': expected 'csv' or 'binary'"
+            )
+        self.copy_format = copy_format
+
+    def truncate_tables(self, conn: Any, tables: list) -> None:
+        """Empty all tables with a single ``TRUNCATE`` statement."""
+        if tables:
+            preparer = conn.dialect.identifier_preparer
+            conn.execute(
+                text(
+                    "TRUNCATE "
+                    + ", ".join(preparer.format_table(table) for table in tables)
+                )
+            )
 
     def bulk_insert(
         self,
@@ -28,11 +225,15 @@ class PostgreSQLDialect(DatabaseDialect):
         *,
         bulk_load: bool | None = None,
         bulk_load_threshold: int | None = None,
-    ) -> None:
+    ) -> int | None:
         """Bulk-insert records via PostgreSQL's ``COPY FROM STDIN``.
 
-        Builds an in-memory CSV payload and streams it to the server using
-        the driver's native COPY protocol.  Supported drivers:
+        Encodes records as CSV by chunks of :data:`_COPY_CHUNK_ROWS` rows and
+        streams them to the server as they are produced, using the driver's
+        native COPY protocol, so memory usage does not depend on the batch
+        size.  With ``copy_format="binary"``, records are encoded in
+        PostgreSQL binary COPY format instead, when the table columns allow it
+        (see :meth:`binary_encoders`).  Supported drivers:
 
         - **psycopg2**: uses ``cursor.copy_expert()``.
         - **psycopg** (psycopg3): uses ``cursor.copy()``.
@@ -43,16 +244,21 @@ class PostgreSQLDialect(DatabaseDialect):
         Args:
             conn: A SQLAlchemy ``Connection`` already within a transaction.
             table: The SQLAlchemy ``Table`` object to insert into.
-            records: A list of dicts mapping column keys to Python values.
+            records: A list of dicts mapping column keys to Python values, or a
+                :class:`~xml2db.columnar.ColumnarRecords` object.
             bulk_load: ``True`` to require COPY (raise if driver unsupported),
                 ``False`` to always use executemany, or ``None`` (default) to
                 use COPY when available and fall back silently.
             bulk_load_threshold: Minimum number of records to trigger COPY.
                 Defaults to :data:`_COPY_THRESHOLD` (0, meaning COPY is always
                 used for supported drivers).
+
+        Returns:
+            The size in bytes of the COPY stream, or ``None`` if records were
+            inserted with executemany.
         """
         if not records:
-            return
+            return None
 
         threshold = bulk_load_threshold if bulk_load_threshold is not None else _COPY_THRESHOLD
         driver = conn.dialect.driver
@@ -63,49 +269,13 @@ class PostgreSQLDialect(DatabaseDialect):
                     f"bulk_load=True requires the psycopg2 or psycopg driver, got '{driver}'. "
                     f"Use a postgresql+psycopg2:// or postgresql+psycopg:// connection string."
                 )
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
 
         if bulk_load is False or len(records) < threshold:
-            super().bulk_insert(conn, table, records)
-            return
+            return super().bulk_insert(conn, table, records)
 
         col_by_key = {col.key: col for col in table.columns}
-        col_keys = [k for k in records[0] if k in col_by_key]
-
-        # Python-side scalar defaults absent from records (e.g. default=False).
-        # executemany applies these automatically; our COPY path must do it manually.
-        extra_defaults: dict = {}
-        for col in table.columns:
-            if col.key not in records[0] and col.key in col_by_key:
-                d = col.default
-                if d is not None and d.is_scalar:
-                    extra_defaults[col.key] = d.arg
-
-        all_col_keys = col_keys + list(extra_defaults.keys())
-
-        buf = io.StringIO()
-        writer = csv.writer(buf)
-        writer.writerow(all_col_keys)
-        for record in records:
-            row = []
-            for key in all_col_keys:
-                v = record.get(key) if key in col_keys else extra_defaults[key]
-                if v is None:
-                    row.append("")
-                elif isinstance(v, bytes):
-                    # PostgreSQL bytea hex format: \xDEADBEEF
-                    row.append("\\x" + v.hex())
-                elif isinstance(v, bool):
-                    # bool must precede the general str() path: bool subclasses int,
-                    # so str(True) → '1' which PostgreSQL COPY rejects for boolean.
-                    row.append("true" if v else "false")
-                else:
-                    # str() on datetime → "YYYY-MM-DD HH:MM:SS[.f][±HH:MM]",
-                    # which PostgreSQL's text input parser accepts.
-                    row.append(str(v))
-            writer.writerow(row)
-        buf.seek(0)
+        all_col_keys, rows = self.bulk_rows(table, records)
 
         col_names = ", ".join(f'"{col_by_key[k].name}"' for k in all_col_keys)
         full_name = (
@@ -113,16 +283,84 @@ class PostgreSQLDialect(DatabaseDialect):
             if table.schema
             else f'"{table.name}"'
         )
-        copy_sql = (
-            f"COPY {full_name} ({col_names}) FROM STDIN "
-            f"WITH (FORMAT CSV, HEADER, NULL '')"
-        )
+        encoders = None
+        if self.copy_format == "binary":
+            encoders = self.binary_encoders(table, all_col_keys, records)
+            if encoders is None:
+                logger.debug(
+                    f"Binary COPY is not supported for table {table.name}, using CSV"
+                )
+        if encoders is not None:
+            copy_sql = f"COPY {full_name} ({col_names}) FROM STDIN WITH (FORMAT BINARY)"
+            chunks = _iter_binary_chunks(encoders, rows)
+        else:
+            copy_sql = (
+                f"COPY {full_name} ({col_names}) FROM STDIN "
+                f"WITH (FORMAT CSV, HEADER, NULL '')"
+            )
+            # rows are encoded by chunks while they are sent to the server
+            chunks = (
+                chunk.encode("utf-8")
+                for chunk in _iter_csv_chunks(all_col_keys, rows)
+            )
+
+        nbytes = 0
+
+        def count_bytes(chunks):
+            nonlocal nbytes
+            for chunk in chunks:
+                nbytes += len(chunk)
+                yield chunk
 
         raw_conn = conn.connection.dbapi_connection
         if driver == "psycopg2":
             cur = raw_conn.cursor()
-            cur.copy_expert(copy_sql, buf)
+            cur.copy_expert(
+                copy_sql, _ChunksReader(count_bytes(chunks), binary=True), size=65536
+            )
         else:  # psycopg3
             cur = raw_conn.cursor()
             with cur.copy(copy_sql) as copy:
-                copy.write(buf.read().encode("utf-8"))
+                for chunk in count_bytes(chunks):
+                    copy.write(chunk)
+        return nbytes
+
+    @staticmethod
+    def binary_encoders(
+        table: Any, col_keys: list, records: Any
+    ) -> Union[list, None]:
+        """Get binary COPY encoders for the given columns of a table, if binary COPY can be used.
+
+        Binary COPY requires values to be packed exactly as the server type expects them, so it is only used if all
+        columns have a binary encoder (integers, double precision floats, booleans, strings, binary and timestamps),
+        and if values of timestamp columns are all ``datetime`` objects (see the ``parse_datetimes`` model option),
+        time zone aware for ``timestamptz`` columns.
+
+        Args:
+            table: The SQLAlchemy ``Table`` object to insert into.
+            col_keys: The keys of the columns to load.
+            records: The records to load.
+
+        Returns:
+            A list of encoders (one per column), or ``None`` if CSV has to be used.
+        """
+        col_by_key = {col.key: col for col in table.columns}
+        encoders, dt_cols = [], {}
+        for key in col_keys:
+            col_type = col_by_key[key].type
+            encoder = _binary_encoder(col_type)
+            if encoder is None:
+                return None
+            encoders.append(encoder)
+            if isinstance(col_type, DateTime):
+                dt_cols[key] = bool(col_type.timezone)
+        if dt_cols:
+            dt_keys = [k for k in dt_cols if k in col_keys]
+            tz_aware = [dt_cols[k] for k in dt_keys]
+            for row in iter_record_rows(records, dt_keys):
+                for v, aware in zip(row, tz_aware):
+                    if v is not None and (
+                        not isinstance(v, datetime) or (v.tzinfo is not None) != aware
+                    ):
+                        return None
+        return encoders
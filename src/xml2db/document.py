@@ -1,23 +1,99 @@
 import csv
 import datetime
 import logging
+import os
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from io import BytesIO
-from typing import Union, TYPE_CHECKING
+from typing import Callable, Union, TYPE_CHECKING
 from zoneinfo import ZoneInfo
-from sqlalchemy import Column, Table, func, text, select
-from sqlalchemy.engine import Connection
-from sqlalchemy.sql.expression import TextClause
+from graphlib import TopologicalSorter
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    func,
+    text,
+    select,
+    union,
+)
 from lxml import etree
 
 if TYPE_CHECKING:
     from .model import DataModel
 
+from .arrow import import_pyarrow, records_to_arrow
+from .columnar import ColumnarRecords
 from .xml_converter import XMLConverter
 
 logger = logging.getLogger(__name__)
 
+# number of rows fetched at once from the database when extracting data
+_EXTRACT_BATCH_ROWS = 10000
+
+
+@dataclass
+class StatementStats:
+    """Statistics of a single merge statement, in :attr:`LoadStats.statements`.
+
+    Attributes:
+        table: The name of the target table which the statement belongs to.
+        label: A short description of the statement (e.g. ``"match existing records"``, ``"insert new records"``,
+            ``"backfill primary keys"``).
+        duration: Seconds spent executing the statement.
+        rowcount: The number of rows affected, as reported by the backend (-1 if not available).
+    """
+
+    table: str
+    label: str
+    duration: float
+    rowcount: int
+
+
+@dataclass
+class TableStats:
+    """Per-table statistics, in :attr:`LoadStats.tables`.
+
+    Attributes:
+        records: Records of the document inserted into the temporary table.
+        bytes_staged: Size in bytes of the data sent by bulk loading methods (CSV, COPY or Arrow data), 0 if records
+            were inserted with executemany.
+        duration_stage: Seconds spent inserting records into the temporary table.
+        duration_merge: Seconds spent executing merge statements of this table.
+        inserted: Rows written to the target table, or ``None`` if not reported by the backend. For n-n
+            relationships tables, merge statements are accounted to the parent table.
+    """
+
+    records: int = 0
+    bytes_staged: int = 0
+    duration_stage: float = 0.0
+    duration_merge: float = 0.0
+    inserted: Union[int, None] = None
+
+
+@dataclass
+class ParseStats:
+    """Timings of XML parsing and flat data conversion, in :attr:`LoadStats.parse`.
+
+    Attributes:
+        duration_validate: Seconds spent validating the XML file against the schema (0 if skipped).
+        duration_parse: Seconds spent parsing XML into a document tree, excluding validation (and hashing, if it is
+            timed).
+        duration_hash: Seconds spent computing node hashes and deduplicating nodes. Hashing is interleaved with
+            parsing and timing it for each node has a cost, so it is only timed if the model config has a
+            `load_stats_hook`; otherwise this is `None`.
+        duration_flatten: Seconds spent converting the document tree into flat data records.
+    """
+
+    duration_validate: float
+    duration_parse: float
+    duration_hash: Union[float, None]
+    duration_flatten: float
+
 
 @dataclass
 class MergeStats:
@@ -34,12 +110,16 @@ class MergeStats:
         row_counts_available: ``False`` when the backend does not report rowcount for
             ``INSERT … FROM SELECT`` (e.g. DuckDB); ``inserted`` and ``existing`` are
             then meaningless.
+        tables: :class:`TableStats` objects (with merge duration and inserted rows only) keyed by table name.
+        statements: :class:`StatementStats` objects for each merge statement, in execution order.
     """
 
     inserted: int
     existing: int
     duration: float
     row_counts_available: bool = True
+    tables: dict = field(default_factory=dict)
+    statements: list = field(default_factory=list)
 
 
 @dataclass
@@ -55,10 +135,14 @@ class LoadStats:
             0 when ``row_counts_available`` is ``False``.
         duration_temp_insert: Seconds spent inserting data into temporary staging tables.
         duration_merge: Seconds spent merging temporary tables into target tables.
-        duration_cleanup: Seconds spent dropping temporary tables.
+        duration_cleanup: Seconds spent dropping (or emptying) temporary tables.
         row_counts_available: ``False`` when the backend does not report rowcount for
             ``INSERT … FROM SELECT`` (e.g. DuckDB); ``inserted`` and ``existing`` are
             then meaningless.
+        tables: :class:`TableStats` objects keyed by table name (including n-n relationships tables), with
+            staging and merge details.
+        statements: :class:`StatementStats` objects for each merge statement, in execution order.
+        parse: A :class:`ParseStats` object with parsing timings, if the document was parsed from XML.
     """
 
     inserted: int
@@ -67,6 +151,9 @@ class LoadStats:
     duration_merge: float
     duration_cleanup: float
     row_counts_available: bool = True
+    tables: dict = field(default_factory=dict)
+    statements: list = field(default_factory=list)
+    parse: Union[ParseStats, None] = None
 
 
 class Document:
@@ -78,12 +165,19 @@ class Document:
 
     Args:
         model: A `DataModel` object for this document
+        columnar: Store flat data records by columns, using
+            [`ColumnarRecords`][xml2db.columnar.ColumnarRecords] objects instead of lists of dicts, which uses much
+            less memory for large documents and is read directly by bulk loaders
     """
 
-    def __init__(self, model: "DataModel"):
+    def __init__(self, model: "DataModel", columnar: bool = False):
         self.model = model
+        self.columnar = columnar
         self.data = {}
         self.xml_file_path = None
+        self.parse_stats = None
+        self._staging_stats = {}
+        self._record_keys = {}
 
     def parse_xml(
         self,
@@ -121,6 +215,7 @@ class Document:
             skip_validation=skip_validation,
             recover=recover,
             iterparse=iterparse,
+            time_hashing=self.model.model_config["load_stats_hook"] is not None,
         )
 
         if self.model.model_config["document_tree_hook"] is not None:
@@ -128,14 +223,26 @@ class Document:
             document_tree = self.model.model_config["document_tree_hook"](document_tree)
 
         logger.info(f"Adding records to data model for {self.xml_file_path}")
+        t0 = time.perf_counter()
         self.data = self.doc_tree_to_flat_data(
             document_tree,
             metadata=metadata,
             flat_data=flat_data,
         )
+        self.parse_stats = self._get_parse_stats(time.perf_counter() - t0)
 
         logger.debug(self.__repr__())
 
+    def _get_parse_stats(self, duration_flatten: float) -> ParseStats:
+        """Build parse statistics from the timings of the last XML conversion and a flattening duration"""
+        converter = self.model.xml_converter
+        return ParseStats(
+            duration_validate=converter.duration_validate,
+            duration_parse=converter.duration_parse,
+            duration_hash=converter.duration_hash,
+            duration_flatten=duration_flatten,
+        )
+
     def to_xml(
         self, out_file: str = None, nsmap: dict = None, indent: str = "  "
     ) -> etree.Element:
@@ -153,6 +260,94 @@ class Document:
         converter.document_tree = self.flat_data_to_doc_tree()
         return converter.to_xml(out_file=out_file, nsmap=nsmap, indent=indent)
 
+    def write_xml(self, out_file: str, nsmap: dict = None, indent: str = "  ") -> None:
+        """Write data to an XML file incrementally, without building the whole XML tree in memory (see
+        [`XMLConverter.write_xml`][xml2db.xml_converter.XMLConverter.write_xml])
+
+        The document tree is not built upfront either: flat data is walked while writing, and each n-n child node is
+        built from its record only when it is written, then released. Besides the flat data itself (and indexes of its
+        records by primary key), only the nodes being written are held in memory.
+
+        Args:
+            out_file: The path of the file to write.
+            nsmap: An optional namespace mapping.
+            indent: A string used as indent in XML output.
+        """
+        build_node, root_pk = self._doc_tree_builder()
+        converter = XMLConverter(self.model)
+        converter.document_tree = build_node(self.model.root_table, root_pk, True)
+        converter.write_xml(out_file, nsmap=nsmap, indent=indent)
+
+    def to_arrow(self) -> dict:
+        """Convert flat data to Apache Arrow tables, one for each table (including n-n relationships tables).
+
+        Arrow tables have the same columns as temporary tables (including temporary primary and foreign keys), with
+        Arrow types mapped from the data model column types. `dateTime` columns are exported as UTC timestamps if the
+        `parse_datetimes` model option is enabled, else as strings. For data extracted from the database, Arrow tables
+        have the same columns as target tables. This requires the optional `pyarrow` package.
+
+        Returns:
+            A dict of `pyarrow.Table` keyed by table name
+        """
+        pa = import_pyarrow()
+        # data extracted from the database uses target tables columns
+        root_records = self.data.get(self.model.root_table, {}).get("records", [])
+        from_db = (
+            len(root_records) > 0
+            and f"pk_{self.model.tables[self.model.root_table].name}"
+            in root_records[0]
+        )
+        res = {}
+        for tb in self.model.fk_ordered_tables:
+            data = self.data.get(tb.type_name)
+            if data is None:
+                continue
+            types = {}
+            if not from_db:
+                types = {
+                    key: (
+                        pa.timestamp("us", tz="UTC")
+                        if self.model.model_config["parse_datetimes"]
+                        else pa.string()
+                    )
+                    for key, col in tb.columns.items()
+                    if col.data_type == "dateTime" and col.occurs[1] == 1
+                }
+            res[tb.name] = records_to_arrow(
+                data["records"], tb.table if from_db else tb.temp_table, types
+            )
+            for rel in tb.relations_n.values():
+                if rel.rel_table_name in data.get("relations_n", {}):
+                    res[rel.rel_table_name] = records_to_arrow(
+                        data["relations_n"][rel.rel_table_name]["records"],
+                        rel.rel_table if from_db else rel.temp_rel_table,
+                    )
+        return res
+
+    def to_parquet(self, directory: str, **kwargs) -> dict:
+        """Write flat data to Parquet files, one for each table (including n-n relationships tables).
+
+        Files are named after tables and hold the same data as [`to_arrow`][xml2db.document.Document.to_arrow].
+        They can be loaded in bulk later on, without parsing XML files again (e.g. with DuckDB `read_parquet`).
+        This requires the optional `pyarrow` package.
+
+        Args:
+            directory: The directory to write files into (created if it does not exist)
+            **kwargs: Extra keyword arguments passed to `pyarrow.parquet.write_table` (e.g. `compression`)
+
+        Returns:
+            A dict of file paths keyed by table name
+        """
+        import_pyarrow()
+        import pyarrow.parquet as pq
+
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for name, arrow_table in self.to_arrow().items():
+            paths[name] = os.path.join(directory, f"{name}.parquet")
+            pq.write_table(arrow_table, paths[name], **kwargs)
+        return paths
+
     def doc_tree_to_flat_data(
         self, document_tree: tuple, metadata: dict = None, flat_data: dict = None
     ) -> dict:
@@ -168,169 +363,301 @@ class Document:
             A dict containing flat tables
         """
 
-        def _extract_node(
-            node: tuple, pk_parent_node: int, row_number: int, data_model: dict
-        ) -> int:
-            """Extract nodes recursively
-
-            Args:
-                node: A tuple (node_type, content, hash) containing a node of the document tree
-                pk_parent_node: The primary key of its parent node
-                row_number: The row number of the record
-                data_model: The dict to write output to
+        flat_tables = flat_data if flat_data else {}
+        self._extract_node(document_tree, 0, 0, flat_tables, metadata)
 
-            Returns:
-                The primary key given to this node
-            """
+        return flat_tables
 
-            node_type, content, node_hash = node
-
-            # get the corresponding table model
-            model_table = self.model.tables[node[0]]
-
-            # initialize data structure
-            if node_type not in data_model:
-                data_model[node_type] = {"next_pk": 1, "records": []}
-                if model_table.is_reused:
-                    data_model[node_type]["hashmap"] = {}
-                if any(
-                    [
-                        rel.other_table.is_reused
-                        for rel in model_table.relations_n.values()
-                    ]
-                ):
-                    data_model[node_type]["relations_n"] = {
-                        rel.rel_table_name: {"next_pk": 1, "records": []}
-                        for rel in model_table.relations_n.values()
-                        if rel.other_table.is_reused
-                    }
-            data = data_model[node_type]
-
-            # if node is reused and a record with identical hash is already inserted, return its pk
-            if model_table.is_reused:
-                if node_hash in data["hashmap"]:
-                    return data["hashmap"][node_hash]
+    def _extract_node(
+        self,
+        node: tuple,
+        pk_parent_node: int,
+        row_number: int,
+        data_model: dict,
+        metadata: dict = None,
+        reserved_pks: dict = None,
+    ) -> int:
+        """Extract nodes recursively
 
-            record = {}
+        Args:
+            node: A tuple (node_type, content, hash) containing a node of the document tree
+            pk_parent_node: The primary key of its parent node
+            row_number: The row number of the record
+            data_model: The dict to write output to
+            metadata: A dict of metadata values to add to the root table
+            reserved_pks: A dict of primary keys reserved beforehand, keyed by the id of the node content dict (used
+                in streaming mode, where children of a node are flattened before the node itself)
 
-            # add pk
-            record_pk = data["next_pk"]
-            record[f"temp_pk_{model_table.name}"] = record_pk
-            data["next_pk"] += 1
+        Returns:
+            The primary key given to this node
+        """
 
-            # add parent pk if node is not reused
-            if not model_table.is_reused:
-                record[f"temp_fk_parent_{model_table.parent.name}"] = pk_parent_node
-                if self.model.model_config["row_numbers"]:
-                    record["xml2db_row_number"] = row_number
+        node_type, content, node_hash = node
+
+        # get the corresponding table model
+        model_table = self.model.tables[node[0]]
+
+        # initialize data structure
+        data = self._init_table_data(node_type, data_model)
+
+        # if node is reused and a record with identical hash is already inserted, return its pk
+        hash_cache = None
+        known_pk = None
+        if model_table.is_reused:
+            if node_hash in data["hashmap"]:
+                return data["hashmap"][node_hash]
+            # if it is known to exist in the target table, its content and children are not extracted
+            hash_cache = self.model.hash_cache
+            # in streaming mode, the root node is always extracted, as streamed nodes may reference its descendants
+            if hash_cache is not None and not (
+                reserved_pks is not None and pk_parent_node == 0
+            ):
+                known_pk = hash_cache.get(model_table.name, node_hash)
 
-            # build record from fields for columns and n-1 relations
-            for field_type, key, field in model_table.fields:
-                if field_type == "col":
-                    content_key = (
-                        (f"{key[:-5]}__attr" if field.has_suffix else f"{key}__attr")
-                        if field.is_attr
-                        else key
-                    )
-                    if content_key in content:
-                        val = content[content_key]
+        # record values are collected in the order of the table's record keys, and written at once
+        keys = self._record_keys.get(node_type)
+        if keys is None:
+            keys = self._record_keys[node_type] = self._get_record_keys(model_table)
 
-                        if len(val) == 1:
-                            record[key] = val[0]
+        # add pk
+        if reserved_pks and id(content) in reserved_pks:
+            record_pk = reserved_pks.pop(id(content))
+        else:
+            record_pk = data["next_pk"]
+            data["next_pk"] += 1
+        values = [record_pk]
+
+        # add parent pk if node is not reused
+        if not model_table.is_reused:
+            values.append(pk_parent_node)
+            if self.model.model_config["row_numbers"]:
+                values.append(row_number)
+
+        # build record from fields for columns and n-1 relations
+        parse_datetimes = self.model.model_config["parse_datetimes"]
+        for field_type, key, field in model_table.fields:
+            if field_type == "reln":
+                continue
+            if known_pk is not None:
+                values.append(None)
+            elif field_type == "col":
+                content_key = (
+                    (f"{key[:-5]}__attr" if field.has_suffix else f"{key}__attr")
+                    if field.is_attr
+                    else key
+                )
+                if content_key in content:
+                    val = content[content_key]
+
+                    if len(val) == 1:
+                        if (
+                            parse_datetimes
+                            and field.datetime_parser is not None
+                            and isinstance(val[0], str)
+                        ):
+                            values.append(field.datetime_parser(val[0]))
                         else:
-                            esc_val = [str(v).replace('"', '\\"') for v in val]
-                            esc_val = [
-                                (
-                                    f'"{v}"'
-                                    if "," in v or "\n" in v or "\r" in v or '"' in v
-                                    else v
-                                )
-                                for v in esc_val
-                            ]
-                            record[key] = ",".join(esc_val)
+                            values.append(val[0])
                     else:
-                        record[key] = None
+                        esc_val = [str(v).replace('"', '\\"') for v in val]
+                        esc_val = [
+                            (
+                                f'"{v}"'
+                                if "," in v or "\n" in v or "\r" in v or '"' in v
+                                else v
+                            )
+                            for v in esc_val
+                        ]
+                        values.append(",".join(esc_val))
+                else:
+                    values.append(None)
 
-                elif field_type == "rel1":
-                    rel = model_table.relations_1[key]
-                    if key in content:
-                        record[f"temp_{rel.field_name}"] = _extract_node(
+            elif field_type == "rel1":
+                if key in content:
+                    values.append(
+                        self._extract_node(
                             content[key][0],
                             record_pk,
                             0,
                             data_model,
+                            reserved_pks=reserved_pks,
                         )
-                    else:
-                        record[f"temp_{rel.field_name}"] = None
-
-            # write metadata if it is the root table
-            if pk_parent_node == 0 and isinstance(metadata, dict):
-                for meta_col in self.model.model_config.get("metadata_columns", []):
-                    if meta_col["name"] in metadata:
-                        record[meta_col["name"]] = metadata[meta_col["name"]]
-
-            record[self.model.model_config["record_hash_column_name"]] = node_hash
-
-            # add n-n relationship data for reused children nodes
-            for rel in model_table.relations_n.values():
-                if rel.name in content:
-                    if rel.other_table.is_reused:
-                        rel_data = data["relations_n"][rel.rel_table_name]
-                        i = 1
-                        for rel_child in content[rel.name]:
-                            rel_row = {
-                                f"temp_fk_{model_table.name}": record_pk,
-                                f"temp_fk_{rel.other_table.name}": _extract_node(
-                                    rel_child,
-                                    record_pk,
-                                    i,
-                                    data_model,
-                                ),
-                            }
-                            if self.model.model_config["row_numbers"]:
-                                rel_row["xml2db_row_number"] = i
-                            rel_data["records"].append(rel_row)
-                            i += 1
-                    else:
-                        i = 1
-                        for rel_child in content[rel.name]:
-                            _extract_node(rel_child, record_pk, i, data_model)
-                            i += 1
+                    )
+                else:
+                    values.append(None)
+
+        values.append(node_hash)
+        if hash_cache is not None:
+            values.append(known_pk)
+            values.append(known_pk is not None)
+
+        # write metadata if it is the root table
+        if pk_parent_node == 0 and isinstance(metadata, dict):
+            meta_keys = [
+                meta_col["name"]
+                for meta_col in self.model.model_config.get("metadata_columns", [])
+                if meta_col["name"] in metadata
+            ]
+            keys = keys + meta_keys
+            values.extend(metadata[meta_key] for meta_key in meta_keys)
+
+        # add n-n relationship data for children nodes (streamed children, with no content, were already extracted)
+        for rel in model_table.relations_n.values():
+            if known_pk is None and rel.name in content:
+                i = 1
+                for rel_child in content[rel.name]:
+                    if rel_child[1] is not None:
+                        self._extract_relation_n_child(
+                            model_table,
+                            rel,
+                            rel_child,
+                            record_pk,
+                            i,
+                            data_model,
+                            reserved_pks,
+                        )
+                    i += 1
 
-            data["records"].append(record)
+        if self.columnar:
+            data["records"].append_values(keys, values)
+        else:
+            data["records"].append(dict(zip(keys, values)))
 
-            if model_table.is_reused:
-                data["hashmap"][node_hash] = record_pk
+        if model_table.is_reused:
+            data["hashmap"][node_hash] = record_pk
 
-            return record_pk
+        return record_pk
 
-        flat_tables = flat_data if flat_data else {}
-        _extract_node(document_tree, 0, 0, flat_tables)
+    def _get_record_keys(self, model_table) -> list:
+        """Get the keys of records extracted from nodes of a table, in the order values are extracted
 
-        return flat_tables
+        Args:
+            model_table: The table model
+
+        Returns:
+            The list of record keys (metadata columns of the root table excepted)
+        """
+        keys = [f"temp_pk_{model_table.name}"]
+        if not model_table.is_reused:
+            keys.append(f"temp_fk_parent_{model_table.parent.name}")
+            if self.model.model_config["row_numbers"]:
+                keys.append("xml2db_row_number")
+        for field_type, key, field in model_table.fields:
+            if field_type == "col":
+                keys.append(key)
+            elif field_type == "rel1":
+                keys.append(f"temp_{field.field_name}")
+        keys.append(self.model.model_config["record_hash_column_name"])
+        if model_table.is_reused and self.model.hash_cache is not None:
+            keys.append(f"pk_{model_table.name}")
+            keys.append("temp_exists")
+        return keys
+
+    def _extract_relation_n_child(
+        self,
+        model_table,
+        rel,
+        node: tuple,
+        pk_parent_node: int,
+        row_number: int,
+        data_model: dict,
+        reserved_pks: dict = None,
+    ) -> None:
+        """Extract a child node of a n-n relationship, and the relationship record if the child table is reused
+
+        Args:
+            model_table: The parent table model
+            rel: The n-n relationship from the parent table to the child table
+            node: A tuple (node_type, content, hash) containing the child node
+            pk_parent_node: The primary key of the parent node
+            row_number: The row number of the child node among its siblings
+            data_model: The dict to write output to
+            reserved_pks: A dict of primary keys reserved beforehand, keyed by the id of the node content dict
+        """
+        if rel.other_table.is_reused:
+            rel_data = data_model[model_table.type_name]["relations_n"][
+                rel.rel_table_name
+            ]
+            rel_row = {
+                f"temp_fk_{model_table.name}": pk_parent_node,
+                f"temp_fk_{rel.other_table.name}": self._extract_node(
+                    node,
+                    pk_parent_node,
+                    row_number,
+                    data_model,
+                    reserved_pks=reserved_pks,
+                ),
+            }
+            if self.model.model_config["row_numbers"]:
+                rel_row["xml2db_row_number"] = row_number
+            rel_data["records"].append(rel_row)
+        else:
+            self._extract_node(
+                node, pk_parent_node, row_number, data_model, reserved_pks=reserved_pks
+            )
+
+    def _init_table_data(self, node_type: str, data_model: dict) -> dict:
+        """Initialize the flat data structure of a given table if needed
+
+        Args:
+            node_type: The node type
+            data_model: The dict to write output to
+
+        Returns:
+            The flat data dict of this table
+        """
+        if node_type not in data_model:
+            model_table = self.model.tables[node_type]
+            records_type = ColumnarRecords if self.columnar else list
+            data_model[node_type] = {"next_pk": 1, "records": records_type()}
+            if model_table.is_reused:
+                data_model[node_type]["hashmap"] = {}
+            if any(
+                [rel.other_table.is_reused for rel in model_table.relations_n.values()]
+            ):
+                data_model[node_type]["relations_n"] = {
+                    rel.rel_table_name: {"next_pk": 1, "records": records_type()}
+                    for rel in model_table.relations_n.values()
+                    if rel.other_table.is_reused
+                }
+        return data_model[node_type]
 
     def flat_data_to_doc_tree(self) -> tuple:
         """Convert the data stored in flat tables into a document tree
 
+        Records and children of n-n relationships are indexed by primary key once, and nodes are built iteratively
+        (without recursion), so that deep documents do not hit the Python recursion limit. Values are split back into
+        lists only for columns which can hold several values.
+
         Returns:
-            A tuple (node_type, content, hash) containing the document tree
+            A tuple (node_type, content) containing the document tree
         """
-        data_index = {}
+        build_node, root_pk = self._doc_tree_builder()
+        return build_node(self.model.root_table, root_pk)
+
+    def _doc_tree_builder(self) -> tuple:
+        """Index flat data to build document tree nodes from it
 
-        # convert data to keyed dict for easier access
+        Returns:
+            A tuple `(build_node, root_pk)`, with `root_pk` the primary key of the first root record and
+                `build_node(node_type, node_pk, lazy=False)` a function which builds the document tree of a record. If
+                `lazy` is True, n-n children are not built but given as functions returning their (lazy) document
+                tree, so that a document can be walked one n-n child at a time.
+        """
+        root_records = self.data[self.model.root_table]["records"]
         temp = (
             ""
             if f"pk_{self.model.tables[self.model.root_table].name}"
-            in self.data[self.model.root_table]["records"][0]
+            in root_records[0]
             else "temp_"
         )
+
+        # records by primary key, and children primary keys by parent primary key for n-n relationships
+        records_index = {}
+        children_index = {}
         for tb in self.model.tables.values():
-            data_index[tb.type_name] = {
-                "records": {},
-                "relations_n": {},
-            }
             if tb.type_name in self.data:
-                data_index[tb.type_name]["records"] = {
+                records_index[tb.type_name] = {
                     row[f"{temp}pk_{tb.name}"]: row
                     for row in self.data[tb.type_name]["records"]
                 }
@@ -338,40 +665,25 @@ class Document:
                 index = {}
                 if rel.other_table.is_reused:
                     if tb.type_name in self.data:
+                        parent_key = f"{temp}fk_{tb.name}"
+                        child_key = f"{temp}fk_{rel.other_table.name}"
                         for row in self.data[tb.type_name]["relations_n"][
                             rel.rel_table_name
                         ]["records"]:
-                            if row[f"{temp}fk_{tb.name}"] not in index:
-                                index[row[f"{temp}fk_{tb.name}"]] = []
-                            index[row[f"{temp}fk_{tb.name}"]].append(
-                                row[f"{temp}fk_{rel.other_table.name}"]
-                            )
-                else:
-                    if rel.other_table.type_name in self.data:
-                        for row in self.data[rel.other_table.type_name]["records"]:
-                            if row[f"{temp}fk_parent_{tb.name}"] not in index:
-                                index[row[f"{temp}fk_parent_{tb.name}"]] = []
-                            index[row[f"{temp}fk_parent_{tb.name}"]].append(
-                                row[f"{temp}pk_{rel.other_table.name}"]
-                            )
-                data_index[tb.type_name]["relations_n"][rel.rel_table_name] = index
-
-        def _build_node(node_type: str, node_pk: int) -> tuple:
-            """Build a dict node recursively
-
-            Args:
-                node_type: The node type
-                node_pk: The node primary key
-
-            Returns:
-                A node as a tuple (node_type, content, hash)
-            """
-            tb = self.model.tables[node_type]
-            content = {}
-
-            record = data_index[node_type]["records"][node_pk]
+                            index.setdefault(row[parent_key], []).append(row[child_key])
+                elif rel.other_table.type_name in self.data:
+                    parent_key = f"{temp}fk_parent_{tb.name}"
+                    child_key = f"{temp}pk_{rel.other_table.name}"
+                    for row in self.data[rel.other_table.type_name]["records"]:
+                        index.setdefault(row[parent_key], []).append(row[child_key])
+                children_index[(tb.type_name, rel.rel_table_name)] = index
+
+        # how to build the content of nodes of each type, from the fields of its table
+        node_fields = {}
+        for tb in self.model.tables.values():
+            fields = []
             for field_type, rel_name, rel in tb.fields:
-                if field_type == "col" and record[rel_name] is not None:
+                if field_type == "col":
                     content_key = (
                         (
                             f"{rel_name[:-5]}__attr"
@@ -381,45 +693,186 @@ class Document:
                         if rel.is_attr
                         else rel_name
                     )
-                    if isinstance(record[rel_name], datetime.datetime):
-                        content[content_key] = [
-                            record[rel_name].isoformat(timespec="milliseconds")
-                        ]
-                    else:
-                        content[content_key] = (
-                            list(csv.reader([str(record[rel_name])], escapechar="\\"))[
-                                0
-                            ]
-                            if "," in str(record[rel_name])
-                            else [record[rel_name]]
+                    fields.append((field_type, rel_name, content_key, rel.occurs[1] != 1))
+                elif field_type == "rel1":
+                    fields.append(
+                        (
+                            field_type,
+                            f"{temp}{rel.field_name}",
+                            rel_name,
+                            rel.other_table.type_name,
                         )
-                elif (
-                    field_type == "rel1"
-                    and record[f"{temp}{rel.field_name}"] is not None
-                ):
-                    content[rel_name] = [
-                        _build_node(
-                            rel.other_table.type_name, record[f"{temp}{rel.field_name}"]
+                    )
+                else:
+                    fields.append(
+                        (
+                            field_type,
+                            children_index[(tb.type_name, rel.rel_table_name)],
+                            rel_name,
+                            rel.other_table.type_name,
                         )
-                    ]
-                elif (
-                    field_type == "reln"
-                    and node_pk
-                    in data_index[tb.type_name]["relations_n"][rel.rel_table_name]
-                ):
-                    content[rel_name] = [
-                        _build_node(rel.other_table.type_name, pk)
-                        for pk in data_index[tb.type_name]["relations_n"][
-                            rel.rel_table_name
-                        ][node_pk]
-                    ]
-            return node_type, content
+                    )
+            node_fields[tb.type_name] = fields
+
+        def build_node(node_type: str, node_pk: int, lazy: bool = False) -> tuple:
+            """Build the document tree of a record"""
+            # nodes to build, as (list of nodes, position in the list, node type, node primary key)
+            root = [None]
+            to_build = [(root, 0, node_type, node_pk)]
+            while to_build:
+                nodes, position, node_type, node_pk = to_build.pop()
+                record = records_index[node_type][node_pk]
+                content = {}
+                for field_type, key, content_key, arg in node_fields[node_type]:
+                    if field_type == "col":
+                        value = record[key]
+                        if value is None:
+                            continue
+                        if isinstance(value, datetime.datetime):
+                            content[content_key] = [
+                                value.isoformat(timespec="milliseconds")
+                            ]
+                        elif arg and "," in str(value):
+                            # several values joined as CSV
+                            content[content_key] = next(
+                                csv.reader([str(value)], escapechar="\\")
+                            )
+                        else:
+                            content[content_key] = [value]
+                    elif field_type == "rel1":
+                        if record[key] is not None:
+                            children = content[content_key] = [None]
+                            to_build.append((children, 0, arg, record[key]))
+                    else:
+                        children_pks = key.get(node_pk)
+                        if children_pks is not None:
+                            children = content[content_key] = [None] * len(children_pks)
+                            for i, child_pk in enumerate(children_pks):
+                                if lazy:
+                                    children[i] = partial(build_node, arg, child_pk, True)
+                                else:
+                                    to_build.append((children, i, arg, child_pk))
+                nodes[position] = (node_type, content)
+            return root[0]
+
+        return build_node, int(
+            root_records[0][f"{temp}pk_{self.model.tables[self.model.root_table].name}"]
+        )
+
+    def split_by_root(self) -> list:
+        """Split flat data into one document for each record of the root table
 
-        return _build_node(
-            self.model.root_table,
-            int(list(data_index[self.model.root_table]["records"].keys())[0]),
+        This is used to process separately documents extracted from the database at once (see
+        [`DataModel.iter_documents_from_database`][xml2db.model.DataModel.iter_documents_from_database]). Each document
+        gets the records reachable from its root record, in the same order. Records of reused tables which are shared
+        by several root records are included in each of their documents.
+
+        Returns:
+            A list of `Document` objects, in the order of root records
+        """
+        root_records = self.data.get(self.model.root_table, {}).get("records", [])
+        if len(root_records) == 0:
+            return []
+        temp = (
+            ""
+            if f"pk_{self.model.tables[self.model.root_table].name}"
+            in root_records[0]
+            else "temp_"
         )
 
+        # index records by primary key, and children records by parent primary key, once for all documents
+        records_index = {}
+        children_index = {}
+        for tb in self.model.tables.values():
+            if tb.type_name not in self.data:
+                continue
+            records_index[tb.type_name] = {
+                row[f"{temp}pk_{tb.name}"]: row
+                for row in self.data[tb.type_name]["records"]
+            }
+            for rel in tb.relations_n.values():
+                index = {}
+                if rel.other_table.is_reused:
+                    for row in self.data[tb.type_name]["relations_n"][
+                        rel.rel_table_name
+                    ]["records"]:
+                        index.setdefault(row[f"{temp}fk_{tb.name}"], []).append(row)
+                elif rel.other_table.type_name in self.data:
+                    for row in self.data[rel.other_table.type_name]["records"]:
+                        index.setdefault(
+                            row[f"{temp}fk_parent_{tb.name}"], []
+                        ).append(row)
+                children_index[(tb.type_name, rel.rel_table_name)] = index
+
+        def _collect(doc_data: dict, node_type: str, node_pk: int) -> None:
+            """Copy a record and its subtree into the flat data of a document
+
+            The subtree is walked iteratively (without recursion), in depth-first order, so that deep documents do not
+            hit the Python recursion limit. The stack holds either records to visit, as `(node_type, node_pk)`, or
+            relationship rows to append, as `(records_list, row)`.
+            """
+            seen = {}
+            stack = [(node_type, node_pk)]
+            while stack:
+                node_type, node_pk = stack.pop()
+                if isinstance(node_type, list):
+                    node_type.append(node_pk)
+                    continue
+                if node_pk in seen.setdefault(node_type, set()):
+                    continue
+                seen[node_type].add(node_pk)
+                tb = self.model.tables[node_type]
+                record = records_index[node_type][node_pk]
+                tb_data = doc_data.get(node_type)
+                if tb_data is None:
+                    tb_data = doc_data[node_type] = {"records": []}
+                    if len(tb.relations_n) > 0:
+                        tb_data["relations_n"] = {
+                            rel.rel_table_name: {"records": []}
+                            for rel in tb.relations_n.values()
+                        }
+                tb_data["records"].append(record)
+                tasks = []
+                for rel in tb.relations_1.values():
+                    if record[f"{temp}{rel.field_name}"] is not None:
+                        tasks.append(
+                            (
+                                rel.other_table.type_name,
+                                record[f"{temp}{rel.field_name}"],
+                            )
+                        )
+                for rel in tb.relations_n.values():
+                    children = children_index[(node_type, rel.rel_table_name)].get(
+                        node_pk, []
+                    )
+                    for row in children:
+                        if rel.other_table.is_reused:
+                            tasks.append(
+                                (
+                                    tb_data["relations_n"][rel.rel_table_name][
+                                        "records"
+                                    ],
+                                    row,
+                                )
+                            )
+                            child_pk = row[f"{temp}fk_{rel.other_table.name}"]
+                        else:
+                            child_pk = row[f"{temp}pk_{rel.other_table.name}"]
+                        tasks.append((rel.other_table.type_name, child_pk))
+                # pushed in reverse order, so that records are collected in the same order as a recursive walk
+                stack.extend(reversed(tasks))
+
+        docs = []
+        for root_record in root_records:
+            doc = Document(self.model)
+            _collect(
+                doc.data,
+                self.model.root_table,
+                root_record[f"{temp}pk_{self.model.tables[self.model.root_table].name}"],
+            )
+            docs.append(doc)
+        return docs
+
     def insert_into_temp_tables(
         self,
         max_lines: int = -1,
@@ -428,7 +881,8 @@ class Document:
     ) -> float:
         """Insert data into temporary tables
 
-        (Re)creates temp tables before inserting data.
+        (Re)creates temp tables before inserting data, or empties them if the data model uses persistent temp
+        tables.
 
         Args:
             max_lines: The maximum number of lines to insert in a single statement
@@ -442,31 +896,99 @@ class Document:
             Seconds spent on this phase.
         """
         t0 = time.perf_counter()
-        logger.info(f"Dropping temp tables if exist for {self.xml_file_path}")
-        self.model.drop_all_temp_tables()
+        self._prepare_temp_tables()
+        self._insert_flat_data(max_lines, bulk_load, bulk_load_threshold)
+        return time.perf_counter() - t0
 
-        logger.info(f"Creating temp tables for {self.xml_file_path}")
-        self.model.create_all_tables(temp=True)
+    def _prepare_temp_tables(self) -> None:
+        """(Re)create temp tables, or empty persistent temp tables, before inserting data"""
+        logger.info(f"Preparing temp tables for {self.xml_file_path}")
+        self._staging_stats = {}
+        self.model.prepare_temp_tables()
+        self.model.refresh_bloom_filters()
 
+    def _insert_flat_data(
+        self,
+        max_lines: int = -1,
+        bulk_load: bool | None = None,
+        bulk_load_threshold: int | None = None,
+    ) -> None:
+        """Insert flat data records into existing temporary tables
+
+        Per-table statistics are accumulated into `_staging_stats`, across calls when streaming.
+
+        Args:
+            max_lines: The maximum number of lines to insert in a single statement
+            bulk_load: ``True`` to require bulk loading, ``False`` to always use executemany, or ``None`` (default)
+                to use bulk loading when available.
+            bulk_load_threshold: Minimum number of records to trigger bulk loading.
+        """
         logger.info(f"Inserting data into temporary tables from {self.xml_file_path}")
-        # insert data (order does not really matter)
+        if self.model.bloom_filters:
+            self._flag_maybe_existing_records()
+        # insert data (order does not really matter, temp tables have no foreign keys)
+        table_names = {}
         for tb in self.model.fk_ordered_tables:
+            table_names[tb.temp_table] = tb.name
+            for rel in tb.relations_n.values():
+                table_names[rel.temp_rel_table] = rel.rel_table_name
+        statements = [
+            (query, data)
+            for tb in self.model.fk_ordered_tables
             for query, data in tb.get_insert_temp_records_statements(
                 self.data.get(tb.type_name, None)
-            ):
-                batch_size = len(data) if max_lines is None or max_lines < 0 else max_lines
-                start_idx = 0
-                while start_idx < len(data):
-                    with self.model.engine.begin() as conn:
-                        self.model.dialect.bulk_insert(
-                            conn,
-                            query.table,
-                            data[start_idx : (start_idx + batch_size)],
-                            bulk_load=bulk_load,
-                            bulk_load_threshold=bulk_load_threshold,
-                        )
-                    start_idx = start_idx + batch_size
-        return time.perf_counter() - t0
+            )
+        ]
+        for query, _ in statements:
+            self._staging_stats.setdefault(table_names[query.table], TableStats())
+
+        def insert_records(query, data) -> None:
+            # each table is loaded by a single thread, so its stats can be updated without locking
+            table_stats = self._staging_stats[table_names[query.table]]
+            t0 = time.perf_counter()
+            batch_size = len(data) if max_lines is None or max_lines < 0 else max_lines
+            start_idx = 0
+            while start_idx < len(data):
+                with self.model.engine.begin() as conn:
+                    nbytes = self.model.dialect.bulk_insert(
+                        conn,
+                        query.table,
+                        data[start_idx : (start_idx + batch_size)],
+                        bulk_load=bulk_load,
+                        bulk_load_threshold=bulk_load_threshold,
+                    )
+                table_stats.bytes_staged += nbytes or 0
+                start_idx = start_idx + batch_size
+            table_stats.records += len(data)
+            table_stats.duration_stage += time.perf_counter() - t0
+
+        workers = min(self.model.staging_workers, len(statements))
+        if workers > 1 and self.model.dialect.CONCURRENT_STAGING:
+            # each table is loaded by a single thread, starting with the largest ones so that the longest load does
+            # not start last
+            statements.sort(key=lambda item: len(item[1]), reverse=True)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(insert_records, query, data)
+                    for query, data in statements
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for query, data in statements:
+                insert_records(query, data)
+
+    def _flag_maybe_existing_records(self) -> None:
+        """Set the `temp_maybe_exists` value of records of reused tables from the Bloom filters of the data model, so
+        that records which are definitely new are not looked up by hash when merging"""
+        hash_col_name = self.model.model_config["record_hash_column_name"]
+        for tb in self.model.fk_ordered_tables:
+            bloom_filter = self.model.bloom_filters.get(tb.name)
+            data = self.data.get(tb.type_name)
+            if bloom_filter is None or data is None or len(data["records"]) == 0:
+                continue
+            for record in data["records"]:
+                record["temp_maybe_exists"] = record[hash_col_name] in bloom_filter
 
     def merge_into_target_tables(self, single_transaction: bool = True) -> MergeStats:
         """Merge data into target data model
@@ -483,30 +1005,54 @@ class Document:
         inserted = 0
         existing = 0
         row_counts_available = False
+        tables_stats = {}
+        statements = []
         t0 = time.perf_counter()
-        for tables in (
-            [self.model.fk_ordered_tables]
-            if single_transaction
-            else self.model.transaction_groups
-        ):
+        execution_options = {"compiled_cache": self.model.merge_compiled_cache}
+        for tables in self.model.get_merge_plan(single_transaction):
             with self.model.engine.begin() as conn:
-                for tb in tables:
+                for tb, queries in tables:
+                    table_stats = tables_stats.setdefault(tb.name, TableStats())
                     # Within each table's statement stream the first INSERT is always the
                     # main data-table insert; subsequent INSERTs belong to n-n join tables.
+                    # Statements flagged with xml2db_counts_inserted (e.g. an UPDATE with an
+                    # INSERT … RETURNING CTE) affect exactly one row per inserted row.
                     table_inserted = None
-                    for query in tb.get_merge_temp_records_statements():
-                        result = conn.execute(query)
-                        if query.is_insert and table_inserted is None:
+                    for query in queries:
+                        query_options = query.get_execution_options()
+                        t_query = time.perf_counter()
+                        result = conn.execute(
+                            query, execution_options=execution_options
+                        )
+                        duration = time.perf_counter() - t_query
+                        table_stats.duration_merge += duration
+                        statements.append(
+                            StatementStats(
+                                table=tb.name,
+                                label=query_options.get(
+                                    "xml2db_label", query.__visit_name__
+                                ),
+                                duration=duration,
+                                rowcount=result.rowcount,
+                            )
+                        )
+                        if (
+                            query.is_insert
+                            or query_options.get("xml2db_counts_inserted", False)
+                        ) and table_inserted is None:
                             # rowcount is -1 on backends that do not report it for
                             # INSERT … FROM SELECT (e.g. DuckDB); skip those tables.
                             if result.rowcount >= 0:
                                 table_inserted = result.rowcount
                                 row_counts_available = True
                     if table_inserted is not None:
+                        table_stats.inserted = table_inserted
                         inserted += table_inserted
                         if tb.is_reused and tb.type_name in self.data:
                             existing += (
-                                len(self.data[tb.type_name]["records"]) - table_inserted
+                                len(self.data[tb.type_name]["records"])
+                                + self.data[tb.type_name].get("flushed_records", 0)
+                                - table_inserted
                             )
         if row_counts_available:
             if inserted == 0:
@@ -518,6 +1064,8 @@ class Document:
             existing=existing,
             duration=time.perf_counter() - t0,
             row_counts_available=row_counts_available,
+            tables=tables_stats,
+            statements=statements,
         )
 
     def insert_into_target_tables(
@@ -542,6 +1090,201 @@ class Document:
             bulk_load_threshold: Minimum number of records to trigger bulk
                 loading.  ``None`` delegates the choice to the dialect.
 
+        Returns:
+            A :class:`LoadStats` object with inserted/existing row counts and per-phase durations.
+        """
+        return self._insert_and_merge(
+            lambda: self.insert_into_temp_tables(
+                max_lines, bulk_load, bulk_load_threshold
+            ),
+            single_transaction,
+        )
+
+    def stream_into_target_tables(
+        self,
+        xml_file: Union[str, BytesIO],
+        metadata: dict = None,
+        chunk_size: int = 1000,
+        skip_validation: bool = True,
+        recover: bool = False,
+        single_transaction: bool = True,
+        max_lines: int = -1,
+        bulk_load: bool | None = None,
+        bulk_load_threshold: int | None = None,
+        chunk_element: str = None,
+    ) -> LoadStats:
+        """Parse an XML document and load it into the database in streaming mode
+
+        This is equivalent to [`parse_xml`][xml2db.document.Document.parse_xml] followed by
+        [`insert_into_target_tables`][xml2db.document.Document.insert_into_target_tables], but repeated elements
+        (chunk elements) are converted to flat data and inserted into the temporary tables by chunks, as soon as
+        they are parsed, and then released. Parsing thus overlaps with temp tables insertion, and records are merged
+        into target tables as usual, once the whole file has been parsed.
+
+        By default, chunk elements are the n-n children of the root table, including those nested in wrapper
+        elements which are elevated into the root table (e.g. `<root><contractList><contract/>...`). Other nodes,
+        and chunk elements whose parent is not the root table, are kept in memory until the end of the file, so
+        memory usage is bounded by the size of a chunk only if the bulk of the file is made of these elements. Use
+        `chunk_element` to stream another repeated element, at any depth: its parent table and the parent tables
+        above it (except the root table) must not be deduplicated (`reuse: False`), as their records are staged
+        once the whole file has been parsed, while their streamed children already reference them.
+
+        The `document_tree_hook` option is not supported in this mode, as the full document tree is never built.
+        After loading, `data` only holds deduplication info, not records.
+
+        Args:
+            xml_file: The path or the file object of an XML file to parse
+            metadata: A dict of metadata values to add to the root table (a value for each key defined in
+                `metadata_columns` passed to model config)
+            chunk_size: The number of chunk elements to accumulate before inserting them into temporary tables
+            skip_validation: Should we validate the document against the schema first?
+            recover: Should we try to parse incorrect XML? (argument passed to lxml parser)
+            single_transaction: Should we run all merge queries in a single transaction, or isolate queries at the
+                minimum scope required to ensure database consistency?
+            max_lines: The maximum number of lines to insert in a single statement when loading data to the temporary
+                tables
+            bulk_load: ``True`` to require bulk loading (raise if unavailable),
+                ``False`` to always use executemany, or ``None`` (default) to
+                use bulk loading when available and fall back silently.
+            bulk_load_threshold: Minimum number of records to trigger bulk
+                loading.  ``None`` delegates the choice to the dialect.
+            chunk_element: The element name or table type name of the elements to stream (n-n children of a
+                table). If `None`, n-n children of the root table are streamed.
+
+        Returns:
+            A :class:`LoadStats` object with inserted/existing row counts and per-phase durations. The
+            `duration_temp_insert` value includes XML parsing time.
+
+        Raises:
+            ValueError: If the `document_tree_hook` option is set, or if a streamed element belongs to a parent
+                table which is deduplicated (or has deduplicated parent tables), other than the root table
+        """
+        if self.model.model_config["document_tree_hook"] is not None:
+            raise ValueError(
+                "document_tree_hook cannot be used when streaming XML files, as the full document tree is never built"
+            )
+
+        self.xml_file_path = xml_file[:255] if isinstance(xml_file, str) else "<stream>"
+        self.data = {}
+        self.parse_stats = None
+
+        def stage() -> float:
+            t0 = time.perf_counter()
+            self._prepare_temp_tables()
+
+            # primary keys reserved for parents of streamed nodes, keyed by the id of their content dict (which is
+            # kept alive in the document tree until their records are extracted)
+            reserved_pks = {}
+            row_numbers = {}
+            checked_parents = set()
+            pending = 0
+            duration_flatten = 0.0
+
+            def flush():
+                self._insert_flat_data(max_lines, bulk_load, bulk_load_threshold)
+                for data in self.data.values():
+                    data["flushed_records"] = data.get("flushed_records", 0) + len(
+                        data["records"]
+                    )
+                    data["records"].clear()
+                    for rel_data in data.get("relations_n", {}).values():
+                        rel_data["records"].clear()
+
+            def add_chunk_node(
+                parent_type: str, key: str, node: tuple, parent_content: dict
+            ) -> None:
+                nonlocal pending, duration_flatten
+                t_flatten = time.perf_counter()
+                # by default, only children of the document root element are streamed, which is always staged
+                if chunk_element is not None and parent_type not in checked_parents:
+                    self._check_chunk_parent(parent_type)
+                    checked_parents.add(parent_type)
+                model_table = self.model.tables[parent_type]
+                parent_data = self._init_table_data(parent_type, self.data)
+                # the parent record will be extracted last, but children need its primary key right away
+                parent_id = id(parent_content)
+                if parent_id not in reserved_pks:
+                    reserved_pks[parent_id] = parent_data["next_pk"]
+                    parent_data["next_pk"] += 1
+                row_numbers[(parent_id, key)] = row_numbers.get((parent_id, key), 0) + 1
+                self._extract_relation_n_child(
+                    model_table,
+                    model_table.relations_n[key],
+                    node,
+                    reserved_pks[parent_id],
+                    row_numbers[(parent_id, key)],
+                    self.data,
+                )
+                duration_flatten += time.perf_counter() - t_flatten
+                pending += 1
+                if pending >= chunk_size:
+                    flush()
+                    pending = 0
+
+            logger.info(f"Streaming {self.xml_file_path} into temporary tables")
+            document_tree = self.model.xml_converter.parse_xml(
+                xml_file=xml_file,
+                file_path=self.xml_file_path,
+                skip_validation=skip_validation,
+                recover=recover,
+                iterparse=True,
+                chunk_callback=add_chunk_node,
+                time_hashing=self.model.model_config["load_stats_hook"] is not None,
+                chunk_element=chunk_element,
+            )
+            t_flatten = time.perf_counter()
+            self._extract_node(
+                document_tree, 0, 0, self.data, metadata, reserved_pks=reserved_pks
+            )
+            self.parse_stats = self._get_parse_stats(
+                duration_flatten + time.perf_counter() - t_flatten
+            )
+            flush()
+            return time.perf_counter() - t0
+
+        return self._insert_and_merge(stage, single_transaction)
+
+    def _check_chunk_parent(self, parent_type: str) -> None:
+        """Check that nodes of a table can hold streamed children: it must be the root table, or it must not be
+        deduplicated, nor any of its parent tables but the root table, so that its records are always staged with the
+        primary key reserved for its streamed children
+
+        Args:
+            parent_type: The type name of the parent table of streamed nodes
+
+        Raises:
+            ValueError: If a table between the parent table and the root table (included) is deduplicated
+        """
+        parents = {}
+        for tb in self.model.tables.values():
+            for rel in [*tb.relations_1.values(), *tb.relations_n.values()]:
+                parents.setdefault(rel.other_table.type_name, set()).add(tb.type_name)
+        to_visit = [parent_type]
+        visited = set()
+        while to_visit:
+            type_name = to_visit.pop()
+            if type_name in visited or type_name == self.model.root_table:
+                continue
+            visited.add(type_name)
+            if self.model.tables[type_name].is_reused:
+                raise ValueError(
+                    f"Cannot stream children of '{parent_type}' nodes, as '{type_name}' records are deduplicated "
+                    f"(set 'reuse: False' for this table, or stream another element)"
+                )
+            to_visit.extend(parents.get(type_name, []))
+
+    def _insert_and_merge(
+        self, insert_into_temp: Callable[[], float], single_transaction: bool
+    ) -> LoadStats:
+        """Create schema, run a temp tables insertion function, merge into target tables and clean up
+
+        Args:
+            insert_into_temp: A function inserting data into temporary tables, which returns its duration
+            single_transaction: Should we run all queries in a single transaction?
+
+        The `load_stats_hook` function of the model config, if any, is called with this document and the returned
+        statistics.
+
         Returns:
             A :class:`LoadStats` object with inserted/existing row counts and per-phase durations.
         """
@@ -556,7 +1299,7 @@ class Document:
             logger.error(e)
             raise
         try:
-            duration_temp = self.insert_into_temp_tables(max_lines, bulk_load, bulk_load_threshold)
+            duration_temp = insert_into_temp()
         except Exception as e:
             logger.error(
                 f"Error while importing into temporary tables from {self.xml_file_path}"
@@ -570,6 +1313,8 @@ class Document:
             try:
                 self.model.create_all_tables()  # Create target tables if not exist
                 merge_stats = self.merge_into_target_tables(single_transaction)
+                if self.model.hash_cache is not None:
+                    self._update_hash_cache()
             except Exception as e:
                 logger.error(
                     f"Error while merging temporary tables into target tables for {self.xml_file_path}"
@@ -577,19 +1322,47 @@ class Document:
                 logger.error(e)
                 raise
         finally:
-            logger.info(f"Dropping temporary tables for {self.xml_file_path}")
+            logger.info(f"Cleaning up temporary tables for {self.xml_file_path}")
             t0 = time.perf_counter()
-            self.model.drop_all_temp_tables()
+            self.model.cleanup_temp_tables()
             duration_cleanup = time.perf_counter() - t0
 
-        return LoadStats(
+        tables = self._staging_stats
+        for name, merge_table_stats in merge_stats.tables.items():
+            table_stats = tables.setdefault(name, TableStats())
+            table_stats.duration_merge = merge_table_stats.duration_merge
+            table_stats.inserted = merge_table_stats.inserted
+        stats = LoadStats(
             inserted=merge_stats.inserted,
             existing=merge_stats.existing,
             duration_temp_insert=duration_temp,
             duration_merge=merge_stats.duration,
             duration_cleanup=duration_cleanup,
             row_counts_available=merge_stats.row_counts_available,
+            tables=tables,
+            statements=merge_stats.statements,
+            parse=self.parse_stats,
         )
+        if self.model.model_config["load_stats_hook"] is not None:
+            self.model.model_config["load_stats_hook"](self, stats)
+        return stats
+
+    def _update_hash_cache(self) -> None:
+        """Add record hashes and target primary keys of reused tables to the data model hash cache, reading them
+        from temporary tables once they have been merged"""
+        hash_col_name = self.model.model_config["record_hash_column_name"]
+        with self.model.engine.connect() as conn:
+            for tb in self.model.fk_ordered_tables:
+                if tb.is_reused and tb.type_name in self.data:
+                    self.model.hash_cache.update(
+                        tb.name,
+                        conn.execute(
+                            select(
+                                getattr(tb.temp_table.c, hash_col_name),
+                                getattr(tb.temp_table.c, f"pk_{tb.name}"),
+                            )
+                        ),
+                    )
 
     def extract_from_database(
         self,
@@ -599,6 +1372,12 @@ class Document:
     ) -> dict:
         """Extract a subtree from the database and store it in a flat format
 
+        Extraction is set-based: primary keys of the selected root records, and then of all records reachable from
+        them, are first written into key tables (one for each table, prefixed like temporary tables), from the root
+        table down, with a single `INSERT ... SELECT` for each table. Each table (and n-n relationships table) is then
+        read with a single query filtered on its key table, streaming rows from the database. Key tables are dropped
+        afterwards.
+
         Args:
             root_table_name: The root table name to start from
             root_select_where: A where clause to apply to this root table
@@ -607,173 +1386,179 @@ class Document:
         Returns:
             A shallow dict of flat data tables
         """
+        return self._extract_flat_data(
+            root_table_name, text(root_select_where), force_tz
+        )
 
-        if force_tz:
-            force_tz = ZoneInfo(force_tz)
-
-        def _fetch_data(
-            sqla_table: Table,
-            key_column: Column,
-            join_sequence: list[tuple[Column, Table, Column]],
-            top_where_clause: TextClause,
-            order_by: Union[None, tuple[Column]],
-            append_to: list,
-            conn: Connection,
-        ):
-            """Fetch data from a specific table and write fetched rows in a dict keyed by the first row column"""
-            quer = select(*(sqla_table.columns.values()))
-
-            join_sequence = join_sequence.copy()
-            if len(join_sequence) > 0:
-                left_col, join_tb, right_col = join_sequence.pop()
-                sub_quer = select(right_col)
-                prev_join_col = left_col
-                for left_col, join_tb, right_col in reversed(join_sequence):
-                    sub_quer = sub_quer.join(join_tb, right_col == prev_join_col)
-                    prev_join_col = left_col
-                sub_quer = sub_quer.where(top_where_clause)
-                quer = quer.where(key_column.in_(sub_quer))
-            else:
-                quer = quer.where(top_where_clause)
+    def _extract_flat_data(
+        self,
+        root_table_name: str,
+        root_filter,
+        force_tz: Union[str, None] = None,
+    ) -> dict:
+        """Extract a subtree from the database, selecting root records with a SQLAlchemy where clause
 
-            if order_by:
-                quer = quer.order_by(*order_by)
+        Args:
+            root_table_name: The root table name to start from
+            root_filter: A SQLAlchemy where clause to apply to this root table
+            force_tz: Apply this timezone if database returns timezone-naïve datetime
 
-            def add_tz(x):
-                if (
-                    force_tz
-                    and isinstance(x, datetime.datetime)
-                    and (x.tzinfo is None or x.tzinfo.utcoffset(x) is None)
-                ):
-                    x = x.replace(tzinfo=force_tz)
-                return x
+        Returns:
+            A shallow dict of flat data tables
+        """
+        if force_tz:
+            force_tz = ZoneInfo(force_tz)
 
-            col_names = sqla_table.columns.keys()
-            for row in conn.execute(quer):
-                append_to.append({key: add_tz(val) for key, val in zip(col_names, row)})
-
-        def _do_extract_table(
-            tb,
-            top_where_clause,
-            parent_table,
-            join_sequence,
-            res_dict,
-            conn,
-        ):
-            """Fetch tables and relationship tables recursively"""
-            if tb.type_name not in res_dict:
-                res_dict[tb.type_name] = {"records": []}
-            _fetch_data(
-                tb.table,
-                (
-                    getattr(tb.table.c, f"pk_{tb.name}")
-                    if tb.is_reused
-                    else getattr(tb.table.c, f"fk_parent_{parent_table.name}")
-                ),
-                join_sequence,
-                top_where_clause,
-                (
-                    None
-                    if tb.is_reused or not tb.data_model.model_config["row_numbers"]
-                    else (
-                        getattr(tb.table.c, f"fk_parent_{parent_table.name}"),
-                        tb.table.c.xml2db_row_number,
+        # tables reachable from the root table, with the relations pointing to them
+        root_tb = self.model.tables[root_table_name]
+        incoming = {root_tb.type_name: []}
+        to_visit = [root_tb]
+        while to_visit:
+            tb = to_visit.pop()
+            for rel in list(tb.relations_1.values()) + list(tb.relations_n.values()):
+                if rel.other_table.type_name not in incoming:
+                    incoming[rel.other_table.type_name] = []
+                    to_visit.append(rel.other_table)
+                incoming[rel.other_table.type_name].append((tb, rel))
+        # parent tables first, so that key tables of all parents are filled before their children's
+        tables = [
+            self.model.tables[type_name]
+            for type_name in TopologicalSorter(
+                {
+                    type_name: {parent.type_name for parent, _ in parents}
+                    for type_name, parents in incoming.items()
+                }
+            ).static_order()
+        ]
+
+        d = self.model.dialect
+        metadata = MetaData()
+        key_tables = {
+            tb.type_name: Table(
+                d.db_identifier(f"temp_{self.model.temp_prefix}_keys_{tb.name}"),
+                metadata,
+                Column("pk", Integer, primary_key=True, autoincrement=False),
+                schema=self.model.db_schema,
+            )
+            for tb in tables
+        }
+
+        def pk_of(tb):
+            return getattr(tb.table.c, f"pk_{tb.name}")
+
+        def keys_select(tb):
+            """Build the select statement of the primary keys of a table reachable from its parents' keys"""
+            if tb is root_tb:
+                return select(pk_of(tb)).where(root_filter)
+            sources = []
+            for parent, rel in incoming[tb.type_name]:
+                parent_keys = key_tables[parent.type_name]
+                if rel in parent.relations_1.values():
+                    fk_col = getattr(parent.table.c, rel.field_name)
+                    sources.append(
+                        select(fk_col)
+                        .join(parent_keys, pk_of(parent) == parent_keys.c.pk)
+                        .where(fk_col != None)  # noqa: SQLAlchemy not supporting "is not None"
                     )
-                ),
-                res_dict[tb.type_name]["records"],
-                conn,
+                elif tb.is_reused:
+                    sources.append(
+                        select(getattr(rel.rel_table.c, f"fk_{tb.name}")).join(
+                            parent_keys,
+                            getattr(rel.rel_table.c, f"fk_{parent.name}")
+                            == parent_keys.c.pk,
+                        )
+                    )
+                else:
+                    sources.append(
+                        select(pk_of(tb)).join(
+                            parent_keys,
+                            getattr(tb.table.c, f"fk_parent_{parent.name}")
+                            == parent_keys.c.pk,
+                        )
+                    )
+            if len(sources) > 1:
+                return union(*sources)
+            return sources[0].distinct() if tb.is_reused else sources[0]
+
+        def fetch(sqla_table, key_column, key_table, order_by, append_to, conn):
+            """Fetch rows of a table whose key column is in a key table, and append them to a list as dicts"""
+            query = select(*sqla_table.columns.values()).where(
+                key_column.in_(select(key_table.c.pk))
             )
-            join_root = (
-                [(None, tb.table, getattr(tb.table.c, f"pk_{tb.name}"))]
-                if parent_table is None
+            if order_by:
+                query = query.order_by(*order_by)
+            col_names = sqla_table.columns.keys()
+            tz_cols = (
+                [
+                    name
+                    for name, col in zip(col_names, sqla_table.columns.values())
+                    if isinstance(col.type, DateTime)
+                ]
+                if force_tz
                 else []
             )
-            if len(tb.relations_n) > 0:
-                if "relations_n" not in res_dict[tb.type_name]:
-                    res_dict[tb.type_name]["relations_n"] = {}
-                for rel in tb.relations_n.values():
-                    if rel.rel_table_name not in res_dict[tb.type_name]["relations_n"]:
-                        res_dict[tb.type_name]["relations_n"][rel.rel_table_name] = {
-                            "records": []
-                        }
-                    new_join = []
-                    if not tb.is_reused:
-                        new_join = [
-                            (
-                                getattr(tb.table.c, f"fk_parent_{parent_table.name}"),
-                                tb.table,
-                                getattr(tb.table.c, f"pk_{tb.table.name}"),
-                            )
-                        ]
-                    if rel.other_table.is_reused:
-                        _fetch_data(
-                            rel.rel_table,
-                            getattr(rel.rel_table.c, f"fk_{tb.name}"),
-                            join_sequence + join_root + new_join,
-                            top_where_clause,
-                            (
-                                (
-                                    getattr(rel.rel_table.c, f"fk_{tb.name}"),
-                                    rel.rel_table.c.xml2db_row_number,
-                                )
-                                if tb.data_model.model_config["row_numbers"]
-                                else None
-                            ),
-                            res_dict[tb.type_name]["relations_n"][rel.rel_table_name][
-                                "records"
-                            ],
-                            conn,
-                        )
-                        new_join = new_join + [
+            for row in conn.execute(
+                query.execution_options(yield_per=_EXTRACT_BATCH_ROWS)
+            ):
+                record = dict(zip(col_names, row))
+                for name in tz_cols:
+                    x = record[name]
+                    if isinstance(x, datetime.datetime) and (
+                        x.tzinfo is None or x.tzinfo.utcoffset(x) is None
+                    ):
+                        record[name] = x.replace(tzinfo=force_tz)
+                append_to.append(record)
+
+        row_numbers = self.model.model_config["row_numbers"]
+        flat_tables = {}
+        try:
+            with self.model.engine.begin() as conn:
+                metadata.create_all(conn)
+                for tb in tables:
+                    conn.execute(
+                        key_tables[tb.type_name]
+                        .insert()
+                        .from_select(["pk"], keys_select(tb))
+                    )
+                for tb in tables:
+                    tb_data = flat_tables[tb.type_name] = {"records": []}
+                    fetch(
+                        tb.table,
+                        pk_of(tb),
+                        key_tables[tb.type_name],
+                        (
                             (
-                                getattr(rel.rel_table.c, f"fk_{tb.name}"),
-                                rel.rel_table,
-                                getattr(rel.rel_table.c, f"fk_{rel.other_table.name}"),
+                                getattr(tb.table.c, f"fk_parent_{tb.parent.name}"),
+                                tb.table.c.xml2db_row_number,
                             )
-                        ]
-                    _do_extract_table(
-                        rel.other_table,
-                        top_where_clause,
-                        tb,
-                        join_sequence + join_root + new_join,
-                        res_dict,
+                            if row_numbers and not tb.is_reused
+                            else None
+                        ),
+                        tb_data["records"],
                         conn,
                     )
-            for rel in tb.relations_1.values():
-                _do_extract_table(
-                    rel.other_table,
-                    top_where_clause,
-                    tb,
-                    join_sequence
-                    + [
-                        (
-                            getattr(
-                                tb.table.c,
+                    if len(tb.relations_n) > 0:
+                        tb_data["relations_n"] = {}
+                    for rel in tb.relations_n.values():
+                        rel_data = tb_data["relations_n"][rel.rel_table_name] = {
+                            "records": []
+                        }
+                        if rel.other_table.is_reused:
+                            fk_col = getattr(rel.rel_table.c, f"fk_{tb.name}")
+                            fetch(
+                                rel.rel_table,
+                                fk_col,
+                                key_tables[tb.type_name],
                                 (
-                                    f"pk_{tb.name}"
-                                    if tb.is_reused
-                                    else f"fk_parent_{parent_table.name}"
+                                    (fk_col, rel.rel_table.c.xml2db_row_number)
+                                    if row_numbers
+                                    else None
                                 ),
-                            ),
-                            tb.table,
-                            getattr(tb.table.c, f"{rel.field_name}"),
-                        )
-                    ],
-                    res_dict,
-                    conn,
-                )
-
-        flat_tables = {}
-
-        with self.model.engine.connect() as conn:
-            _do_extract_table(
-                self.model.tables[root_table_name],
-                text(root_select_where),
-                None,
-                [],
-                flat_tables,
-                conn,
-            )
+                                rel_data["records"],
+                                conn,
+                            )
+        finally:
+            metadata.drop_all(self.model.engine, checkfirst=True)
 
         self.data = flat_tables
         return flat_tables
@@ -797,3 +1582,134 @@ class Document:
                     for k, v in self.data.items()
                 ]
             )
+
+
+class BatchLoader:
+    """Accumulate flat data from many XML files and load them into the database in batches.
+
+    Each batch goes through a single temp tables insertion and merge cycle, which saves the per-file overhead of
+    creating temporary tables and running merge statements when loading many small files. Records of a batch are
+    kept in memory until it is flushed, which happens automatically when `max_records` or `max_files` is reached.
+
+    Metadata values are set on the root record of each file, as with
+    [`Document.parse_xml`][xml2db.document.Document.parse_xml]. Note that if two files of the same batch have exactly
+    the same content, their root records are deduplicated and only the first file metadata is kept, just as when
+    loading the second file after the first one.
+
+    Use it as a context manager to load the last (incomplete) batch on exit, or call
+    [`flush`][xml2db.document.BatchLoader.flush] explicitly.
+
+    Args:
+        model: A `DataModel` object
+        max_records: The number of records (in all tables) above which the current batch is loaded
+        max_files: The maximum number of files in a batch
+        single_transaction: Should we run all merge queries in a single transaction?
+        max_lines: The maximum number of lines to insert in a single statement when loading data to the temporary
+            tables
+        bulk_load: ``True`` to require bulk loading (raise if unavailable), ``False`` to always use executemany, or
+            ``None`` (default) to use bulk loading when available and fall back silently.
+        bulk_load_threshold: Minimum number of records to trigger bulk loading.  ``None`` delegates the choice to
+            the dialect.
+
+    Attributes:
+        files: A list of `(xml_file, metadata)` tuples for files of the current batch
+        stats: A list of `(files, LoadStats)` tuples for batches already loaded
+
+    Examples:
+        >>> with data_model.batch_loader(max_files=500) as loader:
+        ...     for xml_file in xml_files:
+        ...         loader.add(xml_file, metadata={"input_file_path": xml_file})
+    """
+
+    def __init__(
+        self,
+        model: "DataModel",
+        max_records: int = 1000000,
+        max_files: int = 1000,
+        single_transaction: bool = True,
+        max_lines: int = -1,
+        bulk_load: bool | None = None,
+        bulk_load_threshold: int | None = None,
+    ):
+        self.model = model
+        self.max_records = max_records
+        self.max_files = max_files
+        self.insert_kwargs = {
+            "single_transaction": single_transaction,
+            "max_lines": max_lines,
+            "bulk_load": bulk_load,
+            "bulk_load_threshold": bulk_load_threshold,
+        }
+        self.files = []
+        self.stats = []
+        self._document = Document(model)
+
+    @property
+    def records_count(self) -> int:
+        """The number of records (including n-n relationships) of the current batch"""
+        return sum(
+            len(data["records"])
+            + sum(
+                len(rel_data["records"])
+                for rel_data in data.get("relations_n", {}).values()
+            )
+            for data in self._document.data.values()
+        )
+
+    def add(
+        self,
+        xml_file: Union[str, BytesIO],
+        metadata: dict = None,
+        skip_validation: bool = True,
+        iterparse: bool = True,
+        recover: bool = False,
+    ) -> Union[LoadStats, None]:
+        """Parse an XML file and add its data to the current batch, loading the batch if it is full
+
+        Args:
+            xml_file: The path or the file object of an XML file to parse
+            metadata: A dict of metadata values to add to the root table of this file
+            skip_validation: Should we validate the document against the schema first?
+            iterparse: Parse XML using iterative parsing, which is a bit slower but uses less memory
+            recover: Should we try to parse incorrect XML? (argument passed to lxml parser)
+
+        Returns:
+            A [`LoadStats`][xml2db.document.LoadStats] object if the batch was loaded, else `None`
+        """
+        self._document.parse_xml(
+            xml_file,
+            metadata=metadata,
+            skip_validation=skip_validation,
+            iterparse=iterparse,
+            recover=recover,
+            flat_data=self._document.data,
+        )
+        self.files.append((self._document.xml_file_path, metadata))
+        if len(self.files) >= self.max_files or self.records_count >= self.max_records:
+            return self.flush()
+        return None
+
+    def flush(self) -> Union[LoadStats, None]:
+        """Load the current batch into the database, if not empty
+
+        Returns:
+            A [`LoadStats`][xml2db.document.LoadStats] object if a batch was loaded, else `None`
+        """
+        if not self.files:
+            return None
+        files, document = self.files, self._document
+        self.files = []
+        self._document = Document(self.model)
+        document.xml_file_path = f"batch of {len(files)} files"
+        logger.info(f"Loading a batch of {len(files)} files")
+        stats = document.insert_into_target_tables(**self.insert_kwargs)
+        self.stats.append((files, stats))
+        return stats
+
+    def __enter__(self) -> "BatchLoader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # do not load a partial batch if an error occurred
+        if exc_type is None:
+            self.flush()
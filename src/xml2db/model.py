@@ -1,21 +1,31 @@
 import logging
+import multiprocessing
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from io import BytesIO
-from typing import Iterable, Union
+from typing import Callable, Iterable, Union
 from uuid import uuid4
 import hashlib
+import importlib.metadata
+import pickle
+import stat
+import sys
 
 import xmlschema
 import sqlalchemy
 from lxml import etree
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, func, select
 from sqlalchemy.engine import make_url
 from sqlalchemy.sql.ddl import CreateIndex, CreateTable
 from graphlib import TopologicalSorter
 
+from .bloom import BloomFilter
+from .cache import HashCache
 from .dialect import get_dialect
-from .document import Document
+from .document import BatchLoader, Document, LoadStats
+from .config import hash_digest_size, resolve_hash_constructor
 from .exceptions import DataModelConfigError, check_type
 from .table import (
     DataModelTableReused,
@@ -25,6 +35,153 @@ from .xml_converter import XMLConverter
 
 logger = logging.getLogger(__name__)
 
+# DataModel instance of a worker process used by DataModel.import_files
+_worker_model = None
+
+
+def _init_import_worker(model_kwargs: dict) -> None:
+    """Build the DataModel of a worker process, once for all files it will parse"""
+    global _worker_model
+    _worker_model = DataModel(**model_kwargs)
+
+
+def _parse_file_worker(
+    xml_file: str, metadata: dict, skip_validation: bool, recover: bool
+) -> dict:
+    """Parse an XML file in a worker process and return its flat data, without deduplication info"""
+    doc = _worker_model.parse_xml(
+        xml_file, metadata=metadata, skip_validation=skip_validation, recover=recover
+    )
+    for data in doc.data.values():
+        data.pop("hashmap", None)
+    return doc.data
+
+
+# version of the data model cache format, to be incremented when cached objects change
+_MODEL_CACHE_VERSION = 1
+
+# DataModel attributes stored in the data model cache, i.e. the simplified data model before building sqlalchemy objects
+_MODEL_CACHE_ATTRIBUTES = (
+    "tables",
+    "names_types_map",
+    "root_table",
+    "types_transforms",
+    "fields_transforms",
+    "ordered_tables_keys",
+    "transaction_groups",
+    "source_tree",
+    "target_tree",
+)
+
+_XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+
+
+def _xsd_files_digest(xsd_file: str) -> str:
+    """Hash the content of a XSD file and of the XSD files it includes or imports, recursively"""
+    h = hashlib.sha256()
+    to_visit = [os.path.abspath(xsd_file)]
+    visited = set()
+    while to_visit:
+        path = to_visit.pop()
+        if path in visited:
+            continue
+        visited.add(path)
+        with open(path, "rb") as f:
+            content = f.read()
+        h.update(content)
+        for el in etree.fromstring(content).iter(
+            *(f"{{{_XSD_NAMESPACE}}}{tag}" for tag in ("include", "import", "redefine", "override"))
+        ):
+            location = el.get("schemaLocation")
+            if location is not None and "://" not in location:
+                to_visit.append(os.path.normpath(os.path.join(os.path.dirname(path), location)))
+    return h.hexdigest()
+
+
+def _config_fingerprint(value) -> str:
+    """Get a text representation of a model config which does not depend on the running process, as far as possible"""
+    if isinstance(value, dict):
+        items = sorted((str(k), _config_fingerprint(v)) for k, v in value.items())
+        return "{" + ",".join(f"{k}:{v}" for k, v in items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_config_fingerprint(v) for v in value) + "]"
+    if callable(value) and hasattr(value, "__qualname__"):
+        return f"{getattr(value, '__module__', '')}.{value.__qualname__}"
+    return repr(value)
+
+
+def _untrusted_file_reason(path: str) -> Union[str, None]:
+    """Check that a file can only have been written by the current user, before unpickling it
+
+    Args:
+        path: The file path
+
+    Returns:
+        The reason why the file is not trusted, or `None` if it is trusted
+    """
+    st = os.stat(path)
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return "it is not owned by the current user"
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return "it is writable by other users"
+    return None
+
+
+def _config_objects(model_config: Union[dict, None]) -> dict:
+    """Map objects of a model config (except immutable values) to their path in the model config"""
+    objects = {}
+    to_visit = [(model_config, ())]
+    while to_visit:
+        value, path = to_visit.pop()
+        if value is None or isinstance(value, (str, bytes, int, float, bool)):
+            continue
+        objects[id(value)] = path
+        if isinstance(value, dict):
+            to_visit.extend((v, path + (k,)) for k, v in value.items())
+        elif isinstance(value, (list, tuple)):
+            to_visit.extend((v, path + (i,)) for i, v in enumerate(value))
+    return objects
+
+
+class _ModelCachePickler(pickle.Pickler):
+    """Pickle the simplified data model, referencing the `DataModel` object, its sqlalchemy `MetaData` and objects of
+    the model config instead of storing them, so that they are taken from the `DataModel` which loads the cache"""
+
+    def __init__(self, file, model: "DataModel"):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.model = model
+        self.config_objects = _config_objects(model._worker_model_kwargs["model_config"])
+
+    def persistent_id(self, obj):
+        if obj is self.model:
+            return ("data_model",)
+        if obj is self.model.metadata:
+            return ("metadata",)
+        path = self.config_objects.get(id(obj))
+        if path is not None:
+            return ("model_config", path)
+        return None
+
+
+class _ModelCacheUnpickler(pickle.Unpickler):
+    """Load a simplified data model pickled by `_ModelCachePickler` into a `DataModel` object"""
+
+    def __init__(self, file, model: "DataModel"):
+        super().__init__(file)
+        self.model = model
+
+    def persistent_load(self, pid):
+        if pid[0] == "data_model":
+            return self.model
+        if pid[0] == "metadata":
+            return self.model.metadata
+        if pid[0] == "model_config":
+            value = self.model._worker_model_kwargs["model_config"]
+            for key in pid[1]:
+                value = value[key]
+            return value
+        raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+
 
 class DataModel:
     """A class to manage a data model based on an XML schema and its database equivalent.
@@ -49,16 +206,48 @@ class DataModel:
             `connection_string` or `db_engine`, if provided
         db_schema: A schema name to use in the database
         temp_prefix: A prefix to use for temporary tables (if `None`, will be generated randomly)
+        persistent_temp_tables: If `True`, temporary tables are created once and emptied between documents instead
+            of being dropped and recreated for each document. They are dropped when calling
+            [`close`][xml2db.model.DataModel.close], or when exiting the `DataModel` used as a context manager.
+        dialect_options: Keyword arguments passed to the database dialect, e.g. `{"copy_format": "binary"}` to load
+            data into PostgreSQL using binary `COPY`
+        staging_workers: The number of threads used to load temporary tables concurrently, each one with its own
+            connection from the engine pool (which should thus allow as many connections). It is only used for
+            databases which support it (PostgreSQL, MySQL and MS SQL Server); other databases load temporary tables
+            one at a time.
+        hash_cache_size: If positive, keep a [`HashCache`][xml2db.cache.HashCache] of up to this number of record
+            hashes known to exist in reused target tables, along with their primary keys. Records found in the cache
+            are staged without their content nor their children, and are not looked up again in target tables. The
+            cache is filled after each load and can be warmed with
+            [`warm_hash_cache`][xml2db.model.DataModel.warm_hash_cache]. It is not used by worker processes of
+            [`import_files`][xml2db.model.DataModel.import_files].
+        bloom_filter_capacity: If positive, keep a [`BloomFilter`][xml2db.bloom.BloomFilter] of the record hashes of
+            each reused target table, sized for this number of records. Staged records which are definitely not in
+            the target table are not looked up by hash when merging. Filters are built by reading target tables once,
+            and caught up with new records before each load (see
+            [`refresh_bloom_filters`][xml2db.model.DataModel.refresh_bloom_filters]).
+        bloom_filter_dir: A directory to save Bloom filters into, so that they are read from files rather than
+            rebuilt from target tables by the next runs
+        cache_dir: A directory to cache the simplified data model into. Next `DataModel` objects built with the same
+            XSD files (including those it includes or imports), `short_name`, `model_config`, database backend and
+            `dialect_options` load it from this cache instead of parsing and simplifying the XML schema. XSD files are
+            then only parsed if `xml_schema` or `lxml_schema` are used, e.g. to validate XML files. Cache files are
+            unpickled, which can run arbitrary code: this directory must be private to the user running xml2db. Cache
+            files are written with owner-only permissions, and files owned by another user or writable by other users
+            are ignored.
 
     Attributes:
-        xml_schema: The `xmlschema.XMLSchema` object associated with this data model
-        lxml_schema: The `lxml.etree.XMLSchema` object associated with this data model
+        xml_schema: The `xmlschema.XMLSchema` object associated with this data model (parsed on first use)
+        lxml_schema: The `lxml.etree.XMLSchema` object associated with this data model (parsed on first use)
         data_flow_name: A short identifier used for the data model (`short_name` argument value)
         data_flow_long_name: A longer for the data model (`long_name` argument value)
         dialect: A dialect class to manage db-specific behaviours
         db_schema: A database schema name to store the database tables
         source_tree: A text representation of the source data model tree
         target_tree: A text representation of the simplified data model tree which will be used to create target tables
+        hash_cache: The [`HashCache`][xml2db.cache.HashCache] of this data model, or `None` if disabled
+        bloom_filters: A dict of [`BloomFilter`][xml2db.bloom.BloomFilter] objects keyed by reused table name (empty
+            until the first load, or if disabled)
 
     Examples:
         Create a `DataModel` like this:
@@ -81,17 +270,39 @@ class DataModel:
         db_type: str = None,
         db_schema: str = None,
         temp_prefix: str = None,
+        persistent_temp_tables: bool = False,
+        dialect_options: dict = None,
+        staging_workers: int = 1,
+        hash_cache_size: int = 0,
+        bloom_filter_capacity: int = 0,
+        bloom_filter_dir: str = None,
+        cache_dir: str = None,
     ):
+        # arguments used to build the same data model in worker processes (see `import_files`)
+        self._worker_model_kwargs = {
+            "xsd_file": xsd_file,
+            "short_name": short_name,
+            "long_name": long_name,
+            "base_url": base_url,
+            "model_config": model_config,
+            "db_type": db_type,
+            "db_schema": db_schema,
+            "dialect_options": dialect_options,
+            "staging_workers": staging_workers,
+            "cache_dir": cache_dir,
+        }
         self.model_config = self._validate_config(model_config)
         self.tables_config = model_config.get("tables", {}) if model_config else {}
 
-        xsd_file_name = xsd_file
+        self._xsd_file = os.path.abspath(xsd_file)
+        self._xsd_file_name = xsd_file
         if base_url is None:
-            base_url = os.path.normpath(os.path.dirname(xsd_file))
-            xsd_file_name = os.path.basename(xsd_file)
-
-        self.xml_schema = xmlschema.XMLSchema(xsd_file_name, base_url=base_url)
-        self.lxml_schema = etree.XMLSchema(etree.parse(xsd_file))
+            base_url = os.path.dirname(os.path.abspath(xsd_file))
+            self._xsd_file_name = os.path.basename(xsd_file)
+        self._base_url = base_url
+        self._xml_schema = None
+        self._lxml_schema = None
+        self.cache_dir = cache_dir
 
         self.xml_converter = XMLConverter(data_model=self)
         self.data_flow_name = short_name
@@ -103,18 +314,39 @@ class DataModel:
             )
             self.engine = None
             self.db_type = db_type
-            self.dialect = get_dialect(self.db_type)
+            self.dialect = get_dialect(self.db_type, **(dialect_options or {}))
         elif db_engine:
             self.engine = db_engine
             self.db_type = self.engine.dialect.name
-            self.dialect = get_dialect(self.db_type)
+            self.dialect = get_dialect(self.db_type, **(dialect_options or {}))
         else:
             self.db_type = make_url(connection_string).drivername.split("+")[0]
-            self.dialect = get_dialect(self.db_type)
+            self.dialect = get_dialect(self.db_type, **(dialect_options or {}))
             self.engine = self.dialect.create_engine(connection_string)
         self.model_config = self.dialect.validate_model_config(self.model_config)
+        self._worker_model_kwargs["db_type"] = self.db_type
         self.db_schema = db_schema
         self.temp_prefix = str(uuid4())[:8] if temp_prefix is None else temp_prefix
+        self.persistent_temp_tables = persistent_temp_tables
+        if not isinstance(staging_workers, int) or staging_workers < 1:
+            raise ValueError(
+                f"staging_workers must be a positive integer, got {staging_workers!r}"
+            )
+        self.staging_workers = staging_workers
+        if not isinstance(hash_cache_size, int) or hash_cache_size < 0:
+            raise ValueError(
+                f"hash_cache_size must be a non-negative integer, got {hash_cache_size!r}"
+            )
+        self.hash_cache = HashCache(hash_cache_size) if hash_cache_size > 0 else None
+        if not isinstance(bloom_filter_capacity, int) or bloom_filter_capacity < 0:
+            raise ValueError(
+                f"bloom_filter_capacity must be a non-negative integer, got {bloom_filter_capacity!r}"
+            )
+        self.bloom_filter_capacity = bloom_filter_capacity
+        self.bloom_filter_dir = bloom_filter_dir
+        self.bloom_filters = {}
+        self._temp_tables_created = False
+        self._temp_tables_dirty = False
 
         self.tables = {}
         self.names_types_map = {}
@@ -124,13 +356,34 @@ class DataModel:
         self.fields_transforms = {}
         self.ordered_tables_keys = []
         self.transaction_groups = []
+        self.hash_plans = {}
+        self.conversion_plans = {}
         self.source_tree = ""
         self.target_tree = ""
         self.metadata = MetaData()
         self.processed_at = datetime.now()
+        self._merge_statements = None
+        self._merge_plans = {}
+        self._merge_compiled_cache = {}
 
         self._build_model()
 
+    @property
+    def xml_schema(self) -> xmlschema.XMLSchema:
+        if self._xml_schema is None:
+            self._xml_schema = xmlschema.XMLSchema(
+                self._xsd_file_name, base_url=self._base_url
+            )
+        return self._xml_schema
+
+    @property
+    def lxml_schema(self) -> etree.XMLSchema:
+        if self._lxml_schema is None:
+            self._lxml_schema = etree.XMLSchema(
+                etree.parse(self._xsd_file)
+            )
+        return self._lxml_schema
+
     def _validate_config(self, cfg):
         if cfg is None:
             cfg = {}
@@ -141,12 +394,26 @@ class DataModel:
                 ("row_numbers", bool, False),
                 ("document_tree_hook", callable, None),
                 ("document_tree_node_hook", callable, None),
+                ("load_stats_hook", callable, None),
                 ("record_hash_column_name", str, "xml2db_record_hash"),
-                ("record_hash_constructor", callable, hashlib.sha1),
                 ("record_hash_size", int, 20),
+                ("parse_datetimes", bool, False),
                 ("metadata_columns", list, []),
             ]
         }
+        model_config["record_hash_constructor"] = resolve_hash_constructor(
+            cfg.get("record_hash_constructor", hashlib.sha1),
+            model_config["record_hash_size"],
+        )
+        # hashes are stored in fixed size binary columns
+        digest_size = hash_digest_size(model_config["record_hash_constructor"])
+        if "record_hash_size" not in cfg:
+            model_config["record_hash_size"] = digest_size
+        elif digest_size != model_config["record_hash_size"]:
+            raise DataModelConfigError(
+                f"'record_hash_size' is {model_config['record_hash_size']} but the record hash constructor builds "
+                f"{digest_size} bytes digests"
+            )
         transform_raw = cfg.get("transform", "auto")
         if transform_raw is False or transform_raw == "false":
             model_config["transform"] = False
@@ -224,8 +491,24 @@ class DataModel:
     def _build_model(self):
         """Build model from the provided XSD schema and config.
 
-        It will parse the XML schema, then simplify it, then create all sqlalchemy objects.
+        It will parse the XML schema, then simplify it (or load the simplified model from the data model cache), then
+        create all sqlalchemy objects.
         """
+        cache_path = self._model_cache_path() if self.cache_dir else None
+        if cache_path is None or not self._load_model_cache(cache_path):
+            self._simplify_model()
+            if cache_path is not None:
+                self._save_model_cache(cache_path)
+        # build the ordered table in the sqlalchemy Metadata object (cannot be done before simplification because
+        # it will fail if we attempt to recreate tables that already exist in the sqlalchemy metadata
+        for tb in self.fk_ordered_tables:
+            tb.build_sqlalchemy_tables()
+        # precompute the steps used to hash document tree nodes of each table
+        self.hash_plans = {key: tb.compute_hash_plan() for key, tb in self.tables.items()}
+        self._build_conversion_plans()
+
+    def _simplify_model(self):
+        """Parse the XML schema and simplify it into the tables of the target data model, in create/insert order."""
         # parse the XML schema recursively and hold a reference to the head table
         root_table = self._parse_tree(
             self.xml_schema[0] if len(self.xml_schema) == 1 else self.xml_schema
@@ -269,10 +552,115 @@ class DataModel:
                 idx = tr_groups_index[tb.parent.type_name]
                 tr_groups_index[key] = idx
                 self.transaction_groups[idx].append(tb)
-        # build the ordered table in the sqlalchemy Metadata object (cannot be done before simplification because
-        # it will fail if we attempt to recreate tables that already exist in the sqlalchemy metadata
-        for tb in self.fk_ordered_tables:
-            tb.build_sqlalchemy_tables()
+
+    def _model_cache_path(self) -> Union[str, None]:
+        """Get the path of the data model cache file, keyed by XSD files content, model options and xml2db version
+
+        Returns:
+            The file path, or `None` if XSD files cannot be read (the data model is then built without cache)
+        """
+        try:
+            xsd_digest = _xsd_files_digest(self._xsd_file)
+        except (OSError, etree.XMLSyntaxError) as e:
+            logger.warning(f"Cannot compute data model cache key, cache disabled: {e}")
+            return None
+        try:
+            version = importlib.metadata.version("xml2db")
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        key = hashlib.sha256(
+            "\n".join(
+                [
+                    str(_MODEL_CACHE_VERSION),
+                    version,
+                    f"{sys.version_info[0]}.{sys.version_info[1]}",
+                    xsd_digest,
+                    self.data_flow_name,
+                    str(self.db_type),
+                    _config_fingerprint(self._worker_model_kwargs["dialect_options"]),
+                    _config_fingerprint(self._worker_model_kwargs["model_config"]),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{self.data_flow_name}_{key[:32]}.model")
+
+    def _load_model_cache(self, path: str) -> bool:
+        """Load the simplified data model from a cache file
+
+        Args:
+            path: The cache file path
+
+        Returns:
+            `True` if the data model was loaded, `False` if there is no valid cache file
+        """
+        if not os.path.isfile(path):
+            return False
+        reason = _untrusted_file_reason(path)
+        if reason is not None:
+            logger.warning(f"Ignoring data model cache {path}, rebuilding it: {reason}")
+            return False
+        try:
+            with open(path, "rb") as f:
+                state = _ModelCacheUnpickler(f, self).load()
+        except Exception as e:
+            logger.warning(f"Cannot load data model cache {path}, rebuilding it: {e}")
+            return False
+        for key in _MODEL_CACHE_ATTRIBUTES:
+            setattr(self, key, state[key])
+        # options which do not change the simplified data model are taken from this data model
+        for tb in self.tables.values():
+            tb.db_schema = self.db_schema
+            tb.temp_prefix = self.temp_prefix
+        logger.info(f"Data model loaded from cache {path}")
+        return True
+
+    def _save_model_cache(self, path: str) -> None:
+        """Save the simplified data model to a cache file
+
+        Args:
+            path: The cache file path (the file is replaced atomically)
+        """
+        state = {key: getattr(self, key) for key in _MODEL_CACHE_ATTRIBUTES}
+        tmp_path = f"{path}.{uuid4().hex[:8]}.tmp"
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                _ModelCachePickler(f, self).dump(state)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError) as e:
+            logger.warning(f"Data model cannot be cached: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _build_conversion_plans(self):
+        """Precompute transformations applied to document tree nodes of each type when parsing XML.
+
+        For each node type, the plan is a tuple of `(elevations, is_choice, converters)`, where `elevations` maps
+        fields to elevate to the prefix of their elevated fields, `is_choice` tells whether the node is transformed
+        into a `type`/`value` pair, and `converters` is a tuple of `(content_key, converter)` applied to convert
+        values to python types.
+        """
+        elevations = {}
+        for (node_type, key), (_, transform) in self.fields_transforms.items():
+            if transform == "elevate" or transform == "elevate_wo_prefix":
+                elevations.setdefault(node_type, {})[key] = (
+                    f"{key}_" if transform == "elevate" else ""
+                )
+        self.conversion_plans = {
+            node_type: (
+                elevations.get(node_type, {}),
+                self.types_transforms.get(node_type) == "choice",
+                (
+                    self.tables[node_type].compute_conversion_plan()
+                    if node_type in self.tables
+                    else ()
+                ),
+            )
+            for node_type in set(elevations)
+            | set(self.types_transforms)
+            | set(self.tables)
+        }
 
     def _parse_tree(self, parent_node: xmlschema.XsdElement, nodes_path: list = None):
         """Parse a node of an XML schema recursively and create a target data model without any simplification
@@ -629,6 +1017,70 @@ class DataModel:
             )
         return "\n".join(out)
 
+    def get_merge_plan(self, single_transaction: bool = True) -> list:
+        """Get the statements used to merge temporary tables into target tables.
+
+        The plan is built once and cached, so that merge statements are not rebuilt for each document. Statements are
+        also compiled once for this data model's engine, using a dedicated compiled cache (see
+        [`merge_compiled_cache`][xml2db.model.DataModel.merge_compiled_cache]).
+
+        Args:
+            single_transaction: If `True`, all statements belong to a single transaction group. Else, statements are
+                grouped by `transaction_groups`, the minimum scope required to ensure database consistency.
+
+        Returns:
+            A list of transaction groups, each of them being a list of `(table, statements)` tuples, in execution
+            order
+        """
+        if single_transaction not in self._merge_plans:
+            # merge statements of each table, shared by both plans
+            if self._merge_statements is None:
+                self._merge_statements = {
+                    tb.type_name: list(tb.get_merge_temp_records_statements())
+                    for tb in self.fk_ordered_tables
+                }
+            statements = self._merge_statements
+            self._merge_plans[single_transaction] = [
+                [(tb, statements[tb.type_name]) for tb in tables]
+                for tables in (
+                    [list(self.fk_ordered_tables)]
+                    if single_transaction
+                    else self.transaction_groups
+                )
+            ]
+        return self._merge_plans[single_transaction]
+
+    @property
+    def merge_compiled_cache(self) -> dict:
+        """The SQLAlchemy compiled cache used to execute merge statements, which holds the compiled form of each
+        statement of the merge plan (it is not shared with the engine's LRU cache, so that merge statements of large
+        models are never evicted)"""
+        return self._merge_compiled_cache
+
+    def dump_merge_plan(
+        self, single_transaction: bool = True, sa_dialect: object = None
+    ) -> str:
+        """Get a SQL text representation of the merge plan, for inspection.
+
+        Args:
+            single_transaction: See [`get_merge_plan`][xml2db.model.DataModel.get_merge_plan]
+            sa_dialect: SQLAlchemy dialect instance used to compile statements. Defaults to this data model's engine
+                dialect, if any, or to the SQLAlchemy default dialect.
+
+        Returns:
+            SQL statements, with comments giving the transaction group and the table they relate to
+        """
+        if sa_dialect is None and self.engine is not None:
+            sa_dialect = self.engine.dialect
+        out = []
+        for i, tables in enumerate(self.get_merge_plan(single_transaction)):
+            out.append(f"-- transaction {i + 1}")
+            for tb, statements in tables:
+                out.append(f"-- table {tb.name}")
+                for statement in statements:
+                    out.append(f"{str(statement.compile(dialect=sa_dialect)).strip()};")
+        return "\n".join(out)
+
     def get_all_create_table_statements(
         self, temp: bool = False
     ) -> Iterable[CreateTable]:
@@ -677,6 +1129,102 @@ class DataModel:
         """
         for tb in self.fk_ordered_tables_reversed:
             tb.drop_tables(self.engine)
+        if self.hash_cache is not None:
+            self.hash_cache.clear()
+        for table_name in self.bloom_filters:
+            path = self._bloom_filter_path(table_name)
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+        self.bloom_filters = {}
+
+    def _bloom_filter_path(self, table_name: str) -> Union[str, None]:
+        """Get the file path of the Bloom filter of a table, if they are saved"""
+        if self.bloom_filter_dir is None:
+            return None
+        prefix = f"{self.data_flow_name}_{self.db_schema}" if self.db_schema else self.data_flow_name
+        return os.path.join(self.bloom_filter_dir, f"{prefix}_{table_name}.bloom")
+
+    def refresh_bloom_filters(self) -> None:
+        """Build or catch up Bloom filters of reused tables with the records of target tables
+
+        Filters are read from `bloom_filter_dir` if possible, else built by reading all record hashes of target
+        tables. They are then caught up by reading records with a primary key higher than the last one added, which
+        assumes that the data model is the only writer of target tables. A filter is rebuilt if its table was
+        emptied or recreated, or with twice its capacity if it holds more hashes than its capacity.
+
+        You do not have to call this method explicitly when loading documents, it is called before staging records
+        of each document.
+        """
+        if self.bloom_filter_capacity == 0:
+            return
+        self.create_all_tables()
+        hash_col_name = self.model_config["record_hash_column_name"]
+        if self.bloom_filter_dir is not None:
+            os.makedirs(self.bloom_filter_dir, exist_ok=True)
+        with self.engine.connect() as conn:
+            for tb in self.fk_ordered_tables:
+                if not tb.is_reused:
+                    continue
+                pk_col = getattr(tb.table.c, f"pk_{tb.name}")
+                path = self._bloom_filter_path(tb.name)
+                bloom_filter = self.bloom_filters.get(tb.name)
+                if bloom_filter is None and path is not None and os.path.exists(path):
+                    bloom_filter = BloomFilter.load(path)
+                    # the table may have been emptied or recreated since the filter was saved
+                    max_pk = conn.execute(select(func.max(pk_col))).scalar() or 0
+                    if max_pk < bloom_filter.max_pk:
+                        bloom_filter = None
+                if bloom_filter is None or bloom_filter.count > bloom_filter.capacity:
+                    capacity = (
+                        self.bloom_filter_capacity
+                        if bloom_filter is None
+                        else 2 * bloom_filter.capacity
+                    )
+                    logger.info(f"Building Bloom filter of table {tb.name}")
+                    bloom_filter = BloomFilter(capacity)
+                previous_count = bloom_filter.count
+                bloom_filter.update(
+                    conn.execute(
+                        select(getattr(tb.table.c, hash_col_name), pk_col).where(
+                            pk_col > bloom_filter.max_pk
+                        )
+                    )
+                )
+                self.bloom_filters[tb.name] = bloom_filter
+                if path is not None and bloom_filter.count > previous_count:
+                    bloom_filter.save(path)
+
+    def warm_hash_cache(self, tables: list = None) -> int:
+        """Fill the hash cache with record hashes and primary keys read from reused target tables
+
+        The most recently inserted records of each table (the ones with the highest primary keys) are read, up to the
+        cache size. If the cache is too small to hold all of them, records of the last tables read are kept.
+
+        Args:
+            tables: Names of the tables to read (all reused tables by default)
+
+        Returns:
+            The number of entries read from the database
+        """
+        if self.hash_cache is None:
+            raise ValueError("The hash cache is disabled, set hash_cache_size to enable it")
+        hash_col_name = self.model_config["record_hash_column_name"]
+        count = 0
+        with self.engine.connect() as conn:
+            for tb in self.fk_ordered_tables:
+                if not tb.is_reused or (tables is not None and tb.name not in tables):
+                    continue
+                pk_col = getattr(tb.table.c, f"pk_{tb.name}")
+                rows = conn.execute(
+                    select(getattr(tb.table.c, hash_col_name), pk_col)
+                    .order_by(pk_col.desc())
+                    .limit(self.hash_cache.max_size)
+                ).all()
+                # oldest first, so that the most recent records are the most recently used
+                self.hash_cache.update(tb.name, reversed(rows))
+                count += len(rows)
+        logger.info(f"Read {count} record hashes into the hash cache")
+        return count
 
     def drop_all_temp_tables(self):
         """Drop the data model temporary (prefixed) tables.
@@ -686,6 +1234,61 @@ class DataModel:
         """
         for tb in self.fk_ordered_tables_reversed:
             tb.drop_temp_tables(self.engine)
+        self._temp_tables_created = False
+        self._temp_tables_dirty = False
+
+    def prepare_temp_tables(self) -> None:
+        """Get temporary tables ready to receive the data of a new document.
+
+        Temporary tables are dropped and recreated, unless `persistent_temp_tables` is set, in which case they are
+        only created the first time and emptied afterwards if needed.
+
+        You do not have to call this method explicitly when using
+            [`Document.insert_into_target_tables()`](document.md#xml2db.document.Document.insert_into_target_tables).
+        """
+        if self.persistent_temp_tables and self._temp_tables_created:
+            if self._temp_tables_dirty:
+                self.truncate_all_temp_tables()
+        else:
+            self.drop_all_temp_tables()
+            self.create_all_tables(temp=True)
+            self._temp_tables_created = self.persistent_temp_tables
+        self._temp_tables_dirty = True
+
+    def cleanup_temp_tables(self) -> None:
+        """Clean up temporary tables after loading a document: empty them if `persistent_temp_tables` is set, else
+        drop them.
+
+        You do not have to call this method explicitly when using
+            [`Document.insert_into_target_tables()`](document.md#xml2db.document.Document.insert_into_target_tables).
+        """
+        if self.persistent_temp_tables and self._temp_tables_created:
+            self.truncate_all_temp_tables()
+        else:
+            self.drop_all_temp_tables()
+
+    def truncate_all_temp_tables(self) -> None:
+        """Remove all rows from the data model temporary (prefixed) tables."""
+        tables = []
+        for tb in self.fk_ordered_tables_reversed:
+            for rel in tb.relations_n.values():
+                if rel.temp_rel_table is not None:
+                    tables.append(rel.temp_rel_table)
+            tables.append(tb.temp_table)
+        with self.engine.begin() as conn:
+            self.dialect.truncate_tables(conn, tables)
+        self._temp_tables_dirty = False
+
+    def close(self) -> None:
+        """Drop persistent temporary tables, if any were created."""
+        if self._temp_tables_created:
+            self.drop_all_temp_tables()
+
+    def __enter__(self) -> "DataModel":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def parse_xml(
         self,
@@ -695,6 +1298,7 @@ class DataModel:
         iterparse: bool = True,
         recover: bool = False,
         flat_data: dict = None,
+        columnar: bool = False,
     ) -> Document:
         """Parse an XML document based on this data model
 
@@ -711,11 +1315,14 @@ class DataModel:
                 from this XML file are appended to it rather than starting fresh, allowing multiple files to be
                 accumulated in memory and inserted together with a single
                 [`Document.insert_into_target_tables`][xml2db.document.Document.insert_into_target_tables] call.
+            columnar: Store records by columns rather than as lists of dicts (see
+                [`ColumnarRecords`][xml2db.columnar.ColumnarRecords]), which uses much less memory for large
+                documents. Tables already present in `flat_data` keep their records format.
 
         Returns:
             A parsed [`Document`](document.md) object
         """
-        doc = Document(self)
+        doc = Document(self, columnar=columnar)
         doc.parse_xml(
             xml_file=xml_file,
             metadata=metadata,
@@ -726,6 +1333,183 @@ class DataModel:
         )
         return doc
 
+    def batch_loader(
+        self,
+        max_records: int = 1000000,
+        max_files: int = 1000,
+        single_transaction: bool = True,
+        max_lines: int = -1,
+        bulk_load: bool | None = None,
+        bulk_load_threshold: int | None = None,
+    ) -> BatchLoader:
+        """Get a [`BatchLoader`](document.md#xml2db.document.BatchLoader) to load many XML files in batches
+
+        Each batch is loaded with a single temp tables insertion and merge cycle.
+
+        Args:
+            max_records: The number of records (in all tables) above which the current batch is loaded
+            max_files: The maximum number of files in a batch
+            single_transaction: Should we run all merge queries in a single transaction?
+            max_lines: The maximum number of lines to insert in a single statement when loading data to the
+                temporary tables
+            bulk_load: ``True`` to require bulk loading (raise if unavailable),
+                ``False`` to always use executemany, or ``None`` (default) to
+                use bulk loading when available and fall back silently.
+            bulk_load_threshold: Minimum number of records to trigger bulk
+                loading.  ``None`` delegates the choice to the dialect.
+
+        Returns:
+            A [`BatchLoader`](document.md#xml2db.document.BatchLoader) object
+        """
+        return BatchLoader(
+            self,
+            max_records=max_records,
+            max_files=max_files,
+            single_transaction=single_transaction,
+            max_lines=max_lines,
+            bulk_load=bulk_load,
+            bulk_load_threshold=bulk_load_threshold,
+        )
+
+    def import_files(
+        self,
+        xml_files: Iterable[str],
+        metadata: Union[dict, Callable[[str], dict]] = None,
+        workers: int = None,
+        skip_validation: bool = True,
+        recover: bool = False,
+        single_transaction: bool = True,
+        max_lines: int = -1,
+        bulk_load: bool | None = None,
+        bulk_load_threshold: int | None = None,
+        mp_context: str = None,
+    ) -> dict[str, LoadStats]:
+        """Parse XML files in parallel worker processes and load them into the database
+
+        XML files are parsed and converted to flat data by a pool of worker processes, each of them building its own
+        copy of the data model once. Flat data is sent back to the current process, which loads files one at a time
+        with [`Document.insert_into_target_tables`][xml2db.document.Document.insert_into_target_tables], using this
+        data model's connection. Files are loaded in the order they are provided.
+
+        Worker processes are given the arguments used to build this data model, so `model_config` must be picklable
+        (e.g. hook functions must be defined at module level).
+
+        Args:
+            xml_files: Paths of the XML files to load
+            metadata: A dict of metadata values to add to the root table of each file, or a function which returns
+                such a dict given a file path
+            workers: The number of worker processes (defaults to the number of CPUs). If 1, files are parsed in the
+                current process.
+            skip_validation: Should we validate the documents against the schema first?
+            recover: Should we try to parse incorrect XML? (argument passed to lxml parser)
+            single_transaction: Should we run all merge queries in a single transaction?
+            max_lines: The maximum number of lines to insert in a single statement when loading data to the temporary
+                tables
+            bulk_load: ``True`` to require bulk loading (raise if unavailable),
+                ``False`` to always use executemany, or ``None`` (default) to
+                use bulk loading when available and fall back silently.
+            bulk_load_threshold: Minimum number of records to trigger bulk
+                loading.  ``None`` delegates the choice to the dialect.
+            mp_context: The multiprocessing start method to use (`"spawn"`, `"fork"`...), defaults to the platform
+                default
+
+        Returns:
+            A dict of [`LoadStats`][xml2db.document.LoadStats] keyed by file path
+
+        Raises:
+            ValueError: If a file path is provided more than once
+        """
+        xml_files = list(xml_files)
+        seen, duplicates = set(), []
+        for xml_file in xml_files:
+            if xml_file in seen:
+                duplicates.append(xml_file)
+            seen.add(xml_file)
+        if duplicates:
+            raise ValueError(
+                f"Files cannot be imported more than once in a single call: {', '.join(duplicates)}"
+            )
+        workers = os.cpu_count() if workers is None else workers
+
+        def get_metadata(xml_file):
+            return metadata(xml_file) if callable(metadata) else metadata
+
+        def load(xml_file, flat_data):
+            doc = Document(self)
+            doc.xml_file_path = xml_file[:255]
+            doc.data = flat_data
+            logger.debug(doc.__repr__())
+            return doc.insert_into_target_tables(
+                single_transaction=single_transaction,
+                max_lines=max_lines,
+                bulk_load=bulk_load,
+                bulk_load_threshold=bulk_load_threshold,
+            )
+
+        stats = {}
+        if workers <= 1 or len(xml_files) <= 1:
+            for xml_file in xml_files:
+                doc = self.parse_xml(
+                    xml_file,
+                    metadata=get_metadata(xml_file),
+                    skip_validation=skip_validation,
+                    recover=recover,
+                )
+                stats[xml_file] = load(xml_file, doc.data)
+            return stats
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_import_worker,
+            initargs=(self._worker_model_kwargs,),
+        ) as executor:
+            # keep a bounded number of files in flight, so that parsed data does not pile up in memory if loading
+            # is slower than parsing
+            pending = deque()
+            files_iter = iter(xml_files)
+            for xml_file in files_iter:
+                pending.append(
+                    (
+                        xml_file,
+                        executor.submit(
+                            _parse_file_worker,
+                            xml_file,
+                            get_metadata(xml_file),
+                            skip_validation,
+                            recover,
+                        ),
+                    )
+                )
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                xml_file, future = pending.popleft()
+                try:
+                    flat_data = future.result()
+                    next_file = next(files_iter, None)
+                    if next_file is not None:
+                        pending.append(
+                            (
+                                next_file,
+                                executor.submit(
+                                    _parse_file_worker,
+                                    next_file,
+                                    get_metadata(next_file),
+                                    skip_validation,
+                                    recover,
+                                ),
+                            )
+                        )
+                    logger.info(f"Loading {xml_file}")
+                    stats[xml_file] = load(xml_file, flat_data)
+                except Exception:
+                    # do not wait for files which will not be loaded
+                    for _, other_future in pending:
+                        other_future.cancel()
+                    raise
+        return stats
+
     def extract_from_database(
         self,
         root_select_where: str,
@@ -738,8 +1522,10 @@ class DataModel:
             data model. Typically, a single XML file will correspond to a single row in the root table. This function
             will query the data tree below this record.
 
-        This method was not optimized for performance and can be quite slow. It is used in integration tests to check
-            the output against the data inserted into the database.
+        Data is extracted set-based, with a fixed number of queries for the whole data model, whatever the number of
+            records selected: primary keys of the records reachable from the selected root records are first written
+            to key tables (dropped afterwards), which are then used to filter each table. It requires the database user
+            to be able to create tables, like loading data does.
 
         Args:
             root_select_where: A where clause to filter the root table of the model, as a string
@@ -751,3 +1537,50 @@ class DataModel:
         doc = Document(self)
         doc.extract_from_database(self.root_table, root_select_where, force_tz=force_tz)
         return doc
+
+    def iter_documents_from_database(
+        self,
+        root_select_where: str,
+        batch_size: int = 1000,
+        force_tz: Union[str, None] = None,
+    ) -> Iterable[Document]:
+        """Extract documents from the database, one for each record of the root table selected by a where clause.
+
+        Root records are extracted by batches of `batch_size`, with the same set-based queries as
+            [`extract_from_database`][xml2db.model.DataModel.extract_from_database] for each batch, so that exporting
+            many documents takes a single pass over the database for each batch instead of one extraction for each
+            document. Documents are yielded in the order of root table primary keys, and can be converted back to XML
+            with [`Document.to_xml`](document.md#xml2db.document.Document.to_xml).
+
+        Args:
+            root_select_where: A where clause to filter the root table of the model, as a string
+            batch_size: The maximum number of root records extracted at once
+            force_tz: Apply this timezone if database returns timezone-naïve datetime
+
+        Yields:
+            A [`Document`](document.md) object for each selected root record
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(
+                f"batch_size must be a positive integer, got {batch_size!r}"
+            )
+        root_tb = self.tables[self.root_table]
+        root_pk = getattr(root_tb.table.c, f"pk_{root_tb.name}")
+        with self.engine.connect() as conn:
+            root_pks = (
+                conn.execute(
+                    select(root_pk)
+                    .where(sqlalchemy.text(root_select_where))
+                    .order_by(root_pk)
+                )
+                .scalars()
+                .all()
+            )
+        for i in range(0, len(root_pks), batch_size):
+            doc = Document(self)
+            doc._extract_flat_data(
+                self.root_table,
+                root_pk.in_(root_pks[i : i + batch_size]),
+                force_tz=force_tz,
+            )
+            yield from doc.split_by_root()
@@ -1,9 +1,11 @@
 import logging
-from typing import List, Iterable, Any, Union, TYPE_CHECKING
+from functools import cached_property
+from typing import Any, Callable, Iterable, List, Union, TYPE_CHECKING
 
-from sqlalchemy import Column
+from sqlalchemy import Column, Date
 
 from ..config import resolve_sa_type
+from ..xml_converter import parse_date, parse_datetime
 
 if TYPE_CHECKING:
     from ..model import DataModel
@@ -11,6 +13,27 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _parse_boolean(value: str) -> bool:
+    return value == "true" or value == "1"
+
+
+# functions used to convert XML values of simple types to python types, by XSD data type
+_PYTHON_CONVERTERS = {
+    "decimal": float,
+    "float": float,
+    "integer": int,
+    "int": int,
+    "nonPositiveInteger": int,
+    "nonNegativeInteger": int,
+    "positiveInteger": int,
+    "negativeInteger": int,
+    "short": int,
+    "byte": int,
+    "long": int,
+    "boolean": _parse_boolean,
+}
+
+
 class DataModelColumn:
     """A class representing a column of a table
 
@@ -68,6 +91,41 @@ class DataModelColumn:
         self.data_model = data_model
         self.other_table = None  # just to avoid a linting warning
 
+    @property
+    def content_key(self) -> str:
+        """The key used to store this column's values in document tree nodes content"""
+        if self.is_attr:
+            return f"{self.name[:-5]}__attr" if self.has_suffix else f"{self.name}__attr"
+        return self.name
+
+    @property
+    def python_converter(self) -> Union[Callable[[str], Any], None]:
+        """The function used to convert XML values of this column to python values, or `None` if they are kept as
+        strings"""
+        return _PYTHON_CONVERTERS.get(self.data_type)
+
+    @cached_property
+    def datetime_parser(self) -> Union[Callable[[str], Any], None]:
+        """The function used to convert XML values of this column to python `datetime` or `date` values when the
+        `parse_datetimes` option is enabled, or `None` if they are kept as strings.
+
+        Single-valued `dateTime` columns are always parsed. Single-valued `date` columns are parsed only if their type
+        is configured as a SQLAlchemy `Date`, as they are stored as strings by default.
+        """
+        if self.occurs[1] != 1:
+            return None
+        if self.data_type == "dateTime":
+            return parse_datetime
+        if self.data_type == "date":
+            raw_type = self.config.get("fields", {}).get(self.name, {}).get("type")
+            if raw_type is not None:
+                column_type = resolve_sa_type(raw_type)
+                if isinstance(column_type, Date) or (
+                    isinstance(column_type, type) and issubclass(column_type, Date)
+                ):
+                    return parse_date
+        return None
+
     @property
     def can_join_values_as_string(self):
         """Decide whether multiple values can be stored as comma separated values in this column
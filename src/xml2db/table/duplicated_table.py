@@ -147,7 +147,7 @@ class DataModelTableDuplicated(DataModelTableTransformed):
         ).where(
             getattr(self.temp_table.c, f"temp_fk_parent_{self.parent.name}")  # noqa
             == getattr(self.parent.temp_table.c, f"temp_pk_{self.parent.name}")
-        )
+        ).execution_options(xml2db_label="update parent foreign key")
 
         # update foreign keys for n-1 relations tables
         for rel in self.relations_1.values():
@@ -163,7 +163,9 @@ class DataModelTableDuplicated(DataModelTableTransformed):
             self.temp_table.c.temp_exists
             == False  # noqa: SQLAlchemy not supporting "is False"
         )
-        yield self.table.insert().from_select(cols, sel)
+        yield self.table.insert().from_select(cols, sel).execution_options(
+            xml2db_label="insert new records"
+        )
 
         # if table is referenced in a fk relationship, update primary keys back in temp table
         if self.referenced_as_fk:
@@ -176,7 +178,7 @@ class DataModelTableDuplicated(DataModelTableTransformed):
                     getattr(self.temp_table.c, f"temp_pk_{self.name}")
                     == getattr(self.table.c, f"temp_pk_{self.name}"),
                 )
-            )
+            ).execution_options(xml2db_label="backfill primary keys")
 
         # update records for n-n relations tables
         for rel in self.relations_n.values():
@@ -91,7 +91,7 @@ class DataModelRelation1(DataModelRelation):
             == getattr(
                 self.other_table.temp_table.c, f"temp_pk_{self.other_table.name}"
             )
-        )
+        ).execution_options(xml2db_label=f"update foreign key {self.field_name}")
 
 
 class DataModelRelationN(DataModelRelation):
@@ -233,6 +233,8 @@ class DataModelRelationN(DataModelRelation):
             ).where(
                 self.table.temp_table.c.temp_exists
                 == False  # noqa: SQLAlchemy not supporting "is False"
+            ).execution_options(
+                xml2db_label=f"update foreign key fk_{self.table.name} of {self.rel_table_name}"
             )
             # update foreign key with other table
             yield rel_tb.update().values(
@@ -248,6 +250,8 @@ class DataModelRelationN(DataModelRelation):
                 == getattr(
                     self.other_table.temp_table.c, f"temp_pk_{self.other_table.name}"
                 )
+            ).execution_options(
+                xml2db_label=f"update foreign key fk_{self.other_table.name} of {self.rel_table_name}"
             )
             # insert new records
             cols = [f"fk_{self.table.name}", f"fk_{self.other_table.name}"]
@@ -257,4 +261,6 @@ class DataModelRelationN(DataModelRelation):
                 getattr(rel_tb.c, f"fk_{self.table.name}")  # noqa
                 != None  # SQLAlchemy not supporting "is not None"
             )
-            yield self.rel_table.insert().from_select(cols, sel)
+            yield self.rel_table.insert().from_select(cols, sel).execution_options(
+                xml2db_label=f"insert new records into {self.rel_table_name}"
+            )
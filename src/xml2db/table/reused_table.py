@@ -133,6 +133,11 @@ class DataModelTableReused(DataModelTableTransformed):
             *get_col(temp=True),
             Column("temp_exists", Boolean, default=False),
         )
+        if self.data_model.bloom_filter_capacity > 0:
+            # records which are definitely not in the target table according to its Bloom filter are flagged False
+            self.temp_table.append_column(
+                Column("temp_maybe_exists", Boolean, default=True)
+            )
 
         # build relation tables
         for rel in self.relations_n.values():
@@ -152,17 +157,34 @@ class DataModelTableReused(DataModelTableTransformed):
         :meth:`~xml2db.document.Document.insert_into_target_tables`, which ensures that merge
         queries are issued in the correct order and wraps them in a transaction so that changes
         are rolled back on failure.
-        """
 
-        # find matching records hash in target table
-        yield self.temp_table.update().values(temp_exists=True).where(
-            getattr(
-                self.temp_table.c,
-                self.data_model.model_config["record_hash_column_name"],
-            )  # noqa: Linter puzzled by ==
-            == getattr(
-                self.table.c, self.data_model.model_config["record_hash_column_name"]
+        Existing records get their primary key along with the `temp_exists` flag in a single lookup of the target
+        table hash index. If the dialect supports `INSERT ... RETURNING` in a CTE (see
+        [`INSERT_RETURNING_CTE`][xml2db.dialect.base.DatabaseDialect], i.e. PostgreSQL), primary keys of new records
+        are returned by the insert statement itself, so that each temp record is looked up only once. Otherwise, new
+        records are looked up a second time after being inserted, to get their primary key back (this lookup being
+        restricted to new records).
+        """
+        hash_col = self.data_model.model_config["record_hash_column_name"]
+        temp_hash = getattr(self.temp_table.c, hash_col)
+        target_hash = getattr(self.table.c, hash_col)
+        pk_col = f"pk_{self.name}"
+
+        # find matching records hash in target table, and get their primary key
+        match_conditions = [
+            temp_hash == target_hash,  # noqa: Linter puzzled by ==
+            # records found in the data model hash cache are staged as already existing
+            self.temp_table.c.temp_exists
+            == False,  # noqa: SQLAlchemy not supporting "is False"
+        ]
+        if self.data_model.bloom_filter_capacity > 0:
+            match_conditions.append(
+                self.temp_table.c.temp_maybe_exists == True  # noqa: SQLAlchemy
             )
+        yield self.temp_table.update().values(
+            **{pk_col: getattr(self.table.c, pk_col), "temp_exists": True}
+        ).where(*match_conditions).execution_options(
+            xml2db_label="match existing records"
         )
 
         # update foreign keys for n-1 relations tables
@@ -173,26 +195,38 @@ class DataModelTableReused(DataModelTableTransformed):
         cols = [
             col_name
             for col_name in self.temp_table.columns.keys()
-            if not col_name.startswith("temp_") and col_name != f"pk_{self.name}"
+            if not col_name.startswith("temp_") and col_name != pk_col
         ]
         sel = select(*[getattr(self.temp_table.c, col) for col in cols]).where(
             self.temp_table.c.temp_exists
             == False  # noqa: SQLAlchemy not supporting "is False"
         )
-        yield self.table.insert().from_select(cols, sel)
-
-        # update primary keys back in temp table
-        yield self.temp_table.update().values(
-            **{f"pk_{self.name}": getattr(self.table.c, f"pk_{self.name}")}
-        ).where(
-            getattr(
-                self.temp_table.c,
-                self.data_model.model_config["record_hash_column_name"],
-            )  # noqa: Linter puzzled by ==
-            == getattr(
-                self.table.c, self.data_model.model_config["record_hash_column_name"]
+        insert = self.table.insert().from_select(cols, sel)
+
+        if self.data_model.dialect.INSERT_RETURNING_CTE:
+            # insert new records and update their primary keys back in temp table in a single statement, joining
+            # the inserted rows rather than the target table; each inserted row updates exactly one temp row
+            inserted = insert.returning(
+                getattr(self.table.c, pk_col), target_hash
+            ).cte(f"inserted_{self.name}")
+            yield self.temp_table.update().values(
+                **{pk_col: getattr(inserted.c, pk_col)}
+            ).where(
+                temp_hash == getattr(inserted.c, hash_col)  # noqa
+            ).execution_options(
+                xml2db_label="insert new records", xml2db_counts_inserted=True
             )
-        )
+        else:
+            yield insert.execution_options(xml2db_label="insert new records")
+
+            # update primary keys of new records back in temp table
+            yield self.temp_table.update().values(
+                **{pk_col: getattr(self.table.c, pk_col)}
+            ).where(
+                temp_hash == target_hash,  # noqa: Linter puzzled by ==
+                self.temp_table.c.temp_exists
+                == False,  # noqa: SQLAlchemy not supporting "is False"
+            ).execution_options(xml2db_label="backfill primary keys")
 
         # update primary keys for n-n relations tables
         for rel in self.relations_n.values():
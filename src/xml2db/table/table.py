@@ -295,6 +295,46 @@ class DataModelTable:
                     relation.other_table.dependencies.add(self.type_name)
                     self.referenced_as_fk = True
 
+    def compute_hash_plan(self) -> tuple:
+        """Compute the steps used to hash a document tree node of this table.
+
+        Consecutive columns are grouped so that their values can be serialized in a single pass, and content keys
+        for attributes are resolved once, so that hashing a node does not need to look at columns' properties. The
+        hash of a node is computed over the concatenation of all steps' output, which yields the same digest as
+        updating the hash object field by field.
+
+        This function should be called after schema simplification, once fields are final.
+
+        Returns:
+            A tuple of `(field_type, key)` steps, where `field_type` is `"cols"` (and `key` a tuple of content keys),
+            `"rel1"` or `"reln"`
+        """
+        steps = []
+        for field_type, name, field in self.fields:
+            if field_type == "col":
+                name = field.content_key
+                if steps and steps[-1][0] == "cols":
+                    steps[-1] = ("cols", steps[-1][1] + (name,))
+                else:
+                    steps.append(("cols", (name,)))
+            else:
+                steps.append((field_type, name))
+        return tuple(steps)
+
+    def compute_conversion_plan(self) -> tuple:
+        """Compute the conversions to python types to apply to document tree nodes of this table.
+
+        This function should be called after schema simplification, once columns are final.
+
+        Returns:
+            A tuple of `(content_key, converter)` tuples, for columns which values are not kept as strings
+        """
+        return tuple(
+            (col.content_key, col.python_converter)
+            for col in self.columns.values()
+            if col.python_converter is not None
+        )
+
     def _set_db_schema(self) -> None:
         """Set db schema value for sqlalchemy tables objects"""
         if (
@@ -358,8 +398,9 @@ class DataModelTable:
         self, data: Union[dict, None]
     ) -> Iterable[Any]:
         """Yield drop table if exists, create table and insert statement for temporary tables"""
-        if data is not None and len(data["records"]) > 0:
-            yield self.temp_table.insert(), data["records"]
+        if data is not None:
+            if len(data["records"]) > 0:
+                yield self.temp_table.insert(), data["records"]
             data_rel = data.get("relations_n", {})
             for relation in self.relations_n.values():
                 if (
@@ -1,7 +1,10 @@
 import typing
-from datetime import datetime
-from typing import Union
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Union
 import logging
+import re
+import time
 from lxml import etree
 from io import BytesIO
 from itertools import zip_longest
@@ -31,6 +34,78 @@ def remove_record_hash(node) -> tuple:
     return node_type, content
 
 
+_DATETIME_RE = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:\d{2})?$"
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_timezone(tz: str) -> timezone:
+    if tz == "Z":
+        return timezone.utc
+    offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[4:6]))
+    return timezone(-offset if tz[0] == "-" else offset)
+
+
+@lru_cache(maxsize=65536)
+def parse_datetime(value: str) -> Union[datetime, str]:
+    """Parse a XSD `dateTime` value into a python `datetime`.
+
+    Results are cached, as the same timestamps are often repeated many times within a document. Fractional seconds
+    are truncated to microseconds.
+
+    Args:
+        value: a XSD `dateTime` string, e.g. `2024-01-01T00:00:00Z`
+
+    Returns:
+        A `datetime` object (time zone aware if the value has a time zone), or the value unchanged if it cannot be
+        represented as a python `datetime` (e.g. `24:00:00` time or negative years), in which case conversion is left
+        to the database.
+    """
+    m = _DATETIME_RE.match(value.strip())
+    if m is None:
+        return value
+    year, month, day, hour, minute, second, fraction, tz = m.groups()
+    try:
+        return datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour),
+            int(minute),
+            int(second),
+            int(fraction[:6].ljust(6, "0")) if fraction else 0,
+            _parse_timezone(tz) if tz else None,
+        )
+    except ValueError:
+        return value
+
+
+_DATE_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+
+
+@lru_cache(maxsize=65536)
+def parse_date(value: str) -> Union[date, str]:
+    """Parse a XSD `date` value into a python `date`.
+
+    Results are cached, as the same dates are often repeated many times within a document.
+
+    Args:
+        value: a XSD `date` string, e.g. `2024-01-01`
+
+    Returns:
+        A `date` object, or the value unchanged if it has a time zone (which a python `date` cannot hold) or cannot
+        be represented as a python `date`, in which case conversion is left to the database.
+    """
+    m = _DATE_RE.match(value.strip())
+    if m is None:
+        return value
+    try:
+        return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return value
+
+
 class XMLConverter:
     def __init__(self, data_model: "DataModel", document_tree: dict = None):
         """A class to convert data from document tree format (nested dict) to and from XML.
@@ -41,6 +116,13 @@ class XMLConverter:
         """
         self.model = data_model
         self.document_tree = document_tree
+        # timings of the last call to parse_xml, in seconds (parsing excludes validation, hashing and time spent in
+        # chunk_callback)
+        self.duration_validate = 0.0
+        self.duration_parse = 0.0
+        self.duration_hash = None
+        self._duration_callback = 0.0
+        self._time_hashing = False
 
     def parse_xml(
         self,
@@ -49,6 +131,9 @@ class XMLConverter:
         skip_validation: bool = True,
         recover: bool = False,
         iterparse: bool = True,
+        chunk_callback: Callable[[str, str, tuple, dict], None] = None,
+        time_hashing: bool = False,
+        chunk_element: str = None,
     ) -> tuple:
         """Parse an XML document into a nested dict and performs the simplifications defined in the
         DataModel object ("pull" child to upper level, transform a choice model into "type" and "value"
@@ -61,10 +146,37 @@ class XMLConverter:
                 (default ``True``; set to ``False`` to validate)
             recover: Try to process malformed XML (lxml option)
             iterparse: Parse XML using iterative parsing, which is a bit slower but uses less memory
+            chunk_callback: If provided, enables streaming mode (requires `iterparse`): each completed node to stream
+                (see `chunk_element`) is passed to this function as `(parent_type, key, node, parent_content)` as soon
+                as it has been parsed, where `key` is the n-n relationship of `parent_type` it belongs to and
+                `parent_content` is the content dict of the (not yet completed) parent node. Only a stub
+                `(node_type, None, hash)` is kept in the returned document tree.
+            chunk_element: In streaming mode, the element name or the table type name of the nodes to stream. They
+                are streamed at any depth, as long as they are n-n children of a table, possibly through wrapper
+                elements which are elevated into it. By default, n-n children of the root table are streamed.
+            time_hashing: Measure time spent hashing nodes separately in `duration_hash`, which adds some overhead
+                for each node. Otherwise, hashing is included in `duration_parse` and `duration_hash` is `None`.
 
         Returns:
             The parsed data in the document tree format (nested dict)
         """
+        if chunk_callback is not None and not iterparse:
+            raise ValueError("Streaming XML parsing requires iterparse")
+
+        t_start = time.perf_counter()
+        self.duration_validate = 0.0
+        self.duration_hash = 0.0 if time_hashing else None
+        self._duration_callback = 0.0
+        self._time_hashing = time_hashing
+        if chunk_callback is not None:
+            callback = chunk_callback
+
+            def chunk_callback(
+                parent_type: str, key: str, node: tuple, parent_content: dict
+            ) -> None:
+                t0 = time.perf_counter()
+                callback(parent_type, key, node, parent_content)
+                self._duration_callback += time.perf_counter() - t0
 
         xt = None
         if not iterparse or (not skip_validation and recover):
@@ -75,18 +187,29 @@ class XMLConverter:
             logger.info("Skipping XML file validation")
         else:
             logger.info("Validating XML file against the schema")
+            t0 = time.perf_counter()
             if not self.model.lxml_schema.validate(xt if xt else etree.parse(xml_file)):
                 logger.error(f"XML file {file_path} does not conform with the schema")
                 raise ValueError(
                     f"XML file {file_path} does not conform with the schema"
                 )
+            self.duration_validate = time.perf_counter() - t0
             logger.info("XML file conforms with the schema")
 
         if iterparse:
-            self.document_tree = self._parse_iterative(xml_file, recover)
+            self.document_tree = self._parse_iterative(
+                xml_file, recover, chunk_callback, chunk_element
+            )
         else:
             self.document_tree = self._parse_element_tree(xt)
 
+        self.duration_parse = (
+            time.perf_counter()
+            - t_start
+            - self.duration_validate
+            - (self.duration_hash or 0.0)
+            - self._duration_callback
+        )
         return self.document_tree
 
     def _parse_element_tree(self, xt: etree.ElementTree) -> tuple:
@@ -168,16 +291,27 @@ class XMLConverter:
         return node
 
     def _parse_iterative(
-        self, xml_file: Union[str, BytesIO], recover: bool = False
+        self,
+        xml_file: Union[str, BytesIO],
+        recover: bool = False,
+        chunk_callback: Callable[[str, str, tuple, dict], None] = None,
+        chunk_element: str = None,
     ) -> tuple:
         """Parse an XML file into a document tree (nested dict) in an iterative fashion.
 
         This method uses etree.iterparse and does not load the entire XML document in memory.
         It saves memory, especially if you decide to filter out nodes using 'document_tree_node_hook' hook.
 
+        In streaming mode (i.e. when `chunk_callback` is provided), completed nodes matching `chunk_element` (or
+        n-n children of the root table by default) are handed over to `chunk_callback` and released right away, so
+        that the document tree never holds more than one of these nodes at once. They are replaced in their parent
+        node by a stub `(node_type, None, hash)`, which is enough to compute the hash of their ancestors.
+
         Args:
             xml_file: an XML file to parse
             recover: should we try to parse incorrect XML?
+            chunk_callback: a function called with `(parent_type, key, node, parent_content)` for each streamed node
+            chunk_element: the element name or table type name of nodes to stream
 
         Returns:
             A tuple of node_type, content (dict), hash
@@ -192,6 +326,8 @@ class XMLConverter:
                 {},
             )
         ]
+        # element names and transforms of nodes in nodes_stack, used to find the table streamed nodes belong to
+        keys_stack = [(None, None)]
         hash_maps = {}
 
         joined_values = False
@@ -228,6 +364,7 @@ class XMLConverter:
                                 attrib_val.strip() if attrib_val.strip() else attrib_val
                             ]
                     nodes_stack.append((node_type, content))
+                    keys_stack.append((key, transform))
 
             elif event == "end" and skipped_nodes > 0:
                 skipped_nodes -= 1
@@ -250,6 +387,7 @@ class XMLConverter:
                 # else, we have completed a complex type node
                 else:
                     node = nodes_stack.pop()
+                    keys_stack.pop()
                     if nodes_stack[-1][0]:
                         node_type_key = (nodes_stack[-1][0], key)
                         node_type, transform = self.model.fields_transforms[
@@ -262,6 +400,30 @@ class XMLConverter:
                     node = self._transform_node(*node)
                     if transform not in ["elevate", "elevate_wo_prefix"]:
                         node = self._compute_hash_deduplicate(node, hash_maps)
+                    chunk_parent = (
+                        self._find_chunk_parent(nodes_stack, keys_stack, key)
+                        if node
+                        and chunk_callback is not None
+                        and (
+                            chunk_element is None
+                            or key == chunk_element
+                            or node[0] == chunk_element
+                        )
+                        else None
+                    )
+                    if chunk_parent is not None and (
+                        chunk_element is not None or chunk_parent[0] == 1
+                    ):
+                        _, parent_type, rel_key = chunk_parent
+                        chunk_callback(
+                            parent_type, rel_key, node, nodes_stack[chunk_parent[0]][1]
+                        )
+                        node = (node[0], None, node[2])
+                        # streamed nodes are not referenced anymore, release them as well as parsed elements
+                        hash_maps.clear()
+                        element.clear(keep_tail=True)
+                        while element.getprevious() is not None:
+                            del element.getparent()[0]
                     if node:
                         if key in nodes_stack[-1][1]:
                             nodes_stack[-1][1][key].append(node)
@@ -277,6 +439,36 @@ class XMLConverter:
         for k, v in nodes_stack[0][1].items():
             return v[0]
 
+    def _find_chunk_parent(
+        self, nodes_stack: list, keys_stack: list, key: str
+    ) -> Union[tuple, None]:
+        """Find the table node a completed node is a n-n child of, looking through wrapper elements which will be
+        elevated into it
+
+        Args:
+            nodes_stack: The stack of nodes being parsed, parents of the completed node
+            keys_stack: The element names and transforms of nodes in `nodes_stack`
+            key: The element name of the completed node
+
+        Returns:
+            A tuple `(index, parent_type, rel_key)` with the index of the parent node in `nodes_stack`, its type and
+            the name of its n-n relationship the node belongs to, or `None` if the node is not a n-n child of a table
+        """
+        index = len(nodes_stack) - 1
+        rel_key = key
+        while index > 0 and keys_stack[index][1] in ["elevate", "elevate_wo_prefix"]:
+            wrapper_key, transform = keys_stack[index]
+            if transform == "elevate":
+                rel_key = f"{wrapper_key}_{rel_key}"
+            index -= 1
+        parent_type = nodes_stack[index][0]
+        if (
+            parent_type in self.model.tables
+            and rel_key in self.model.tables[parent_type].relations_n
+        ):
+            return index, parent_type, rel_key
+        return None
+
     def _transform_node(self, node_type: str, content: dict) -> tuple:
         """Apply transformations to a given node
 
@@ -287,54 +479,25 @@ class XMLConverter:
         Returns:
             A tuple of (node_type, content) for the transformed node
         """
-        for key in list(content.keys()):
-            node_type_key = (node_type, key)
-            if node_type_key in self.model.fields_transforms:
-                transform = self.model.fields_transforms[node_type_key][1]
-                if transform == "elevate" or transform == "elevate_wo_prefix":
-                    prefix = f"{key}_" if transform == "elevate" else ""
-                    child_content = content[key][0][1]
-                    del content[key]
-                    for child_key, val in child_content.items():
-                        content[f"{prefix}{child_key}"] = val
-
-        if node_type in self.model.types_transforms:
-            if self.model.types_transforms[node_type] == "choice":
-                child_key, val = list(content.items())[0]
-                content = {"type": [child_key], "value": val}
+        if node_type not in self.model.conversion_plans:
+            return node_type, content
+        elevations, is_choice, converters = self.model.conversion_plans[node_type]
+
+        if elevations:
+            for key in [key for key in content if key in elevations]:
+                prefix = elevations[key]
+                child_content = content.pop(key)[0][1]
+                for child_key, val in child_content.items():
+                    content[f"{prefix}{child_key}"] = val
+
+        if is_choice:
+            child_key, val = next(iter(content.items()))
+            content = {"type": [child_key], "value": val}
 
         # convert some simple types to python types
-        if node_type in self.model.tables:
-            table = self.model.tables[node_type]
-            for key in table.columns:
-                content_key = (
-                    (
-                        f"{key[:-5]}__attr"
-                        if table.columns[key].has_suffix
-                        else f"{key}__attr"
-                    )
-                    if table.columns[key].is_attr
-                    else key
-                )
-                if content_key in content:
-                    if table.columns[key].data_type in ["decimal", "float"]:
-                        content[content_key] = [float(v) for v in content[content_key]]
-                    elif table.columns[key].data_type in [
-                        "integer",
-                        "int",
-                        "nonPositiveInteger",
-                        "nonNegativeInteger",
-                        "positiveInteger",
-                        "negativeInteger",
-                        "short",
-                        "byte",
-                        "long",
-                    ]:
-                        content[content_key] = [int(v) for v in content[content_key]]
-                    elif table.columns[key].data_type == "boolean":
-                        content[content_key] = [
-                            v == "true" or v == "1" for v in content[content_key]
-                        ]
+        for content_key, converter in converters:
+            if content_key in content:
+                content[content_key] = [converter(v) for v in content[content_key]]
 
         return node_type, content
 
@@ -342,6 +505,8 @@ class XMLConverter:
         """
         A function to compute hash for a document tree node and deduplicate its content
 
+        Time spent is added to `duration_hash` if hashing is timed (see the `time_hashing` argument of `parse_xml`).
+
         Args:
             node: A tuple of (node_type, content) representing a node
             hash_maps: A dict of dicts storing reference to deduplicated nodes keyed by their type and hash value
@@ -349,35 +514,33 @@ class XMLConverter:
         Returns:
             A tuple of (node_type, content, hash) representing a node after deduplication
         """
+        if not self._time_hashing:
+            return self._hash_deduplicate(node, hash_maps)
+        t0 = time.perf_counter()
+        node = self._hash_deduplicate(node, hash_maps)
+        self.duration_hash += time.perf_counter() - t0
+        return node
+
+    def _hash_deduplicate(self, node: tuple, hash_maps: dict) -> tuple:
+        """Compute hash for a document tree node and deduplicate it (see `_compute_hash_deduplicate`)"""
         node_type, content = node
         if node_type not in self.model.tables:
             return "", None, b""
-        table = self.model.tables[node_type]
 
-        h = self.model.model_config["record_hash_constructor"]()
-        for field_type, name, field in table.fields:
-            if field_type == "col":
-                if field.is_attr:
-                    h.update(
-                        str(
-                            content.get(
-                                (
-                                    f"{name[:-5]}__attr"
-                                    if field.has_suffix
-                                    else f"{name}__attr"
-                                ),
-                                None,
-                            )
-                        ).encode("utf-8")
-                    )
-                else:
-                    h.update(str(content.get(name, None)).encode("utf-8"))
+        # serialize all fields into a single buffer, following the table's precomputed hash plan; this yields the
+        # same digest as feeding fields one by one to the hash object
+        parts = []
+        for field_type, key in self.model.hash_plans[node_type]:
+            if field_type == "cols":
+                parts.append(
+                    "".join([str(content.get(k, None)) for k in key]).encode("utf-8")
+                )
             elif field_type == "rel1":
-                h.update(content[name][0][2] if name in content else b"")
-            elif field_type == "reln":
-                h_children = [v[2] for v in content.get(name, [])]
-                for h_child in sorted(h_children):
-                    h.update(h_child)
+                parts.append(content[key][0][2] if key in content else b"")
+            else:
+                parts.extend(sorted([v[2] for v in content.get(key, [])]))
+        h = self.model.model_config["record_hash_constructor"]()
+        h.update(b"".join(parts))
         node_hash = h.digest()
 
         if node_type not in hash_maps:
@@ -399,6 +562,9 @@ class XMLConverter:
     ) -> etree.Element:
         """Convert a document tree (nested dict) into an XML file
 
+        To write large XML files without building the whole XML tree in memory, use
+        [`write_xml`][xml2db.xml_converter.XMLConverter.write_xml] instead.
+
         Args:
             out_file: If provided, write output to a file.
             nsmap: An optional namespace mapping.
@@ -430,7 +596,72 @@ class XMLConverter:
                 )
         return doc
 
-    def _make_xml_node(self, node_data, node_name, nsmap: dict = None):
+    def write_xml(self, out_file: str, nsmap: dict = None, indent: str = "  ") -> None:
+        """Write a document tree (nested dict) to an XML file incrementally
+
+        Elements are built and written one subtree of n-n children at a time, so that the whole XML tree is never held
+        in memory. The output is the same as [`to_xml`][xml2db.xml_converter.XMLConverter.to_xml] with `out_file`.
+
+        n-n children in the document tree may also be given as functions returning their document tree, which are
+        called only when the child is written: this is how
+        [`Document.write_xml`][xml2db.document.Document.write_xml] builds the document tree from flat data one n-n
+        child at a time.
+
+        Args:
+            out_file: The path of the file to write.
+            nsmap: An optional namespace mapping.
+            indent: A string used as indent in XML output.
+        """
+        # document trees of n-n children, keyed by their placeholder element
+        lazy_children = {}
+
+        def write_element(xf, element, level):
+            child_tree = lazy_children.pop(element, None)
+            if child_tree is not None:
+                if callable(child_tree):
+                    child_tree = child_tree()
+                element = self._make_xml_node(
+                    child_tree, element.tag, lazy_children=lazy_children
+                )
+            if len(element) == 0:
+                xf.write(element)
+                return
+            # same whitespace as etree.indent
+            child_indent = "\n" + indent * (level + 1)
+            with xf.element(
+                element.tag, dict(element.attrib), nsmap=nsmap if level == 0 else None
+            ):
+                if element.text and element.text.strip():
+                    xf.write(element.text)
+                else:
+                    xf.write(child_indent)
+                for i, child in enumerate(element):
+                    if i > 0:
+                        xf.write(child_indent)
+                    write_element(xf, child, level + 1)
+                xf.write("\n" + indent * level)
+
+        # namespaces are declared when writing the root element only, elements written at once would repeat them
+        doc = self._make_xml_node(
+            self.document_tree,
+            self.model.tables[self.document_tree[0]].name,
+            lazy_children=lazy_children,
+        )
+        if self.model.tables[self.model.root_table].is_virtual_node:
+            child = None
+            for child in doc:
+                break
+            doc = child
+        with open(out_file, "wb") as f:
+            # xmlfile does not write text outside of the root element
+            f.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+            with etree.xmlfile(f, encoding="utf-8") as xf:
+                write_element(xf, doc, 0)
+            f.write(b"\n")
+
+    def _make_xml_node(
+        self, node_data, node_name, nsmap: dict = None, lazy_children: dict = None
+    ):
         def check_transformed_node(node_type, element):
             """Convert "choice" transformed nodes (type/value) to `<type>value</type>` XML nodes"""
             if (
@@ -532,15 +763,25 @@ class XMLConverter:
             elif field_type == "rel1":
                 if rel_name in content:
                     child = self._make_xml_node(
-                        content[rel_name][0], rel.name_chain[-1][0]
+                        content[rel_name][0],
+                        rel.name_chain[-1][0],
+                        lazy_children=lazy_children,
                     )
                     children = [child]
             elif field_type == "reln":
                 if rel_name in content:
-                    children = [
-                        self._make_xml_node(child_tree, rel.name_chain[-1][0])
-                        for child_tree in content[rel_name]
-                    ]
+                    if lazy_children is None:
+                        children = [
+                            self._make_xml_node(child_tree, rel.name_chain[-1][0])
+                            for child_tree in content[rel_name]
+                        ]
+                    else:
+                        # placeholders of children, built when they are written by write_xml
+                        children = []
+                        for child_tree in content[rel_name]:
+                            child = etree.Element(rel.name_chain[-1][0])
+                            lazy_children[child] = child_tree
+                            children.append(child)
             if prev_ngroup and rel.ngroup != prev_ngroup:
                 for ngroup_children in zip_longest(*ngroup_stack):
                     for child in ngroup_children:
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+pa = pytest.importorskip("pyarrow", reason="pyarrow not installed")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from sqlalchemy import Column, Integer, MetaData, String, Table
+
+from xml2db import DataModel
+from xml2db.arrow import records_to_arrow
+from .conftest import models_path
+
+ORDERS_XSD = os.path.join(models_path, "orders", "orders.xsd")
+ORDER1_XML = os.path.join(models_path, "orders", "xml", "order1.xml")
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_to_arrow(columnar):
+    """Test that each table and n-n relationship table is converted, with its temporary keys"""
+    model = DataModel(ORDERS_XSD)
+    doc = model.parse_xml(ORDER1_XML, columnar=columnar)
+    tables = doc.to_arrow()
+
+    for tb in model.fk_ordered_tables:
+        if tb.type_name not in doc.data:
+            continue
+        arrow_table = tables[tb.name]
+        assert arrow_table.num_rows == len(doc.data[tb.type_name]["records"])
+        assert arrow_table.column_names == [col.name for col in tb.temp_table.columns]
+        pk_name = tb.temp_table.columns[f"temp_pk_{tb.name}"].name
+        assert pa.types.is_int32(arrow_table.schema.field(pk_name).type)
+        for rel_name, rel_data in doc.data[tb.type_name].get("relations_n", {}).items():
+            assert tables[rel_name].num_rows == len(rel_data["records"])
+
+    shiporder = tables[model.tables["shipordertype"].name]
+    assert pa.types.is_string(shiporder.schema.field("processed_at").type)
+    assert shiporder.column("xml2db_record_hash").to_pylist() == [
+        r["xml2db_record_hash"] for r in doc.data["shipordertype"]["records"]
+    ]
+
+
+def test_to_arrow_parse_datetimes():
+    model = DataModel(ORDERS_XSD, model_config={"parse_datetimes": True})
+    doc = model.parse_xml(ORDER1_XML)
+    shiporder = doc.to_arrow()[model.tables["shipordertype"].name]
+    assert pa.types.is_timestamp(shiporder.schema.field("processed_at").type)
+
+
+def test_to_parquet(tmp_path):
+    model = DataModel(ORDERS_XSD)
+    doc = model.parse_xml(ORDER1_XML)
+    paths = doc.to_parquet(str(tmp_path / "out"))
+    tables = doc.to_arrow()
+
+    assert paths.keys() == tables.keys()
+    for name, path in paths.items():
+        assert os.path.basename(path) == f"{name}.parquet"
+        assert pq.read_table(path).equals(tables[name])
+
+
+def test_records_to_arrow_columns_strict():
+    """Values which do not fit the Arrow type of their column are converted to strings unless strict"""
+    table = Table(
+        "t",
+        MetaData(),
+        Column("id", Integer),
+        Column("value", Integer),
+        Column("label", String(10)),
+    )
+    records = [{"id": 1, "value": "12"}, {"id": 2, "value": None}]
+    with pytest.raises(pa.ArrowException):
+        records_to_arrow(records, table)
+
+    arrow_table = records_to_arrow(
+        records, table, columns=["value", "id"], strict=False
+    )
+    assert arrow_table.column_names == ["value", "id"]
+    assert pa.types.is_string(arrow_table.schema.field("value").type)
+    assert pa.types.is_int32(arrow_table.schema.field("id").type)
+    assert arrow_table.column("value").to_pylist() == ["12", None]
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from benchmarks import XMLDataGenerator, run_benchmark
+from xml2db import DataModel
+from .conftest import models_path
+
+
+@pytest.mark.parametrize(
+    "xsd_path",
+    [
+        ("orders", "orders.xsd"),
+        ("junit10", "junit-10.xsd"),
+        ("table1", "Table1_V2.xsd"),
+    ],
+)
+def test_generate_xml(tmp_path, xsd_path):
+    """Generated files can be parsed, and their size scales with the size argument"""
+    xsd_file = os.path.join(models_path, *xsd_path)
+    model = DataModel(xsd_file)
+    records = []
+    for size in (5, 20):
+        xml_file = str(tmp_path / f"gen_{size}.xml")
+        XMLDataGenerator(xsd_file, fanout=2, seed=1).write_xml(xml_file, size=size)
+        doc = model.parse_xml(xml_file)
+        records.append(
+            sum(len(data["records"]) for data in doc.data.values())
+        )
+    assert 0 < records[0] < records[1]
+
+
+def test_generate_xml_deterministic():
+    xsd_file = os.path.join(models_path, "orders", "orders.xsd")
+    generator = XMLDataGenerator(xsd_file, seed=3)
+    assert generator.document_tree(10) == generator.document_tree(10)
+
+
+@pytest.mark.parametrize("db", ["duckdb", "sqlite"])
+def test_run_benchmark(tmp_path, db):
+    if db == "duckdb":
+        pytest.importorskip("duckdb")
+    result = run_benchmark(
+        os.path.join(models_path, "orders", "orders.xsd"),
+        db,
+        size=20,
+        directory=str(tmp_path),
+    )
+    assert result.records > 20
+    assert [phase.name for phase in result.phases] == [
+        "parse",
+        "hash",
+        "flatten",
+        "stage",
+        "merge",
+        "cleanup",
+    ]
+    assert all(phase.duration > 0 for phase in result.phases)
+    assert result.to_dict()["phases"][0]["throughput"] > 0
+    assert db in str(result)
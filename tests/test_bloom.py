@@ -0,0 +1,112 @@
+import hashlib
+import os
+
+import pytest
+
+from xml2db import DataModel, Document
+from xml2db.bloom import BloomFilter
+from xml2db.xml_converter import XMLConverter, remove_record_hash
+from .conftest import list_xml_path, models_path
+from .sample_models import models
+
+
+def _hashes(start: int, stop: int, size: int = 20) -> list:
+    return [hashlib.sha1(str(i).encode()).digest()[:size] for i in range(start, stop)]
+
+
+@pytest.mark.parametrize("hash_size", [20, 8])
+def test_bloom_filter(tmp_path, hash_size):
+    """A test for Bloom filter lookups, false positive rate and persistence"""
+    bloom_filter = BloomFilter(1000, error_rate=0.01)
+    bloom_filter.update((h, i) for i, h in enumerate(_hashes(0, 1000, hash_size), 1))
+    assert bloom_filter.count == 1000
+    assert bloom_filter.max_pk == 1000
+
+    # no false negatives, and about 1% false positives
+    assert all(h in bloom_filter for h in _hashes(0, 1000, hash_size))
+    false_positives = sum(h in bloom_filter for h in _hashes(1000, 11000, hash_size))
+    assert false_positives < 300
+
+    path = str(tmp_path / "filter.bloom")
+    bloom_filter.save(path)
+    loaded = BloomFilter.load(path)
+    assert (loaded.capacity, loaded.count, loaded.max_pk) == (1000, 1000, 1000)
+    assert loaded.bits == bloom_filter.bits
+
+    with open(path, "wb") as f:
+        f.write(b"not a filter")
+    with pytest.raises(ValueError):
+        BloomFilter.load(path)
+
+
+def test_bloom_filter_merge_statement():
+    """Records flagged as definitely new by Bloom filters are not looked up by hash"""
+    model = DataModel(
+        str(os.path.join(models_path, "orders", "orders.xsd")),
+        bloom_filter_capacity=1000,
+    )
+    for tb in model.fk_ordered_tables:
+        if tb.is_reused:
+            match = next(tb.get_merge_temp_records_statements())
+            assert "temp_maybe_exists" in str(match)
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_bloom_filter_roundtrip(conn_string, model_config, tmp_path):
+    """A test for roundtrip insert to the database from and to document tree, with Bloom filters saved to files"""
+
+    def get_model(db_engine=None):
+        return DataModel(
+            xsd_file=str(
+                os.path.join(models_path, model_config["id"], model_config["xsd"])
+            ),
+            short_name=model_config.get("id"),
+            connection_string=conn_string,
+            db_engine=db_engine,
+            db_schema="test_xml2db",
+            model_config=model_config.get("config"),
+            bloom_filter_capacity=100,
+            bloom_filter_dir=str(tmp_path),
+        )
+
+    model = get_model()
+    model.create_db_schema()
+    model.drop_all_tables()
+    xml_files = list_xml_path(model_config, "xml")
+    try:
+        for file in xml_files:
+            doc = model.parse_xml(file, metadata={"input_file_path": file})
+            doc.insert_into_target_tables()
+
+        for file in xml_files:
+            doc = model.extract_from_database(
+                f"input_file_path='{file}'", force_tz="Europe/Paris"
+            )
+            converter = XMLConverter(model)
+            converter.parse_xml(file, file)
+            assert doc.flat_data_to_doc_tree() == remove_record_hash(
+                converter.document_tree
+            )
+
+        # another data model reads filters from files, and catches them up with the last load (it uses the same engine
+        # for in-memory databases)
+        other_model = get_model(db_engine=model.engine)
+        doc = other_model.parse_xml(xml_files[0], metadata={"input_file_path": "x"})
+        stats = doc.insert_into_target_tables()
+        if stats.row_counts_available:
+            assert stats.inserted == 0
+        for tb in other_model.fk_ordered_tables:
+            if tb.is_reused and tb.type_name in doc.data:
+                records = doc.data[tb.type_name]["records"]
+                assert all(record["temp_maybe_exists"] for record in records)
+                assert other_model.bloom_filters[tb.name].max_pk > 0
+
+        other_model.drop_all_tables()
+        assert other_model.bloom_filters == {}
+        assert not any(f.endswith(".bloom") for f in os.listdir(tmp_path))
+    finally:
+        model.drop_all_tables()
@@ -197,3 +197,116 @@ def test_duckdb_bulk_insert_empty(duckdb_engine):
     with duckdb_engine.connect() as conn:
         count = conn.execute(text("SELECT COUNT(*) FROM empty_test")).scalar()
     assert count == 0
+
+
+# ---------------------------------------------------------------------------
+# Columnar records
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("n_records", [3, 250])
+def test_duckdb_bulk_insert_columnar(duckdb_engine, n_records):
+    """ColumnarRecords are loaded like lists of dicts, by executemany and by read_csv."""
+    from xml2db.columnar import ColumnarRecords
+
+    meta = MetaData()
+    table = Table(
+        f"columnar_test_{n_records}",
+        meta,
+        Column("id", Integer, key="id"),
+        Column("label", String(100), key="label"),
+        Column("fk", Integer, key="fk"),
+        Column("flag", Boolean, default=False, key="flag"),
+    )
+    meta.create_all(duckdb_engine)
+    records = [
+        {"id": i, "label": f"label {i}", "fk": None if i % 2 else i}
+        for i in range(n_records)
+    ]
+    rows = _roundtrip(duckdb_engine, table, ColumnarRecords(records))
+    assert [dict(row) for row in rows] == [{**r, "flag": False} for r in records]
+
+
+# ---------------------------------------------------------------------------
+# Arrow and CSV bulk loading paths
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("use_arrow", [True, False])
+@pytest.mark.parametrize("columnar", [True, False])
+def test_duckdb_bulk_insert_paths(duckdb_engine, use_arrow, columnar):
+    """Both bulk loading paths load all column types the same way."""
+    if use_arrow:
+        pytest.importorskip("pyarrow")
+    from xml2db.columnar import ColumnarRecords
+
+    meta = MetaData()
+    table = Table(
+        "paths_test",
+        meta,
+        Column("id", Integer, key="id"),
+        Column("label", String(100), key="label"),
+        Column("bi", BigInteger, key="bi"),
+        Column("d", Double, key="d"),
+        Column("flag", Boolean, key="flag"),
+        Column("ts", DateTime(timezone=True), key="ts"),
+        Column("ts_str", DateTime(timezone=True), key="ts_str"),
+        Column("mixed", String(100), key="mixed"),
+        Column("hash", LargeBinary(32), key="hash"),
+        Column("empty", Integer, key="empty"),
+        Column("temp_exists", Boolean, default=False, key="temp_exists"),
+    )
+    meta.create_all(duckdb_engine)
+    tz = datetime.timezone(datetime.timedelta(hours=2))
+    records = [
+        {
+            "id": i,
+            "label": f"label, {i}" if i % 3 else None,
+            "bi": 10**15 + i,
+            "d": i / 4,
+            "flag": bool(i % 2),
+            "ts": datetime.datetime(2023, 9, 27, 14, 35, i % 60, tzinfo=tz),
+            "ts_str": "2023-09-27T14:35:54+02:00",
+            "mixed": i if i % 2 else f"v{i}",
+            "hash": bytes([i % 256]) * 20,
+            "empty": None,
+        }
+        for i in range(150)
+    ]
+    dialect = DuckDBDialect(use_arrow=use_arrow)
+    with duckdb_engine.begin() as conn:
+        dialect.bulk_insert(
+            conn,
+            table,
+            ColumnarRecords(records) if columnar else records,
+            bulk_load_threshold=0,
+        )
+    with duckdb_engine.connect() as conn:
+        rows = conn.execute(select(table).order_by(table.c.id)).mappings().all()
+
+    assert len(rows) == 150
+    for record, row in zip(records, rows):
+        assert row["label"] == record["label"]
+        assert row["bi"] == record["bi"]
+        assert row["d"] == record["d"]
+        assert row["flag"] is record["flag"]
+        assert row["ts"] == record["ts"]
+        assert row["ts_str"] == datetime.datetime(2023, 9, 27, 14, 35, 54, tzinfo=tz)
+        assert row["mixed"] == str(record["mixed"])
+        assert bytes(row["hash"]) == record["hash"]
+        assert row["empty"] is None
+        assert row["temp_exists"] is False
+
+
+def test_duckdb_bulk_insert_arrow_no_temp_file(duckdb_engine, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import xml2db.dialect.duckdb as duckdb_dialect
+
+    def no_temp_file(*args, **kwargs):
+        raise AssertionError("a temporary file was created")
+
+    monkeypatch.setattr(duckdb_dialect.tempfile, "mkstemp", no_temp_file)
+    table = _make_table(duckdb_engine, "arrow_test")
+    records = [{"id": i, "label": f"label {i}"} for i in range(500)]
+    rows = _roundtrip(duckdb_engine, table, records)
+    assert [dict(row) for row in rows] == records
@@ -322,3 +322,115 @@ def test_mssql_bulk_load_true_raises_without_bcp(mssql_engine):
                         dialect.bulk_insert(conn, table, records, bulk_load=True)
         finally:
             _drop(meta, mssql_engine)
+
+
+# ---------------------------------------------------------------------------
+# OPENJSON path
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.dbtest
+def test_mssql_openjson_types(mssql_engine):
+    meta = MetaData()
+    table = Table(
+        "mssql_bi_openjson",
+        meta,
+        Column("id", Integer, key="id"),
+        Column("label", String(200), key="label"),
+        Column("bi", BigInteger, key="bi"),
+        Column("data", LargeBinary, key="data"),
+        Column("flag", Boolean, default=False, key="flag"),
+    )
+    meta.create_all(mssql_engine)
+    try:
+        payload = b"\xde\xad\xbe\xef" * 8
+        records = [
+            {"id": i, "label": f"row \"{i}\"\t", "bi": 10**15 + i, "data": payload}
+            for i in range(_BCP_THRESHOLD)
+        ] + [{"id": _BCP_THRESHOLD, "label": None, "bi": None, "data": None}]
+        dialect = MSSQLDialect(bulk_method="openjson")
+        with mssql_engine.begin() as conn:
+            dialect.bulk_insert(conn, table, records)
+        with mssql_engine.connect() as conn:
+            rows = conn.execute(select(table).order_by(table.c.id)).mappings().all()
+        assert len(rows) == _BCP_THRESHOLD + 1
+        assert rows[1]["label"] == 'row "1"\t'
+        assert rows[1]["bi"] == 10**15 + 1
+        assert bytes(rows[1]["data"]) == payload
+        assert rows[1]["flag"] is False
+        assert rows[-1]["label"] is None
+        assert rows[-1]["data"] is None
+    finally:
+        meta.drop_all(mssql_engine)
+
+
+def test_mssql_openjson_statement():
+    from sqlalchemy.dialects import mssql
+
+    table = Table(
+        "openjson_test",
+        MetaData(),
+        Column("id", Integer, key="id"),
+        Column("label", mssql.VARCHAR(100), key="label"),
+        Column("hash", mssql.BINARY(20), key="hash"),
+        Column("flag", Boolean, key="flag"),
+        schema="sc",
+    )
+    sql = MSSQLDialect.openjson_insert_sql(
+        table, ["id", "label", "hash", "flag"], mssql.dialect()
+    )
+    assert sql == (
+        "INSERT INTO [sc].[openjson_test] ([id], [label], [hash], [flag]) "
+        "SELECT [c0], [c1], CONVERT(BINARY(20), [c2], 2), [c3] "
+        "FROM OPENJSON(:data) WITH ([c0] INTEGER '$[0]', [c1] VARCHAR(100) '$[1]', "
+        "[c2] VARCHAR(MAX) '$[2]', [c3] BIT '$[3]')"
+    )
+
+
+class _FakeConnection:
+    """Records statements executed by the OPENJSON path instead of running them"""
+
+    def __init__(self):
+        from sqlalchemy.dialects import mssql
+
+        self.dialect = mssql.dialect()
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((str(query), params))
+
+
+def test_mssql_openjson_bulk_insert_offline(monkeypatch):
+    import datetime
+    import json
+
+    import xml2db.dialect.mssql as mssql_module
+
+    monkeypatch.setattr(mssql_module, "_OPENJSON_CHUNK_ROWS", 40)
+    table = Table(
+        "openjson_test",
+        MetaData(),
+        Column("id", Integer, key="id"),
+        Column("label", String(100), key="label"),
+        Column("data", LargeBinary, key="data"),
+        Column("flag", Boolean, default=False, key="flag"),
+    )
+    ts = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    records = [
+        {"id": i, "label": ts if i == 0 else f"row {i}", "data": b"\x01\xff"}
+        for i in range(100)
+    ]
+    conn = _FakeConnection()
+    MSSQLDialect(bulk_method="openjson").bulk_insert(conn, table, records)
+
+    # no subprocess, no temp file: one statement per chunk of rows
+    assert len(conn.executed) == 3
+    assert all("OPENJSON(:data)" in sql for sql, _ in conn.executed)
+    rows = [row for _, params in conn.executed for row in json.loads(params["data"])]
+    assert rows[0] == [0, "2024-01-01 00:00:00+00:00", "01ff", False]
+    assert rows[99] == [99, "row 99", "01ff", False]
+
+
+def test_mssql_invalid_bulk_method():
+    with pytest.raises(ValueError):
+        MSSQLDialect(bulk_method="tvp")
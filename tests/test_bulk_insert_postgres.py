@@ -46,6 +46,11 @@ def pg_engine(request):
     engine.dispose()
 
 
+@pytest.fixture(params=["csv", "binary"])
+def copy_format(request):
+    return request.param
+
+
 def _make_table(engine, name, *extra_cols):
     meta = MetaData()
     table = Table(
@@ -59,8 +64,8 @@ def _make_table(engine, name, *extra_cols):
     return table, meta
 
 
-def _roundtrip(engine, table, records):
-    dialect = PostgreSQLDialect()
+def _roundtrip(engine, table, records, copy_format):
+    dialect = PostgreSQLDialect(copy_format=copy_format)
     with engine.begin() as conn:
         dialect.bulk_insert(conn, table, records)
     with engine.connect() as conn:
@@ -77,11 +82,11 @@ def _drop(meta, engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_basic(pg_engine):
+def test_pg_bulk_insert_basic(pg_engine, copy_format):
     table, meta = _make_table(pg_engine, "pg_bi_basic")
     try:
         records = [{"id": 1, "label": "hello"}, {"id": 2, "label": None}]
-        rows = _roundtrip(pg_engine, table, records)
+        rows = _roundtrip(pg_engine, table, records, copy_format)
         assert len(rows) == 2
         assert rows[0]["id"] == 1
         assert rows[0]["label"] == "hello"
@@ -91,10 +96,10 @@ def test_pg_bulk_insert_basic(pg_engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_empty(pg_engine):
+def test_pg_bulk_insert_empty(pg_engine, copy_format):
     table, meta = _make_table(pg_engine, "pg_bi_empty")
     try:
-        dialect = PostgreSQLDialect()
+        dialect = PostgreSQLDialect(copy_format=copy_format)
         with pg_engine.begin() as conn:
             dialect.bulk_insert(conn, table, [])
         with pg_engine.connect() as conn:
@@ -110,7 +115,7 @@ def test_pg_bulk_insert_empty(pg_engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_numeric_types(pg_engine):
+def test_pg_bulk_insert_numeric_types(pg_engine, copy_format):
     meta = MetaData()
     table = Table(
         "pg_bi_numeric",
@@ -123,7 +128,7 @@ def test_pg_bulk_insert_numeric_types(pg_engine):
     meta.create_all(pg_engine)
     try:
         records = [{"i": 1, "bi": 10**15, "si": 32767, "d": 3.14}]
-        dialect = PostgreSQLDialect()
+        dialect = PostgreSQLDialect(copy_format=copy_format)
         with pg_engine.begin() as conn:
             dialect.bulk_insert(conn, table, records)
         with pg_engine.connect() as conn:
@@ -142,7 +147,7 @@ def test_pg_bulk_insert_numeric_types(pg_engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_boolean(pg_engine):
+def test_pg_bulk_insert_boolean(pg_engine, copy_format):
     meta = MetaData()
     table = Table(
         "pg_bi_bool",
@@ -157,7 +162,7 @@ def test_pg_bulk_insert_boolean(pg_engine):
             {"id": 2, "flag": False},
             {"id": 3, "flag": None},
         ]
-        dialect = PostgreSQLDialect()
+        dialect = PostgreSQLDialect(copy_format=copy_format)
         with pg_engine.begin() as conn:
             dialect.bulk_insert(conn, table, records)
         with pg_engine.connect() as conn:
@@ -175,7 +180,7 @@ def test_pg_bulk_insert_boolean(pg_engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_datetime(pg_engine):
+def test_pg_bulk_insert_datetime(pg_engine, copy_format):
     meta = MetaData()
     table = Table(
         "pg_bi_dt",
@@ -188,7 +193,7 @@ def test_pg_bulk_insert_datetime(pg_engine):
         dt = datetime.datetime(2023, 9, 27, 14, 35, 54, 274602,
                                tzinfo=datetime.timezone.utc)
         records = [{"id": 1, "ts": dt}, {"id": 2, "ts": None}]
-        dialect = PostgreSQLDialect()
+        dialect = PostgreSQLDialect(copy_format=copy_format)
         with pg_engine.begin() as conn:
             dialect.bulk_insert(conn, table, records)
         with pg_engine.connect() as conn:
@@ -205,7 +210,7 @@ def test_pg_bulk_insert_datetime(pg_engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_binary(pg_engine):
+def test_pg_bulk_insert_binary(pg_engine, copy_format):
     meta = MetaData()
     table = Table(
         "pg_bi_binary",
@@ -217,7 +222,7 @@ def test_pg_bulk_insert_binary(pg_engine):
     try:
         payload = b"\xde\xad\xbe\xef" * 8
         records = [{"id": 1, "data": payload}, {"id": 2, "data": None}]
-        dialect = PostgreSQLDialect()
+        dialect = PostgreSQLDialect(copy_format=copy_format)
         with pg_engine.begin() as conn:
             dialect.bulk_insert(conn, table, records)
         with pg_engine.connect() as conn:
@@ -234,7 +239,7 @@ def test_pg_bulk_insert_binary(pg_engine):
 
 
 @pytest.mark.dbtest
-def test_pg_bulk_insert_scalar_column_default(pg_engine):
+def test_pg_bulk_insert_scalar_column_default(pg_engine, copy_format):
     meta = MetaData()
     table = Table(
         "pg_bi_default",
@@ -246,7 +251,7 @@ def test_pg_bulk_insert_scalar_column_default(pg_engine):
     try:
         # Records do NOT contain 'flag'; the default must be applied.
         records = [{"id": 1}, {"id": 2}]
-        dialect = PostgreSQLDialect()
+        dialect = PostgreSQLDialect(copy_format=copy_format)
         with pg_engine.begin() as conn:
             dialect.bulk_insert(conn, table, records)
         with pg_engine.connect() as conn:
@@ -255,3 +260,140 @@ def test_pg_bulk_insert_scalar_column_default(pg_engine):
         assert rows[1]["flag"] is False
     finally:
         meta.drop_all(pg_engine)
+
+
+# ---------------------------------------------------------------------------
+# Streaming COPY (no database needed)
+# ---------------------------------------------------------------------------
+
+
+class _FakeCursor:
+    def __init__(self):
+        self.sql = None
+        self.data = []
+
+    def copy_expert(self, sql, file, size=8192):
+        self.sql = sql
+        while True:
+            chunk = file.read(size)
+            if not chunk:
+                break
+            self.data.append(chunk)
+
+
+class _FakeConnection:
+    """Mimics the parts of a SQLAlchemy connection used by the psycopg2 COPY path"""
+
+    def __init__(self):
+        self.cursor = _FakeCursor()
+        self.dialect = type("FakeDialect", (), {"driver": "psycopg2"})()
+        dbapi_connection = type("FakeDBAPI", (), {"cursor": lambda _: self.cursor})()
+        self.connection = type("FakeConn", (), {"dbapi_connection": dbapi_connection})()
+
+
+def test_pg_csv_chunks():
+    from xml2db.dialect.postgresql import _iter_csv_chunks
+
+    rows = [(i, f"label,{i}", None, True, b"\x01") for i in range(25)]
+    chunks = list(_iter_csv_chunks(["a", "b", "c", "d", "e"], rows, chunk_rows=10))
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert lines[0] == "a,b,c,d,e"
+    assert lines[1] == '0,"label,0",,true,\\x01'
+    assert len(lines) == 26
+
+
+def test_pg_chunks_reader():
+    from xml2db.dialect.postgresql import _ChunksReader
+
+    chunks = ["abc", "defgh", "ij"]
+    reader = _ChunksReader(chunks)
+    out = []
+    while True:
+        data = reader.read(2)
+        if not data:
+            break
+        out.append(data)
+    assert "".join(out) == "abcdefghij"
+    assert _ChunksReader(chunks).read() == "abcdefghij"
+
+
+def test_pg_bulk_insert_streams_copy():
+    meta = MetaData()
+    table = Table(
+        "stream_test",
+        meta,
+        Column("id", Integer, key="id"),
+        Column("label", String(200), key="label"),
+        Column("flag", Boolean, default=False, key="flag"),
+    )
+    records = [{"id": i, "label": f"row {i}"} for i in range(12000)]
+    conn = _FakeConnection()
+    PostgreSQLDialect().bulk_insert(conn, table, records)
+
+    assert conn.cursor.sql.startswith('COPY "stream_test" ("id", "label", "flag")')
+    # data is pulled by small reads rather than in a single payload
+    assert len(conn.cursor.data) > 1
+    lines = b"".join(conn.cursor.data).decode("utf-8").splitlines()
+    assert lines[0] == "id,label,flag"
+    assert lines[1:] == [f"{i},row {i},false" for i in range(12000)]
+
+
+def test_pg_binary_copy_encoding():
+    from xml2db.dialect.postgresql import _binary_encoder, _iter_binary_chunks
+
+    encoders = [
+        _binary_encoder(t)
+        for t in (Integer(), BigInteger(), Boolean(), String(10), LargeBinary())
+    ]
+    rows = [(1, 2, "true", "é", b"\x01"), (None, None, False, None, None)]
+    data = b"".join(_iter_binary_chunks(encoders, rows))
+    assert data.startswith(b"PGCOPY\n\xff\r\n\x00" + b"\x00" * 8)
+    assert data.endswith(b"\xff\xff")
+    body = data[19:-2]
+    row1 = (
+        b"\x00\x05"
+        + b"\x00\x00\x00\x04\x00\x00\x00\x01"
+        + b"\x00\x00\x00\x08" + (2).to_bytes(8, "big")
+        + b"\x00\x00\x00\x01\x01"
+        + b"\x00\x00\x00\x02\xc3\xa9"
+        + b"\x00\x00\x00\x01\x01"
+    )
+    row2 = b"\x00\x05" + b"\xff\xff\xff\xff" * 2 + b"\x00\x00\x00\x01\x00" + b"\xff\xff\xff\xff" * 2
+    assert body == row1 + row2
+
+
+def test_pg_binary_copy_timestamp():
+    from xml2db.dialect.postgresql import _binary_encoder
+
+    encode = _binary_encoder(DateTime(timezone=True))
+    value = datetime.datetime(2000, 1, 2, 1, 0, 0, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))
+    assert encode(value) == b"\x00\x00\x00\x08" + (86400 * 10**6 + 5).to_bytes(8, "big")
+
+
+def test_pg_bulk_insert_binary_copy():
+    meta = MetaData()
+    table = Table(
+        "binary_test",
+        meta,
+        Column("id", Integer, key="id"),
+        Column("label", String(200), key="label"),
+        Column("ts", DateTime(timezone=True), key="ts"),
+    )
+    ts = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    records = [{"id": i, "label": f"row {i}", "ts": ts} for i in range(100)]
+    conn = _FakeConnection()
+    PostgreSQLDialect(copy_format="binary").bulk_insert(conn, table, records)
+    assert conn.cursor.sql.endswith("WITH (FORMAT BINARY)")
+    assert b"".join(conn.cursor.data).startswith(b"PGCOPY")
+
+    # datetime values kept as strings cannot be sent in binary format
+    records = [{"id": i, "label": f"row {i}", "ts": "2024-01-01T00:00:00Z"} for i in range(100)]
+    conn = _FakeConnection()
+    PostgreSQLDialect(copy_format="binary").bulk_insert(conn, table, records)
+    assert "FORMAT CSV" in conn.cursor.sql
+
+
+def test_pg_copy_format_invalid():
+    with pytest.raises(ValueError):
+        PostgreSQLDialect(copy_format="text")
@@ -0,0 +1,100 @@
+import os
+from array import array
+
+import pytest
+
+from xml2db import DataModel
+from xml2db.columnar import ColumnarRecords
+from .conftest import list_xml_path, models_path
+from .sample_models import models
+
+
+def test_columnar_records():
+    records = ColumnarRecords()
+    records.append({"pk": 1, "fk": 10, "value": "a"})
+    records.append({"pk": 2, "fk": None, "value": "b", "other": True})
+    records.append({"pk": 3, "value": "c"})
+
+    assert len(records) == 3
+    assert isinstance(records.columns["pk"], array)
+    assert records.keys() == ["pk", "fk", "value", "other"]
+    assert records[0] == {"pk": 1, "fk": 10, "value": "a", "other": None}
+    assert records[-1] == {"pk": 3, "fk": None, "value": "c", "other": None}
+    assert list(records.iter_rows(["value", "missing", "pk"])) == [
+        ("a", None, 1),
+        ("b", None, 2),
+        ("c", None, 3),
+    ]
+    assert list(records) == records.to_dicts()
+    assert records.to_dicts()[1] == {"pk": 2, "fk": None, "value": "b", "other": True}
+
+    sliced = records[1:]
+    assert isinstance(sliced, ColumnarRecords)
+    assert sliced.to_dicts() == records.to_dicts()[1:]
+
+    with pytest.raises(IndexError):
+        records[3]
+
+    records.clear()
+    records.append_values(["pk", "value"], [1, "a"])
+    records.append_values(["pk", "fk"], [2, 20])
+    assert records.to_dicts() == [
+        {"pk": 1, "value": "a", "fk": None},
+        {"pk": 2, "value": None, "fk": 20},
+    ]
+
+    records.clear()
+    assert len(records) == 0 and not records
+
+
+def test_columnar_records_write_through():
+    """Records read by index or iteration are views, which write values into the columns"""
+    records = ColumnarRecords([{"pk": 1, "value": "a"}, {"pk": 2, "value": "b"}])
+    records[0]["value"] = "c"
+    records[1]["pk"] = 2**70
+    records[-1]["new"] = True
+    for record in records:
+        record["flag"] = record["pk"] == 1
+
+    assert records.to_dicts() == [
+        {"pk": 1, "value": "c", "new": None, "flag": True},
+        {"pk": 2**70, "value": "b", "new": True, "flag": False},
+    ]
+    assert records[0] == {"pk": 1, "value": "c", "new": None, "flag": True}
+    assert "flag" in records[0] and "missing" not in records[0]
+    with pytest.raises(KeyError):
+        records[0]["missing"]
+    with pytest.raises(TypeError):
+        del records[0]["value"]
+
+
+@pytest.mark.parametrize(
+    "test_config",
+    [
+        {**model, **version, "xml_file": xml_file}
+        for model in models
+        for xml_file in list_xml_path(model, "xml")
+        for version in model["versions"]
+    ],
+)
+def test_columnar_flat_data(test_config):
+    """Test that columnar flat data holds the same records as default flat data"""
+    model = DataModel(
+        str(os.path.join(models_path, test_config["id"], test_config["xsd"])),
+        short_name=test_config["id"],
+        model_config=test_config["config"],
+    )
+    doc = model.parse_xml(test_config["xml_file"])
+    columnar_doc = model.parse_xml(test_config["xml_file"], columnar=True)
+
+    assert doc.data.keys() == columnar_doc.data.keys()
+    for key, data in doc.data.items():
+        columnar_data = columnar_doc.data[key]
+        assert isinstance(columnar_data["records"], ColumnarRecords)
+        assert columnar_data["records"].to_dicts() == data["records"]
+        for rel_name, rel_data in data.get("relations_n", {}).items():
+            assert (
+                columnar_data["relations_n"][rel_name]["records"].to_dicts()
+                == rel_data["records"]
+            )
+    assert columnar_doc.flat_data_to_doc_tree() == doc.flat_data_to_doc_tree()
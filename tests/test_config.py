@@ -1,5 +1,6 @@
 """Tests for config.py (resolve_sa_type, parse_yaml_config) and model-level
 transform option."""
+import hashlib
 import os
 import textwrap
 
@@ -7,7 +8,11 @@ import pytest
 import sqlalchemy as sa
 
 from xml2db import DataModel
-from xml2db.config import parse_yaml_config, resolve_sa_type
+from xml2db.config import (
+    parse_yaml_config,
+    resolve_hash_constructor,
+    resolve_sa_type,
+)
 from xml2db.exceptions import DataModelConfigError
 
 ORDERS_XSD = os.path.join("tests", "sample_models", "orders", "orders.xsd")
@@ -58,6 +63,68 @@ class TestResolveSaType:
         assert isinstance(resolve_sa_type("UUID"), sa.Uuid)
 
 
+# ---------------------------------------------------------------------------
+# resolve_hash_constructor
+# ---------------------------------------------------------------------------
+
+
+class TestResolveHashConstructor:
+    def test_passthrough_callable(self):
+        assert resolve_hash_constructor(hashlib.md5) is hashlib.md5
+
+    def test_hashlib_name(self):
+        h = resolve_hash_constructor("sha1")()
+        h.update(b"abc")
+        assert h.digest() == hashlib.sha1(b"abc").digest()
+
+    def test_blake2b_digest_size(self):
+        h = resolve_hash_constructor("blake2b", 16)()
+        h.update(b"abc")
+        assert h.digest() == hashlib.blake2b(b"abc", digest_size=16).digest()
+
+    def test_xxhash(self):
+        xxhash = pytest.importorskip("xxhash")
+        h = resolve_hash_constructor("xxh3_128")()
+        h.update(b"abc")
+        assert h.digest() == xxhash.xxh3_128(b"abc").digest()
+
+    def test_unknown_name_raises(self):
+        with pytest.raises(DataModelConfigError, match="Unknown"):
+            resolve_hash_constructor("nohash")
+
+    def test_variable_length_name_raises(self):
+        with pytest.raises(DataModelConfigError, match="variable digest length"):
+            resolve_hash_constructor("shake_128")
+
+    def test_model_record_hash_size_from_constructor(self):
+        model = DataModel(ORDERS_XSD, model_config={"record_hash_constructor": "sha256"})
+        assert model.model_config["record_hash_size"] == 32
+        for tb in model.tables.values():
+            if tb.is_reused:
+                hash_col = tb.table.c[model.model_config["record_hash_column_name"]]
+                assert hash_col.type.length == 32
+
+    def test_model_record_hash_size_mismatch_raises(self):
+        with pytest.raises(DataModelConfigError, match="record_hash_size"):
+            DataModel(
+                ORDERS_XSD,
+                model_config={"record_hash_constructor": "md5", "record_hash_size": 20},
+            )
+
+    def test_model_with_named_constructor(self):
+        model = DataModel(
+            ORDERS_XSD,
+            model_config={"record_hash_constructor": "blake2b", "record_hash_size": 16},
+        )
+        doc = model.parse_xml(
+            os.path.join("tests", "sample_models", "orders", "xml", "order1.xml")
+        )
+        assert all(
+            len(record[model.model_config["record_hash_column_name"]]) == 16
+            for record in doc.data[model.root_table]["records"]
+        )
+
+
 # ---------------------------------------------------------------------------
 # parse_yaml_config
 # ---------------------------------------------------------------------------
@@ -91,10 +158,18 @@ class TestParseYamlConfig:
             parse_yaml_config("- item1\n- item2\n")
 
     def test_callable_key_rejected(self):
-        for key in ("document_tree_hook", "document_tree_node_hook", "record_hash_constructor"):
+        for key in ("document_tree_hook", "document_tree_node_hook"):
             with pytest.raises(DataModelConfigError, match="callable"):
                 parse_yaml_config(f"{key}: something\n")
 
+    def test_record_hash_constructor_name_accepted(self):
+        cfg = parse_yaml_config("record_hash_constructor: blake2b\n")
+        assert cfg["record_hash_constructor"] == "blake2b"
+
+    def test_record_hash_constructor_must_be_string(self):
+        with pytest.raises(DataModelConfigError, match="algorithm name"):
+            parse_yaml_config("record_hash_constructor: 123\n")
+
     def test_metadata_columns_type_must_be_string(self):
         yaml = textwrap.dedent("""\
             metadata_columns:
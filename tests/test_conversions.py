@@ -1,11 +1,18 @@
 import os
 import pprint
+import sys
+from datetime import date, datetime, timedelta, timezone
 
 import pytest
 from lxml import etree
 
 from xml2db import DataModel
-from xml2db.xml_converter import XMLConverter, remove_record_hash
+from xml2db.xml_converter import (
+    XMLConverter,
+    parse_date,
+    parse_datetime,
+    remove_record_hash,
+)
 from .conftest import list_xml_path, models_path
 from .sample_models import models
 
@@ -40,6 +47,54 @@ def test_iterative_recursive_parsing(test_config):
     assert parsed_recursive == parsed_iterative
 
 
+def _legacy_record_hash(model, node):
+    """Reference implementation of record hashes, feeding fields one by one to the hash object"""
+    node_type, content, _ = node
+    h = model.model_config["record_hash_constructor"]()
+    for field_type, name, field in model.tables[node_type].fields:
+        if field_type == "col":
+            if field.is_attr:
+                key = f"{name[:-5]}__attr" if field.has_suffix else f"{name}__attr"
+            else:
+                key = name
+            h.update(str(content.get(key, None)).encode("utf-8"))
+        elif field_type == "rel1":
+            h.update(content[name][0][2] if name in content else b"")
+        elif field_type == "reln":
+            for h_child in sorted([v[2] for v in content.get(name, [])]):
+                h.update(h_child)
+    return h.digest()
+
+
+@pytest.mark.parametrize(
+    "test_config",
+    [
+        {**model, **version, "xml_file": xml_file}
+        for model in models
+        for xml_file in list_xml_path(model, "xml")
+        for version in model["versions"]
+    ],
+)
+def test_record_hash_compatibility(test_config):
+    """Test that record hashes are identical to the ones computed field by field"""
+    model = DataModel(
+        str(os.path.join(models_path, test_config["id"], test_config["xsd"])),
+        short_name=test_config["id"],
+        model_config=test_config["config"],
+    )
+    converter = XMLConverter(model)
+    document_tree = converter.parse_xml(test_config["xml_file"])
+
+    def check_node(node):
+        for key, values in node[1].items():
+            for value in values:
+                if isinstance(value, tuple):
+                    check_node(value)
+        assert node[2] == _legacy_record_hash(model, node)
+
+    check_node(document_tree)
+
+
 @pytest.mark.parametrize(
     "test_config",
     [
@@ -73,6 +128,72 @@ def test_document_tree_to_flat_data(test_config):
     assert act_doc_tree == exp_doc_tree
 
 
+def test_flat_data_to_doc_tree_commas(tmp_path):
+    """Values with commas are split back into lists only for columns which can hold several values"""
+    model = DataModel(str(os.path.join(models_path, "orders", "orders.xsd")))
+    with open(os.path.join(models_path, "orders", "xml", "order1.xml"), "rt") as f:
+        xml = f.read()
+    xml = xml.replace("<name>Bob</name>", '<name>Bob, "Jr"</name>')
+    xml = xml.replace("+1732897354", "+1,732,897,354")
+    file_path = str(tmp_path / "order_commas.xml")
+    with open(file_path, "wt") as f:
+        f.write(xml)
+
+    converter = XMLConverter(model)
+    converter.parse_xml(file_path, file_path)
+    doc = model.parse_xml(file_path)
+
+    assert doc.flat_data_to_doc_tree() == remove_record_hash(
+        converter.document_tree
+    )
+
+
+def test_split_by_root_deep_document(tmp_path):
+    """Splitting flat data by root record does not hit the recursion limit with deep documents"""
+    depth = 200
+    types = "".join(
+        f'<xs:complexType name="level{i}"><xs:sequence><xs:element name="value" type="xs:string"/>'
+        + (
+            f'<xs:element name="child" type="level{i + 1}" maxOccurs="unbounded"/>'
+            if i < depth
+            else ""
+        )
+        + "</xs:sequence></xs:complexType>"
+        for i in range(depth + 1)
+    )
+    xsd_path = str(tmp_path / "deep.xsd")
+    with open(xsd_path, "wt") as f:
+        f.write(
+            '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+            f'<xs:element name="root" type="level0"/>{types}</xs:schema>'
+        )
+    file_path = str(tmp_path / "deep.xml")
+    with open(file_path, "wt") as f:
+        f.write(
+            "<root>"
+            + "".join(f"<value>{i}</value><child>" for i in range(depth))
+            + f"<value>{depth}</value>"
+            + "</child>" * depth
+            + "</root>"
+        )
+    model = DataModel(xsd_path)
+    doc = model.parse_xml(file_path)
+
+    # leave less stack room than the depth of the document
+    frame, stack_depth = sys._getframe(), 0
+    while frame is not None:
+        frame, stack_depth = frame.f_back, stack_depth + 1
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(stack_depth + depth // 2)
+    try:
+        docs = doc.split_by_root()
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+    assert len(docs) == 1
+    assert docs[0].flat_data_to_doc_tree() == doc.flat_data_to_doc_tree()
+
+
 @pytest.mark.parametrize(
     "test_config",
     [
@@ -117,6 +238,54 @@ def test_document_tree_to_xml(test_config):
     assert xml == ref_xml
 
 
+@pytest.mark.parametrize(
+    "test_config",
+    [
+        {**model, **version, "xml_file": xml_file}
+        for model in models
+        for xml_file in list_xml_path(model, "xml")
+        for version in model["versions"]
+    ],
+)
+def test_document_tree_to_xml_file(test_config, tmp_path):
+    """A test that XML files written incrementally are the same as pretty printed XML trees"""
+
+    model = DataModel(
+        str(os.path.join(models_path, test_config["id"], test_config["xsd"])),
+        short_name=test_config["id"],
+        model_config=test_config["config"],
+    )
+    converter = XMLConverter(model)
+    file_path = test_config["xml_file"]
+    converter.parse_xml(file_path, file_path)
+    nsmap = etree.parse(file_path).getroot().nsmap
+
+    el = converter.to_xml(nsmap=nsmap)
+    etree.indent(el, space="\t")
+    ref_xml = etree.tostring(
+        el,
+        pretty_print=True,
+        encoding="utf-8",
+        xml_declaration=True,
+    )
+
+    out_file = str(tmp_path / "out.xml")
+    converter.write_xml(out_file, nsmap=nsmap, indent="\t")
+    with open(out_file, "rb") as f:
+        assert f.read() == ref_xml
+
+    # to_xml writes the same file, and returns the root element
+    assert converter.to_xml(out_file=out_file, nsmap=nsmap, indent="\t") is not None
+    with open(out_file, "rb") as f:
+        assert f.read() == ref_xml
+
+    # documents write the same file from flat data
+    doc = model.parse_xml(file_path)
+    doc.write_xml(out_file, nsmap=nsmap, indent="\t")
+    with open(out_file, "rb") as f:
+        assert f.read() == ref_xml
+
+
 def test_field_rename():
     """Test that 'rename' in field config sets the physical DB column name without affecting internal logic"""
     model = DataModel(
@@ -202,3 +371,156 @@ def test_equivalent_xml(test_config):
         for xml_file in xml_files[1:]:
             equ_data = model.parse_xml(xml_file)
             assert ref_data.data == equ_data.data
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2023-09-10T09:37:00", datetime(2023, 9, 10, 9, 37)),
+        ("2023-09-10T09:37:00Z", datetime(2023, 9, 10, 9, 37, tzinfo=timezone.utc)),
+        (
+            "2023-09-10T09:37:00.000+02:00",
+            datetime(2023, 9, 10, 9, 37, tzinfo=timezone(timedelta(hours=2))),
+        ),
+        (
+            "2023-09-10T09:37:00.1234567-05:30",
+            datetime(
+                2023,
+                9,
+                10,
+                9,
+                37,
+                0,
+                123456,
+                tzinfo=timezone(-timedelta(hours=5, minutes=30)),
+            ),
+        ),
+        ("2023-09-10T24:00:00", "2023-09-10T24:00:00"),
+        ("not a date", "not a date"),
+    ],
+)
+def test_parse_datetime(value, expected):
+    assert parse_datetime(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2023-09-10", date(2023, 9, 10)),
+        (" 2023-09-10 ", date(2023, 9, 10)),
+        ("2023-09-10Z", "2023-09-10Z"),
+        ("2023-09-10+02:00", "2023-09-10+02:00"),
+        ("2023-02-30", "2023-02-30"),
+        ("not a date", "not a date"),
+    ],
+)
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+
+def test_parse_dates_option(tmp_path):
+    """Test that date values are parsed in flat data only for columns configured with a Date type"""
+    xsd_path = tmp_path / "events.xsd"
+    xsd_path.write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="events">
+    <xs:complexType>
+      <xs:sequence>
+        <xs:element name="event" maxOccurs="unbounded">
+          <xs:complexType>
+            <xs:sequence>
+              <xs:element name="start" type="xs:date"/>
+              <xs:element name="end" type="xs:date"/>
+            </xs:sequence>
+          </xs:complexType>
+        </xs:element>
+      </xs:sequence>
+    </xs:complexType>
+  </xs:element>
+</xs:schema>"""
+    )
+    xml_path = tmp_path / "events.xml"
+    xml_path.write_text(
+        "<events><event><start>2024-01-01</start><end>2024-01-31</end></event>"
+        "<event><start>2024-02-01+01:00</start><end>2024-02-29</end></event></events>"
+    )
+    model = DataModel(
+        str(xsd_path),
+        model_config={
+            "parse_datetimes": True,
+            "tables": {"event": {"fields": {"start": {"type": "Date"}}}},
+        },
+    )
+    doc = model.parse_xml(str(xml_path))
+    records = doc.data["event"]["records"]
+    assert [(r["start"], r["end"]) for r in records] == [
+        (date(2024, 1, 1), "2024-01-31"),
+        ("2024-02-01+01:00", "2024-02-29"),
+    ]
+
+
+def test_parse_datetimes_option():
+    """Test that datetime values are parsed in flat data, without changing document tree nor record hashes"""
+    xsd_path = str(os.path.join(models_path, "orders", "orders.xsd"))
+    xml_path = str(os.path.join(models_path, "orders", "xml", "order1.xml"))
+    ref_doc = DataModel(xsd_path).parse_xml(xml_path)
+    model = DataModel(xsd_path, model_config={"parse_datetimes": True})
+    doc = model.parse_xml(xml_path)
+
+    records = doc.data["shipordertype"]["records"]
+    ref_records = ref_doc.data["shipordertype"]["records"]
+    assert [r["xml2db_record_hash"] for r in records] == [
+        r["xml2db_record_hash"] for r in ref_records
+    ]
+    datetime_columns = [
+        key
+        for key, col in model.tables["shipordertype"].columns.items()
+        if col.data_type == "dateTime"
+    ]
+    assert datetime_columns
+    for record, ref_record in zip(records, ref_records):
+        for key in datetime_columns:
+            assert record[key] == parse_datetime(ref_record[key])
+            assert isinstance(record[key], datetime)
+
+
+@pytest.mark.parametrize(
+    "model_id, version, chunk_element, parent_type, rel_key",
+    [
+        # contracts are nested in a wrapper element, elevated into the root table
+        ("table1", 0, None, "REMITTable1", "contractList_contract"),
+        ("table1", 1, None, "REMITTable1", "contract"),
+        ("table1", 0, "contract", "REMITTable1", "contractList_contract"),
+        ("table1", 0, "fixingIndexDetails", "annexTable1ContractType", "fixingIndex"),
+        ("orders", 2, "item", "shipordertype", "item"),
+    ],
+)
+def test_streaming_chunks(model_id, version, chunk_element, parent_type, rel_key):
+    """Test that repeated elements are streamed at any depth, and that streamed nodes are replaced by stubs"""
+    model_config = next(model for model in models if model["id"] == model_id)
+    model = DataModel(
+        str(os.path.join(models_path, model_id, model_config["xsd"])),
+        short_name=model_id,
+        model_config=model_config["versions"][version]["config"],
+    )
+    streamed = set()
+    for xml_file in list_xml_path(model_config, "xml"):
+        ref_tree = XMLConverter(model).parse_xml(xml_file)
+        chunks = []
+        tree = XMLConverter(model).parse_xml(
+            xml_file,
+            chunk_callback=lambda *args: chunks.append(args),
+            chunk_element=chunk_element,
+        )
+        assert tree[2] == ref_tree[2]
+        streamed.update((chunk[0], chunk[1]) for chunk in chunks)
+        if chunk_element is None:
+            # all n-n children of the root table are streamed by default
+            assert all(chunk[0] == model.root_table for chunk in chunks)
+            if model_id == "table1":
+                assert len(chunks) > 1
+    if chunk_element is None:
+        assert (parent_type, rel_key) in streamed
+    else:
+        assert streamed == {(parent_type, rel_key)}
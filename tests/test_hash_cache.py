@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from xml2db import DataModel, Document
+from xml2db.cache import HashCache
+from xml2db.xml_converter import XMLConverter, remove_record_hash
+from .conftest import list_xml_path, models_path
+from .sample_models import models
+
+
+def test_hash_cache_lru():
+    """A test for hash cache lookups and least recently used eviction"""
+    cache = HashCache(3)
+    cache.update("a", [(b"1", 1), (b"2", 2), (b"3", None)])
+    cache.update("b", [(memoryview(b"1"), 10)])
+    assert len(cache) == 3
+    assert cache.get("a", b"3") is None
+    assert cache.get("b", b"1") == 10
+
+    # "a"/b"1" is now the least recently used entry
+    assert cache.get("a", b"2") == 2
+    cache.update("a", [(b"4", 4)])
+    assert len(cache) == 3
+    assert cache.get("a", b"1") is None
+    assert cache.get("a", b"4") == 4
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a", b"4") is None
+
+
+def test_hash_cache_size_invalid():
+    with pytest.raises(ValueError, match="hash_cache_size"):
+        DataModel(
+            str(os.path.join(models_path, "orders", "orders.xsd")),
+            hash_cache_size=-1,
+        )
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize("mode", ["parse", "stream"])
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_hash_cache_roundtrip(conn_string, model_config, mode):
+    """A test for roundtrip insert to the database from and to document tree, skipping records found in the hash
+    cache"""
+    model = DataModel(
+        xsd_file=str(
+            os.path.join(models_path, model_config["id"], model_config["xsd"])
+        ),
+        short_name=model_config.get("id"),
+        connection_string=conn_string,
+        db_schema="test_xml2db",
+        model_config=model_config.get("config"),
+        hash_cache_size=100000,
+    )
+    model.create_db_schema()
+    model.drop_all_tables()
+    model.create_all_tables()
+    xml_files = list_xml_path(model_config, "xml")
+    try:
+        for file in xml_files:
+            if mode == "stream":
+                Document(model).stream_into_target_tables(
+                    file, metadata={"input_file_path": file}, chunk_size=1
+                )
+            else:
+                doc = Document(model)
+                doc.parse_xml(file, metadata={"input_file_path": file})
+                doc.insert_into_target_tables()
+        assert len(model.hash_cache) > 0
+
+        for file in xml_files:
+            doc = model.extract_from_database(
+                f"input_file_path='{file}'", force_tz="Europe/Paris"
+            )
+            converter = XMLConverter(model)
+            converter.parse_xml(file, file)
+            assert doc.flat_data_to_doc_tree() == remove_record_hash(
+                converter.document_tree
+            )
+
+        # a new data model reads the cache from the database (using the same engine for in-memory databases), and
+        # records of a file loaded again are all known
+        other_model = DataModel(
+            xsd_file=model._worker_model_kwargs["xsd_file"],
+            short_name=model_config.get("id"),
+            db_engine=model.engine,
+            db_schema="test_xml2db",
+            model_config=model_config.get("config"),
+            hash_cache_size=100000,
+        )
+        assert other_model.warm_hash_cache() == len(model.hash_cache)
+        doc = other_model.parse_xml(xml_files[0], metadata={"input_file_path": "x"})
+        stats = doc.insert_into_target_tables()
+        # the root record is known, so that its children are not extracted
+        assert list(doc.data) == [other_model.root_table]
+        assert doc.data[other_model.root_table]["records"][0]["temp_exists"]
+        assert other_model.hash_cache.misses == 0
+        if stats.row_counts_available:
+            assert stats.inserted == 0
+        other_model.drop_all_tables()
+        assert len(other_model.hash_cache) == 0
+    finally:
+        model.drop_all_tables()
@@ -0,0 +1,101 @@
+import logging
+import os
+import stat
+
+import pytest
+
+from xml2db import DataModel
+from .conftest import list_xml_path, models_path
+from .sample_models import models
+
+
+def _get_model(model_config, cache_dir, **kwargs):
+    return DataModel(
+        str(os.path.join(models_path, model_config["id"], model_config["xsd"])),
+        short_name=model_config["id"],
+        model_config=model_config.get("config"),
+        cache_dir=cache_dir,
+        **kwargs,
+    )
+
+
+def _create_statements(model):
+    return [
+        str(statement).replace(model.temp_prefix, "")
+        for statement in model.get_all_create_table_statements()
+    ]
+
+
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_model_cache(model_config, tmp_path):
+    """A data model loaded from the cache is the same as the data model built from the XSD file"""
+    cache_dir = str(tmp_path / "cache")
+    _get_model(model_config, cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # the database schema is not part of the cached data model
+    ref_model = _get_model(model_config, None, db_schema="other_schema")
+    model = _get_model(model_config, cache_dir, db_schema="other_schema")
+    # XSD files are not parsed
+    assert model._xml_schema is None
+    assert model._lxml_schema is None
+
+    assert model.source_tree == ref_model.source_tree
+    assert model.target_tree == ref_model.target_tree
+    assert model.ordered_tables_keys == ref_model.ordered_tables_keys
+    assert model.fields_transforms == ref_model.fields_transforms
+    assert model.types_transforms == ref_model.types_transforms
+    assert _create_statements(model) == _create_statements(ref_model)
+
+    for file in list_xml_path(model_config, "xml"):
+        doc = model.parse_xml(file, skip_validation=False)
+        ref_doc = ref_model.parse_xml(file)
+        assert doc.flat_data_to_doc_tree() == ref_doc.flat_data_to_doc_tree()
+
+
+def test_model_cache_key(tmp_path):
+    """Data models built with different options are cached separately, and invalid cache files are rebuilt"""
+    cache_dir = str(tmp_path / "cache")
+    model_config = {**models[0], **models[0]["versions"][0]}
+    _get_model(model_config, cache_dir)
+    _get_model(model_config, cache_dir, db_type="mssql")
+    _get_model({**model_config, "config": {"row_numbers": True}}, cache_dir)
+    assert len(os.listdir(cache_dir)) == 3
+
+
+def test_model_cache_invalid(tmp_path, caplog):
+    cache_dir = str(tmp_path / "cache")
+    model_config = {**models[0], **models[0]["versions"][0]}
+    _get_model(model_config, cache_dir)
+    (cache_file,) = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, cache_file), "wb") as f:
+        f.write(b"not a data model")
+
+    with caplog.at_level(logging.WARNING):
+        model = _get_model(model_config, cache_dir)
+    assert "Cannot load data model cache" in caplog.text
+    assert model._xml_schema is not None
+    assert model.target_tree == _get_model(model_config, cache_dir).target_tree
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file permissions")
+def test_model_cache_permissions(tmp_path, caplog):
+    """Cache files are private to the current user, and cache files writable by other users are not loaded"""
+    cache_dir = str(tmp_path / "cache")
+    model_config = {**models[0], **models[0]["versions"][0]}
+    _get_model(model_config, cache_dir)
+    (cache_file,) = os.listdir(cache_dir)
+    cache_path = os.path.join(cache_dir, cache_file)
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+    assert _get_model(model_config, cache_dir)._xml_schema is None
+
+    os.chmod(cache_path, 0o666)
+    with caplog.at_level(logging.WARNING):
+        model = _get_model(model_config, cache_dir)
+    assert "it is writable by other users" in caplog.text
+    assert model._xml_schema is not None
+    # the cache file was rebuilt with owner-only permissions
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
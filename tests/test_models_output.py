@@ -85,3 +85,73 @@ def test_model_ddl(test_config):
     )
 
     assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "test_config",
+    [
+        {**model, **model["versions"][i], "dialect": d.dialect()}
+        for model in models
+        for i in range(len(model["versions"]))
+        for d in [postgresql, mssql, mysql]
+    ],
+)
+def test_model_merge_plan(test_config):
+    """A test to check that the merge plan is cached and can be dumped as SQL"""
+
+    model = DataModel(
+        str(os.path.join(models_path, test_config["id"], test_config["xsd"])),
+        short_name=test_config["id"],
+        model_config=test_config["config"],
+        db_type=test_config["dialect"].name,
+    )
+
+    plan = model.get_merge_plan()
+    assert plan is model.get_merge_plan()
+    assert len(plan) == 1
+    assert [tb for tb, _ in plan[0]] == list(model.fk_ordered_tables)
+
+    grouped_plan = model.get_merge_plan(single_transaction=False)
+    statements = {tb.type_name: queries for tb, queries in plan[0]}
+    grouped_items = [item for group in grouped_plan for item in group]
+    assert len(grouped_items) == len(statements)
+    for tb, queries in grouped_items:
+        assert queries is statements[tb.type_name]
+
+    dump = model.dump_merge_plan(sa_dialect=test_config["dialect"])
+    assert dump.startswith("-- transaction 1")
+    assert "INSERT INTO" in dump
+    assert dump.count("-- table ") == len(model.ordered_tables_keys)
+
+
+@pytest.mark.parametrize("dialect", [postgresql, mssql, mysql])
+def test_reused_table_merge_single_hash_lookup(dialect):
+    """A test to check that merge statements of reused tables look up each temp record hash only once"""
+
+    model = DataModel(
+        str(os.path.join(models_path, "orders", "orders.xsd")),
+        short_name="orders",
+        db_type=dialect.dialect.name,
+    )
+    for tb in model.fk_ordered_tables:
+        if not tb.is_reused:
+            continue
+        statements = [
+            (
+                stmt.get_execution_options()["xml2db_label"],
+                str(stmt.compile(dialect=dialect.dialect())),
+            )
+            for stmt in tb.get_merge_temp_records_statements()
+        ]
+        labels = [label for label, _ in statements]
+        match_sql = statements[labels.index("match existing records")][1]
+        pk_name = getattr(tb.temp_table.c, f"pk_{tb.name}").name
+        assert pk_name in match_sql and "temp_exists" in match_sql
+        insert_sql = statements[labels.index("insert new records")][1]
+        if dialect is postgresql:
+            assert "RETURNING" in insert_sql and insert_sql.startswith("WITH")
+            assert "backfill primary keys" not in labels
+        else:
+            assert insert_sql.startswith("INSERT INTO")
+            backfill_sql = statements[labels.index("backfill primary keys")][1]
+            assert "temp_exists = " in backfill_sql
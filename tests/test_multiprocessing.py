@@ -10,7 +10,7 @@ pytest.importorskip("duckdb", reason="duckdb not installed")
 
 from sqlalchemy import String, create_engine, text
 
-from xml2db import DataModel
+from xml2db import DataModel, Document, LoadStats
 
 _SAMPLE = os.path.join(os.path.dirname(__file__), "sample_models", "orders")
 _XSD = os.path.join(_SAMPLE, "orders.xsd")
@@ -92,24 +92,90 @@ def test_multiprocessing_file_duckdb():
         assert count == len(_XML_FILES)
 
         # --- content roundtrip ---
-        verify_model = DataModel(
+        _check_roundtrip(db_path)
+
+
+def test_import_files_file_duckdb():
+    """DataModel.import_files parses files in worker processes and loads them with a single connection."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.duckdb")
+        model = DataModel(
             xsd_file=_XSD,
             connection_string=f"duckdb:///{db_path}",
             model_config=_MODEL_CONFIG,
         )
-        for xml_path in _XML_FILES:
-            doc = verify_model.extract_from_database(
-                f"input_file_path='{xml_path}'",
-                force_tz="Europe/Paris",
+        stats = model.import_files(
+            _XML_FILES,
+            metadata=lambda xml_path: {"input_file_path": xml_path},
+            workers=2,
+            mp_context="spawn",
+        )
+        model.engine.dispose()
+        assert list(stats.keys()) == _XML_FILES
+        assert all(isinstance(s, LoadStats) for s in stats.values())
+
+        engine = create_engine(f"duckdb:///{db_path}")
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT COUNT(*) FROM orders")).scalar()
+        engine.dispose()
+        assert count == len(_XML_FILES)
+
+        _check_roundtrip(db_path)
+
+
+def test_import_files_duplicate_paths():
+    """DataModel.import_files rejects files listed twice, whose stats would be overwritten."""
+    model = DataModel(xsd_file=_XSD, model_config=_MODEL_CONFIG)
+    with pytest.raises(ValueError, match="more than once"):
+        model.import_files([*_XML_FILES, _XML_FILES[0]], workers=2)
+
+
+def test_import_files_load_error(monkeypatch):
+    """Errors raised while loading a file are raised by DataModel.import_files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.duckdb")
+        model = DataModel(
+            xsd_file=_XSD,
+            connection_string=f"duckdb:///{db_path}",
+            model_config=_MODEL_CONFIG,
+        )
+
+        def insert_into_target_tables(*args, **kwargs):
+            raise RuntimeError("load failed")
+
+        monkeypatch.setattr(
+            Document, "insert_into_target_tables", insert_into_target_tables
+        )
+        with pytest.raises(RuntimeError, match="load failed"):
+            model.import_files(
+                _XML_FILES,
+                metadata=lambda xml_path: {"input_file_path": xml_path},
+                workers=2,
+                mp_context="spawn",
             )
-            src = etree.parse(xml_path).getroot()
-            el = doc.to_xml(nsmap=src.nsmap)
-            for key, val in src.attrib.items():
-                el.set(key, val)
-            actual = etree.tostring(
-                el, pretty_print=True, encoding="utf-8", xml_declaration=True
-            ).decode("utf-8")
-            with open(xml_path) as f:
-                expected = f.read()
-            assert actual == expected, f"XML roundtrip failed for {xml_path}"
-        verify_model.engine.dispose()
+        model.engine.dispose()
+
+
+def _check_roundtrip(db_path: str) -> None:
+    """Check that each XML file round-trips back to identical XML from the database."""
+    verify_model = DataModel(
+        xsd_file=_XSD,
+        connection_string=f"duckdb:///{db_path}",
+        model_config=_MODEL_CONFIG,
+    )
+    for xml_path in _XML_FILES:
+        doc = verify_model.extract_from_database(
+            f"input_file_path='{xml_path}'",
+            force_tz="Europe/Paris",
+        )
+        src = etree.parse(xml_path).getroot()
+        el = doc.to_xml(nsmap=src.nsmap)
+        for key, val in src.attrib.items():
+            el.set(key, val)
+        actual = etree.tostring(
+            el, pretty_print=True, encoding="utf-8", xml_declaration=True
+        ).decode("utf-8")
+        with open(xml_path) as f:
+            expected = f.read()
+        assert actual == expected, f"XML roundtrip failed for {xml_path}"
+    verify_model.engine.dispose()
@@ -1,9 +1,11 @@
 import os
+import threading
 
 import pytest
+import sqlalchemy
 from lxml import etree
 
-from xml2db import LoadStats, MergeStats
+from xml2db import DataModel, Document, LoadStats, MergeStats, ParseStats, TableStats
 from xml2db.xml_converter import XMLConverter, remove_record_hash
 from .conftest import list_xml_path, models_path
 from .sample_models import models
@@ -12,8 +14,6 @@ from .sample_models import models
 @pytest.mark.dbtest
 def test_load_stats(conn_string):
     """Test that insert_into_target_tables returns a LoadStats with correct structure"""
-    from xml2db import DataModel
-    import sqlalchemy
 
     model = DataModel(
         str(os.path.join(models_path, "orders", "orders.xsd")),
@@ -39,6 +39,44 @@ def test_load_stats(conn_string):
         assert stats.duration_merge > 0
         assert stats.duration_cleanup > 0
 
+        # per-table details
+        assert set(stats.tables) == {tb.name for tb in model.fk_ordered_tables} | {
+            rel.rel_table_name
+            for tb in model.fk_ordered_tables
+            for rel in tb.relations_n.values()
+            if rel.rel_table_name
+            in doc.data.get(tb.type_name, {}).get("relations_n", {})
+        }
+        for tb in model.fk_ordered_tables:
+            table_stats = stats.tables[tb.name]
+            assert isinstance(table_stats, TableStats)
+            assert table_stats.duration_merge > 0
+            if tb.type_name in doc.data:
+                assert table_stats.records == len(doc.data[tb.type_name]["records"])
+                assert table_stats.bytes_staged >= 0
+                assert table_stats.duration_stage > 0
+
+        # per-statement details, in execution order
+        assert stats.statements
+        assert {st.table for st in stats.statements} == {
+            tb.name for tb in model.fk_ordered_tables
+        }
+        labels = {st.label for st in stats.statements}
+        assert {"match existing records", "insert new records"} <= labels
+        # backfill is done by the insert statement itself if supported
+        assert ("backfill primary keys" in labels) != (
+            model.dialect.INSERT_RETURNING_CTE
+        )
+        assert sum(st.duration for st in stats.statements) <= stats.duration_merge
+
+        # parsing timings
+        assert isinstance(stats.parse, ParseStats)
+        assert stats.parse.duration_validate == 0
+        assert stats.parse.duration_parse > 0
+        # hashing is only timed separately when a load_stats_hook is set
+        assert stats.parse.duration_hash is None
+        assert stats.parse.duration_flatten > 0
+
         # second load of same file; reused rows should be existing (backends that
         # report rowcount); on DuckDB both will be 0, which is also acceptable
         doc2 = model.parse_xml(xml_path, metadata={"src": "b"})
@@ -56,6 +94,207 @@ def test_load_stats(conn_string):
         model.drop_all_tables()
 
 
+@pytest.mark.dbtest
+def test_load_stats_hook_streaming(conn_string):
+    """Test that load_stats_hook is called with stats accumulated across streamed chunks"""
+
+    calls = []
+    model = DataModel(
+        str(os.path.join(models_path, "orders", "orders.xsd")),
+        connection_string=conn_string,
+        db_schema="test_xml2db_stats",
+        model_config={"load_stats_hook": lambda doc, stats: calls.append((doc, stats))},
+    )
+    model.create_db_schema()
+    model.drop_all_tables()
+    xml_path = str(os.path.join(models_path, "orders", "xml", "order1.xml"))
+    try:
+        doc = Document(model)
+        stats = doc.stream_into_target_tables(xml_path, chunk_size=1)
+
+        assert calls == [(doc, stats)]
+        assert isinstance(stats.parse, ParseStats)
+        assert stats.parse.duration_hash > 0
+        assert stats.parse.duration_flatten > 0
+        # records flushed by chunks are all accounted for
+        for tb in model.fk_ordered_tables:
+            data = doc.data.get(tb.type_name)
+            if data is not None:
+                assert stats.tables[tb.name].records == data.get(
+                    "flushed_records", 0
+                )
+    finally:
+        model.drop_all_tables()
+
+
+@pytest.mark.dbtest
+def test_concurrent_staging(conn_string):
+    """Test that temp tables loaded by several threads give the same documents"""
+
+    xml_files = list_xml_path(models[0], "xml")
+    model = DataModel(
+        str(os.path.join(models_path, "orders", "orders.xsd")),
+        connection_string=conn_string,
+        db_schema="test_xml2db_concurrent",
+        model_config={
+            "metadata_columns": [
+                {"name": "input_file_path", "type": sqlalchemy.String(256)}
+            ]
+        },
+        staging_workers=4,
+    )
+    if not model.dialect.CONCURRENT_STAGING:
+        pytest.skip(f"{model.db_type} does not support concurrent staging")
+    threads = set()
+    bulk_insert = model.dialect.bulk_insert
+
+    def recording_bulk_insert(*args, **kwargs):
+        threads.add(threading.get_ident())
+        return bulk_insert(*args, **kwargs)
+
+    model.dialect.bulk_insert = recording_bulk_insert
+    model.create_db_schema()
+    model.drop_all_tables()
+    try:
+        for file in xml_files:
+            model.parse_xml(
+                file, metadata={"input_file_path": file}
+            ).insert_into_target_tables()
+        assert threading.get_ident() not in threads
+
+        for file in xml_files:
+            doc = model.extract_from_database(
+                f"input_file_path='{file}'", force_tz="Europe/Paris"
+            )
+            converter = XMLConverter(model)
+            converter.parse_xml(file, file)
+            assert doc.flat_data_to_doc_tree() == remove_record_hash(
+                converter.document_tree
+            )
+    finally:
+        model.drop_all_tables()
+
+
+def test_staging_workers_invalid():
+
+    with pytest.raises(ValueError):
+        DataModel(
+            str(os.path.join(models_path, "orders", "orders.xsd")), staging_workers=0
+        )
+
+
+@pytest.mark.dbtest
+def test_persistent_temp_tables(conn_string):
+    """Test that persistent temp tables are created once, emptied between documents and dropped on close"""
+
+    xml_files = list_xml_path(models[0], "xml")
+    with DataModel(
+        str(os.path.join(models_path, "orders", "orders.xsd")),
+        connection_string=conn_string,
+        db_schema="test_xml2db_persistent",
+        model_config={
+            "metadata_columns": [
+                {"name": "input_file_path", "type": sqlalchemy.String(256)}
+            ]
+        },
+        persistent_temp_tables=True,
+    ) as model:
+        model.create_db_schema()
+        model.drop_all_tables()
+        temp_table = model.tables[model.root_table].temp_table
+        try:
+            for file in xml_files:
+                model.parse_xml(
+                    file, metadata={"input_file_path": file}
+                ).insert_into_target_tables()
+                # temp tables are kept, but emptied
+                with model.engine.connect() as conn:
+                    assert sqlalchemy.inspect(conn).has_table(
+                        temp_table.name, schema=model.db_schema
+                    )
+                    assert (
+                        conn.execute(
+                            sqlalchemy.select(sqlalchemy.func.count()).select_from(
+                                temp_table
+                            )
+                        ).scalar()
+                        == 0
+                    )
+
+            for file in xml_files:
+                doc = model.extract_from_database(
+                    f"input_file_path='{file}'", force_tz="Europe/Paris"
+                )
+                converter = XMLConverter(model)
+                converter.parse_xml(file, file)
+                assert doc.flat_data_to_doc_tree() == remove_record_hash(
+                    converter.document_tree
+                )
+        finally:
+            model.close()
+            with model.engine.connect() as conn:
+                assert not sqlalchemy.inspect(conn).has_table(
+                    temp_table.name, schema=model.db_schema
+                )
+            model.drop_all_tables()
+
+
+@pytest.mark.dbtest
+def test_extract_key_tables(conn_string):
+    """Test that set-based extraction statements are the same whatever the number of records, and that key tables
+    are dropped afterwards"""
+
+    xml_files = list_xml_path(models[0], "xml")
+    model = DataModel(
+        str(os.path.join(models_path, "orders", "orders.xsd")),
+        connection_string=conn_string,
+        db_schema="test_xml2db",
+        model_config={
+            "metadata_columns": [
+                {"name": "input_file_path", "type": sqlalchemy.String(256)}
+            ]
+        },
+    )
+    model.create_db_schema()
+    model.drop_all_tables()
+    statements = []
+
+    def count_statements(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    try:
+        for file in xml_files:
+            model.parse_xml(
+                file, metadata={"input_file_path": file}
+            ).insert_into_target_tables()
+
+        sqlalchemy.event.listen(model.engine, "before_cursor_execute", count_statements)
+        try:
+            doc = model.extract_from_database(f"input_file_path='{xml_files[0]}'")
+            n_statements = len(statements)
+            all_doc = model.extract_from_database("1=1")
+            assert len(statements) == 2 * n_statements
+            empty_doc = model.extract_from_database("1=0")
+        finally:
+            sqlalchemy.event.remove(
+                model.engine, "before_cursor_execute", count_statements
+            )
+
+        root = model.root_table
+        assert len(doc.data[root]["records"]) == 1
+        assert len(all_doc.data[root]["records"]) == len(xml_files)
+        assert all(len(tb["records"]) == 0 for tb in empty_doc.data.values())
+        with model.engine.connect() as conn:
+            assert not any(
+                "_keys_" in name
+                for name in sqlalchemy.inspect(conn).get_table_names(
+                    schema=model.db_schema
+                )
+            )
+    finally:
+        model.drop_all_tables()
+
+
 @pytest.mark.dbtest
 @pytest.mark.parametrize(
     "model_config",
@@ -125,6 +364,101 @@ def test_database_document_tree_roundtrip(setup_db_model, model_config):
         )
 
 
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_database_document_tree_roundtrip_iter_documents(setup_db_model, model_config):
+    """A test for roundtrip insert to the database from and to document trees, extracting all documents by batches"""
+
+    model = setup_db_model
+    xml_files = list_xml_path(model_config, "xml")
+
+    for file in xml_files:
+        doc = model.parse_xml(file, metadata={"input_file_path": file})
+        doc.insert_into_target_tables()
+
+    docs = list(
+        model.iter_documents_from_database(
+            "1=1", batch_size=2, force_tz="Europe/Paris"
+        )
+    )
+    assert len(docs) == len(xml_files)
+    for doc in docs:
+        root_records = doc.data[model.root_table]["records"]
+        assert len(root_records) == 1
+        file = root_records[0]["input_file_path"]
+
+        converter = XMLConverter(model)
+        converter.parse_xml(file, file)
+
+        assert doc.flat_data_to_doc_tree() == remove_record_hash(
+            converter.document_tree
+        )
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config",
+    [
+        {**models[0], **version, "config": {**version["config"], "parse_datetimes": True}}
+        for version in models[0]["versions"]
+    ],
+)
+def test_database_document_tree_roundtrip_parse_datetimes(setup_db_model, model_config):
+    """A test for roundtrip insert to the database with datetime values parsed in python"""
+
+    model = setup_db_model
+    xml_files = list_xml_path(model_config, "xml")
+
+    for file in xml_files:
+        doc = model.parse_xml(file, metadata={"input_file_path": file})
+        doc.insert_into_target_tables()
+
+    for file in xml_files:
+        doc = model.extract_from_database(
+            f"input_file_path='{file}'", force_tz="Europe/Paris"
+        )
+
+        # parse file to doctree for reference
+        converter = XMLConverter(model)
+        converter.parse_xml(file, file)
+
+        assert doc.flat_data_to_doc_tree() == remove_record_hash(
+            converter.document_tree
+        )
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_database_document_tree_roundtrip_columnar(setup_db_model, model_config):
+    """A test for roundtrip insert to the database of columnar flat data, using bulk loading"""
+
+    model = setup_db_model
+    xml_files = list_xml_path(model_config, "xml")
+
+    for file in xml_files:
+        doc = model.parse_xml(file, metadata={"input_file_path": file}, columnar=True)
+        doc.insert_into_target_tables(bulk_load_threshold=0)
+
+    for file in xml_files:
+        doc = model.extract_from_database(
+            f"input_file_path='{file}'", force_tz="Europe/Paris"
+        )
+
+        # parse file to doctree for reference
+        converter = XMLConverter(model)
+        converter.parse_xml(file, file)
+
+        assert doc.flat_data_to_doc_tree() == remove_record_hash(
+            converter.document_tree
+        )
+
+
 @pytest.mark.dbtest
 @pytest.mark.parametrize(
     "model_config",
@@ -162,6 +496,115 @@ def test_database_document_tree_roundtrip_single_load(setup_db_model, model_conf
         )
 
 
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_database_document_tree_roundtrip_batch_loader(setup_db_model, model_config):
+    """A test for roundtrip insert to the database from and to document tree, loading files in batches"""
+
+    model = setup_db_model
+    xml_files = list_xml_path(model_config, "xml")
+
+    with model.batch_loader(max_files=2) as loader:
+        for file in xml_files:
+            loader.add(file, metadata={"input_file_path": file})
+    assert len(loader.stats) == (len(xml_files) + 1) // 2
+    assert [f for files, _ in loader.stats for f, _ in files] == xml_files
+
+    for file in xml_files:
+        doc = model.extract_from_database(
+            f"input_file_path='{file}'", force_tz="Europe/Paris"
+        )
+
+        # parse file to doctree for reference
+        converter = XMLConverter(model)
+        converter.parse_xml(file, file)
+
+        assert doc.flat_data_to_doc_tree() == remove_record_hash(
+            converter.document_tree
+        )
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config",
+    [{**model, **version} for model in models for version in model["versions"]],
+)
+def test_database_document_tree_roundtrip_streaming(setup_db_model, model_config):
+    """A test for roundtrip insert to the database from and to document tree, loading files in streaming mode"""
+
+    model = setup_db_model
+    xml_files = list_xml_path(model_config, "xml")
+
+    for file in xml_files:
+        # do parse and insert into the database, with very small chunks
+        Document(model).stream_into_target_tables(
+            file, metadata={"input_file_path": file}, chunk_size=1
+        )
+
+    for file in xml_files:
+        doc = model.extract_from_database(
+            f"input_file_path='{file}'", force_tz="Europe/Paris"
+        )
+
+        # parse file to doctree for reference
+        converter = XMLConverter(model)
+        converter.parse_xml(file, file)
+
+        assert doc.flat_data_to_doc_tree() == remove_record_hash(
+            converter.document_tree
+        )
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config, chunk_element",
+    [
+        ({**models[0], **models[0]["versions"][2]}, "item"),
+        ({**models[1], **models[1]["versions"][1]}, "contract"),
+    ],
+)
+def test_database_document_tree_roundtrip_streaming_chunk_element(
+    setup_db_model, model_config, chunk_element
+):
+    """A test for roundtrip insert to the database, streaming elements which are not children of the root element"""
+
+    model = setup_db_model
+    xml_files = list_xml_path(model_config, "xml")
+
+    for file in xml_files:
+        Document(model).stream_into_target_tables(
+            file,
+            metadata={"input_file_path": file},
+            chunk_size=1,
+            chunk_element=chunk_element,
+        )
+
+    for file in xml_files:
+        doc = model.extract_from_database(
+            f"input_file_path='{file}'", force_tz="Europe/Paris"
+        )
+        converter = XMLConverter(model)
+        converter.parse_xml(file, file)
+        assert doc.flat_data_to_doc_tree() == remove_record_hash(
+            converter.document_tree
+        )
+
+
+@pytest.mark.dbtest
+@pytest.mark.parametrize(
+    "model_config", [{**models[0], **models[0]["versions"][0]}]
+)
+def test_streaming_deduplicated_parent(setup_db_model, model_config):
+    """Elements whose parent table is deduplicated (other than the root table) cannot be streamed"""
+    with pytest.raises(ValueError, match="deduplicated"):
+        Document(setup_db_model).stream_into_target_tables(
+            list_xml_path(model_config, "xml")[0], chunk_element="item"
+        )
+
+
 @pytest.mark.skip
 @pytest.mark.parametrize(
     "model_config",